@@ -1,4 +1,5 @@
 import crunch.api._auth as auth  # pyright: ignore[reportUnusedImport]
+from crunch.api._async import AsyncClient as AsyncClient
 from crunch.api._client import Client as Client
 from crunch.api._domain.common import GpuRequirement as GpuRequirement
 from crunch.api._domain.competition import Competition as Competition
@@ -34,11 +35,15 @@ from crunch.api._domain.round import Round as Round
 from crunch.api._domain.run import Run as Run
 from crunch.api._domain.runner import RunnerRun as RunnerRun
 from crunch.api._domain.score import Score as Score
+from crunch.api._domain.score import scores_as_dataframe as scores_as_dataframe
 from crunch.api._domain.submission import Submission as Submission
 from crunch.api._domain.submission import SubmissionType as SubmissionType
 from crunch.api._domain.submission_file import SubmissionFile as SubmissionFile
 from crunch.api._domain.target import Target as Target
+from crunch.api._domain.upload import ChunkSizePolicy as ChunkSizePolicy
 from crunch.api._domain.upload import Upload as Upload
+from crunch.api._domain.upload import UploadJournal as UploadJournal
+from crunch.api._domain.upload import UploadStatus as UploadStatus
 from crunch.api._domain.user import User as User
 from crunch.api._errors import AnnotatedConnectException as AnnotatedConnectException
 from crunch.api._errors import ApiException as ApiException
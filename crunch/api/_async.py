@@ -0,0 +1,354 @@
+"""
+Asynchronous flavor of the client, for the services that need hundreds of concurrent requests on one event loop.
+
+The endpoint mixins are shared with the synchronous client: with `AsyncEndpointClient`, `get()`, `_result()` and `_paginated()` return awaitables and async generators instead of values.
+The collections then return awaitables from `get()` and async generators from `list()`.
+
+Only the reading endpoints are supported, the uploads stay on the synchronous client.
+The helpers working on loaded values, like `DataRelease.data_files` without the files loaded, raise a `NotImplementedError`.
+
+Requires the `async` extra: `pip install crunch-cli[async]`.
+"""
+
+import asyncio
+import collections
+import inspect
+import os
+import urllib.parse
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Awaitable, Callable, Deque, Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+import crunch.store as store
+from crunch.api._auth import ApiKeyAuth, Auth, NoneAuth
+from crunch.api._client import EndpointClient, _get_total_pages
+from crunch.api._domain.competition import CompetitionCollection, CompetitionEndpointMixin
+from crunch.api._domain.crunch import CrunchEndpointMixin
+from crunch.api._domain.data_release import DataReleaseEndpointMixin
+from crunch.api._domain.leaderboard import LeaderboardEndpointMixin
+from crunch.api._domain.library import LibraryCollection, LibraryEndpointMixin
+from crunch.api._domain.metric import MetricEndpointMixin
+from crunch.api._domain.phase import PhaseEndpointMixin
+from crunch.api._domain.prediction import PredictionEndpointMixin
+from crunch.api._domain.project import ProjectEndpointMixin, ProjectTokenCollection
+from crunch.api._domain.quickstarter import QuickstarterEndpointMixin
+from crunch.api._domain.round import RoundEndpointMixin
+from crunch.api._domain.run import RunEndpointMixin
+from crunch.api._domain.score import ScoreEndpointMixin
+from crunch.api._domain.submission import SubmissionEndpointMixin
+from crunch.api._domain.submission_file import SubmissionFileEndpointMixin
+from crunch.api._domain.target import TargetEndpointMixin
+from crunch.api._domain.user import UserCollection, UserEndpointMixin
+from crunch.api._pagination import PageRequest
+from crunch.constants import API_KEY_ENV_VAR
+
+if TYPE_CHECKING:
+    import httpx
+
+
+class AsyncEndpointClient(
+    CompetitionEndpointMixin,
+    CrunchEndpointMixin,
+    DataReleaseEndpointMixin,
+    LeaderboardEndpointMixin,
+    LibraryEndpointMixin,
+    MetricEndpointMixin,
+    PhaseEndpointMixin,
+    PredictionEndpointMixin,
+    ProjectEndpointMixin,
+    QuickstarterEndpointMixin,
+    RoundEndpointMixin,
+    RunEndpointMixin,
+    ScoreEndpointMixin,
+    SubmissionEndpointMixin,
+    SubmissionFileEndpointMixin,
+    TargetEndpointMixin,
+    UserEndpointMixin,
+):
+
+    def __init__(
+        self,
+        base_url: str,
+        auth: Auth,
+        *,
+        max_connections: int = 100,
+        timeout: Optional[float] = 60,
+    ):
+        httpx = _import_httpx()
+
+        self.base_url = base_url
+        self.auth_ = auth
+        self.page_size = 100
+        self.page_read_ahead = 8
+
+        self.session = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=timeout,
+        )
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        data: Any = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        httpx = _import_httpx()
+
+        headers = dict(headers or {})
+        params = dict(params or {})
+
+        self.auth_.apply(headers, params, data)
+
+        try:
+            response = await self.session.request(
+                method,
+                urllib.parse.urljoin(self.base_url, url),
+                headers=headers,
+                params=_without_none(params),
+                data=_without_none(data) if isinstance(data, dict) else data,
+                **kwargs,
+            )
+        except httpx.HTTPError as error:
+            self._strip_secrets(error)
+            raise error
+
+        return _to_requests_response(response)
+
+    def get(self, url: str, **kwargs: Any):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs: Any):
+        return self.request("PUT", url, **kwargs)
+
+    def patch(self, url: str, **kwargs: Any):
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url: str, **kwargs: Any):
+        return self.request("DELETE", url, **kwargs)
+
+    async def aclose(self):
+        await self.session.aclose()
+
+    # same error conversion and content decoding than the synchronous client
+    _raise_for_status = EndpointClient._raise_for_status
+    _strip_secrets = EndpointClient._strip_secrets
+    _read_page = EndpointClient._read_page
+    _decode_result = EndpointClient._result
+
+    async def _result(
+        self,
+        response: Awaitable[requests.Response],
+        json: bool = False,
+        binary: bool = False,
+    ):
+        return self._decode_result(await response, json, binary)
+
+    def _result_stream(
+        self,
+        response: Awaitable[requests.Response],
+        key: Optional[str] = None,
+    ):
+        # never sent, the coroutine is discarded without a warning
+        if inspect.iscoroutine(response):
+            response.close()
+
+        raise NotImplementedError("streaming a response is not supported by the async client, load the whole value instead")
+
+    async def _paginated(
+        self,
+        requester: Callable[[PageRequest], Awaitable[requests.Response]],
+        page_size: Optional[int] = None
+    ) -> AsyncGenerator[Any, None]:
+        if not page_size:
+            page_size = self.page_size
+
+        page_request = PageRequest(0, page_size)
+        json = self._read_page(await requester(page_request))
+
+        total_pages = _get_total_pages(json)
+        if total_pages is not None and self.page_read_ahead > 1:
+            async for item in self._paginated_read_ahead(requester, json, page_size, total_pages):
+                yield item
+
+            return
+
+        while True:
+            content = json["content"]
+            for item in content:
+                yield item
+
+            if len(content) != json["pageSize"]:
+                break
+
+            page_request = page_request.next()
+            json = self._read_page(await requester(page_request))
+
+    async def _paginated_read_ahead(
+        self,
+        requester: Callable[[PageRequest], Awaitable[requests.Response]],
+        first_page: Dict[str, Any],
+        page_size: int,
+        total_pages: int,
+    ) -> AsyncGenerator[Any, None]:
+        """
+        Same as `EndpointClient._paginated_read_ahead()`, with tasks on the event loop instead of threads.
+        """
+
+        pending: Deque["asyncio.Future[requests.Response]"] = collections.deque()
+        next_page_number = 1
+
+        try:
+            json = first_page
+
+            while True:
+                while next_page_number < total_pages and len(pending) < self.page_read_ahead:
+                    pending.append(asyncio.ensure_future(requester(PageRequest(next_page_number, page_size))))
+                    next_page_number += 1
+
+                for item in json["content"]:
+                    yield item
+
+                if not pending:
+                    break
+
+                json = self._read_page(await pending.popleft())
+        finally:
+            # the generator could be closed before its end
+            for task in pending:
+                task.cancel()
+
+
+class AsyncClient:
+    """
+    Usage:
+    ```
+    async with AsyncClient.from_env() as client:
+        competition = await client.competitions.get("adialab")
+
+        async for project in competition.projects.list():
+            ...
+    ```
+    """
+
+    # checked by the helpers that only work with loaded values, see `require_sync_client()`
+    is_async = True
+
+    def __init__(
+        self,
+        api_base_url: str,
+        web_base_url: str,
+        auth: Auth,
+        *,
+        max_connections: int = 100,
+        timeout: Optional[float] = 60,
+    ):
+        self.api = AsyncEndpointClient(
+            api_base_url,
+            auth,
+            max_connections=max_connections,
+            timeout=timeout,
+        )
+
+        self.web_base_url = web_base_url
+        self.project_info = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args: Any):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.api.aclose()
+
+    @property
+    def competitions(self):
+        return CompetitionCollection(client=self)  # type: ignore
+
+    @property
+    def libraries(self):
+        return LibraryCollection(client=self)  # type: ignore
+
+    @property
+    def users(self):
+        return UserCollection(client=self)  # type: ignore
+
+    @property
+    def project_tokens(self):
+        return ProjectTokenCollection(
+            competition=None,
+            client=self  # type: ignore
+        )
+
+    def format_web_url(self, path: str):
+        return urllib.parse.urljoin(
+            self.web_base_url,
+            path
+        )
+
+    @staticmethod
+    def from_env(
+        auth: Optional[Auth] = None,
+        *,
+        max_connections: int = 100,
+    ):
+        store.load_from_env()
+
+        if auth is None:
+            api_key = os.getenv(API_KEY_ENV_VAR)
+            if api_key:
+                auth = ApiKeyAuth(api_key)
+            else:
+                auth = NoneAuth()
+
+        return AsyncClient(
+            store.api_base_url,
+            store.web_base_url,
+            auth,
+            max_connections=max_connections,
+        )
+
+
+def _import_httpx():
+    try:
+        import httpx  # type: ignore
+    except ImportError as error:
+        raise ImportError("the async client requires the `httpx` package, install it with: pip install crunch-cli[async]") from error
+
+    return httpx  # type: ignore
+
+
+def _without_none(
+    values: Dict[str, Any],
+):
+    # `requests` silently drops them, `httpx` would send empty values
+    return {
+        key: value
+        for key, value in values.items()
+        if value is not None
+    }
+
+
+def _to_requests_response(
+    response: "httpx.Response",
+) -> requests.Response:
+    converted = requests.Response()
+    converted.status_code = response.status_code
+    converted.url = str(response.url)
+    converted.reason = response.reason_phrase
+    converted.headers = CaseInsensitiveDict(response.headers)
+    converted.encoding = response.encoding
+    converted._content = response.content  # type: ignore
+
+    return converted
@@ -1,6 +1,6 @@
 import re
 from abc import ABC, abstractmethod
-from typing import Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 
 class Auth(ABC):
@@ -20,6 +20,14 @@ class Auth(ABC):
     ) -> Optional[str]:
         return error_message
 
+    @property
+    def identity(self) -> Tuple[Any, ...]:
+        """
+        Authentications with the same identity send the same credentials, their clients can be shared.
+        """
+
+        return (type(self).__name__,)
+
 
 class NoneAuth(Auth):
 
@@ -42,6 +50,10 @@ class ApiKeyAuth(Auth):
 
         self._key = key
 
+    @property
+    def identity(self):
+        return (type(self).__name__, self._key)
+
     def apply(
         self,
         headers: Dict[str, str],
@@ -61,6 +73,10 @@ class PushTokenAuth(Auth):
 
         self._token = token
 
+    @property
+    def identity(self):
+        return (type(self).__name__, self._token)
+
     def apply(
         self,
         headers: Dict[str, str],
@@ -93,6 +109,10 @@ class RunTokenAuth(Auth):
 
         self._token = token
 
+    @property
+    def identity(self):
+        return (type(self).__name__, self._token)
+
     def apply(
         self,
         headers: Dict[str, str],
@@ -0,0 +1,188 @@
+import hashlib
+import json
+import os
+import re
+import time
+import typing
+from dataclasses import dataclass
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from crunch.utils import atomic_write
+
+"""
+An identifier in a cached path.
+Aliases like `@current` or `@last` designate another resource once a round or a phase is over, they are never cached.
+"""
+_IDENTIFIER = r"[^/@][^/]*"
+
+"""
+Endpoints whose responses rarely change, with how long a cached response is used without asking the server.
+Once expired, a response is revalidated with its `ETag` instead of being downloaded again.
+"""
+DEFAULT_TTLS: typing.List[typing.Tuple[str, float]] = [
+    (r"/v\d+/competitions", 10 * 60),
+    (rf"/v\d+/competitions/{_IDENTIFIER}", 10 * 60),
+    (rf"/v\d+/competitions/{_IDENTIFIER}/targets(/{_IDENTIFIER})?", 60 * 60),
+    (rf"/v\d+/competitions/{_IDENTIFIER}/targets/{_IDENTIFIER}/metrics(/{_IDENTIFIER})?", 60 * 60),
+    (rf"/v\d+/competitions/{_IDENTIFIER}/rounds(/{_IDENTIFIER})?", 5 * 60),
+    (rf"/v\d+/competitions/{_IDENTIFIER}/rounds/{_IDENTIFIER}/phases(/{_IDENTIFIER})?", 5 * 60),
+    (rf"/v\d+/competitions/{_IDENTIFIER}/rounds/{_IDENTIFIER}/phases/{_IDENTIFIER}/data-release", 5 * 60),
+    (rf"/v\d+/competitions/{_IDENTIFIER}/data-releases(/{_IDENTIFIER})?", 5 * 60),
+]
+
+
+@dataclass
+class CachedResponse:
+
+    url: str
+    headers: typing.Dict[str, str]
+    content: bytes
+    stored_at: float
+
+    @property
+    def etag(self) -> typing.Optional[str]:
+        return self.headers.get("etag")
+
+    def is_fresh(
+        self,
+        ttl: float,
+    ) -> bool:
+        return time.time() - self.stored_at < ttl
+
+    def to_response(self) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.url = self.url
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.content  # type: ignore
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)  # type: ignore
+
+        return response
+
+
+class ResponseCache:
+    """
+    One file per response, keyed by the url, the parameters and the credentials, since responses can differ between users.
+    The files can be deleted at any time.
+    """
+
+    # response headers worth keeping, the others are not used by the client
+    KEPT_HEADERS = ("content-type", "etag", "last-modified")
+
+    def __init__(
+        self,
+        directory_path: str,
+        ttls: typing.Optional[typing.List[typing.Tuple[str, float]]] = None,
+    ):
+        self.directory_path = directory_path
+        self.ttls = [
+            (re.compile(f"^{pattern}$"), ttl)
+            for pattern, ttl in (ttls if ttls is not None else DEFAULT_TTLS)
+        ]
+
+    def get_ttl(
+        self,
+        path: str,
+    ) -> typing.Optional[float]:
+        path = "/" + path.lstrip("/")
+
+        for pattern, ttl in self.ttls:
+            if pattern.match(path):
+                return ttl
+
+        return None
+
+    @staticmethod
+    def make_key(
+        url: str,
+        params: typing.Dict[str, typing.Any],
+        headers: typing.Dict[str, str],
+    ) -> str:
+        identity = json.dumps([
+            url,
+            sorted((str(key), str(value)) for key, value in params.items()),
+            sorted((key.lower(), value) for key, value in headers.items()),
+        ])
+
+        return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+    def get(
+        self,
+        key: str,
+    ) -> typing.Optional[CachedResponse]:
+        try:
+            with open(self._get_path(key), "rb") as fd:
+                header = json.loads(fd.readline())
+                content = fd.read()
+
+            return CachedResponse(
+                url=header["url"],
+                headers=header["headers"],
+                content=content,
+                stored_at=header["storedAt"],
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def put(
+        self,
+        key: str,
+        url: str,
+        response: requests.Response,
+    ) -> CachedResponse:
+        """
+        The `url` is given without its query, `response.url` could contain credentials.
+        """
+
+        entry = CachedResponse(
+            url=url,
+            headers={
+                name: response.headers[name]
+                for name in self.KEPT_HEADERS
+                if name in response.headers
+            },
+            content=response.content,
+            stored_at=time.time(),
+        )
+
+        self._write(key, entry)
+        return entry
+
+    def refresh(
+        self,
+        key: str,
+        entry: CachedResponse,
+    ):
+        """
+        The server confirmed that the response did not change, restart its time to live.
+        """
+
+        entry.stored_at = time.time()
+        self._write(key, entry)
+
+    def _write(
+        self,
+        key: str,
+        entry: CachedResponse,
+    ):
+        path = self._get_path(key)
+
+        try:
+            with atomic_write(path, "wb") as fd:
+                fd.write(json.dumps({
+                    "url": entry.url,
+                    "headers": entry.headers,
+                    "storedAt": entry.stored_at,
+                }).encode("utf-8"))
+                fd.write(b"\n")
+                fd.write(entry.content)
+        except OSError:
+            pass
+
+    def _get_path(
+        self,
+        key: str,
+    ) -> str:
+        return os.path.join(self.directory_path, f"{key}.response")
@@ -1,13 +1,25 @@
+import collections
+import copy
+import dataclasses
 import os
+import sys
+import threading
+import time
 import urllib.parse
-from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Optional, Tuple, cast
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Hashable, Iterable, Optional, Tuple, Union, cast
 
 import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
 from tqdm.auto import tqdm
 from urllib3.exceptions import RequestError
+from urllib3.util.retry import Retry
 
 import crunch.store as store
 from crunch.api._auth import ApiKeyAuth, Auth, NoneAuth, PushTokenAuth
+from crunch.api._cache import ResponseCache
+from crunch.api._coalescing import RequestCoalescer
 from crunch.api._domain.competition import CompetitionCollection, CompetitionEndpointMixin
 from crunch.api._domain.crunch import CrunchEndpointMixin
 from crunch.api._domain.data_release import DataReleaseEndpointMixin
@@ -25,15 +37,34 @@ from crunch.api._domain.score import ScoreEndpointMixin
 from crunch.api._domain.submission import SubmissionEndpointMixin
 from crunch.api._domain.submission_file import SubmissionFileEndpointMixin
 from crunch.api._domain.target import TargetEndpointMixin
-from crunch.api._domain.upload import UploadCollection, UploadEndpointMixin
+from crunch.api._domain.upload import ChunkSizePolicy, UploadCollection, UploadEndpointMixin
 from crunch.api._domain.user import UserCollection, UserEndpointMixin
 from crunch.api._errors import convert_error
 from crunch.api._pagination import PageRequest
+from crunch.api._streaming import STREAM_CHUNK_SIZE, JsonArrayStream
 from crunch.constants import API_KEY_ENV_VAR
 
 if TYPE_CHECKING:
     from crunch.utils import ProjectInfo
 
+"""
+Connections kept per host, enough for the pagination read-ahead and the concurrent requests of the bulk operations.
+"""
+DEFAULT_POOL_SIZE = 32
+
+"""
+Retries of the idempotent requests after a connection error, a reset or an unavailable server, with an exponential backoff.
+"""
+DEFAULT_MAX_RETRIES = 3
+
+"""
+Connect and read timeouts, in seconds, of the requests that do not set their own.
+The read timeout is long, the server can take a while to process an upload.
+"""
+DEFAULT_TIMEOUT = (10.0, 300.0)
+
+TimeoutType = Optional[Union[float, Tuple[float, float]]]
+
 
 class EndpointClient(
     requests.Session,
@@ -63,6 +94,11 @@ class EndpointClient(
         base_url: str,
         auth: Auth,
         show_progress: bool,
+        response_cache: Optional[ResponseCache] = None,
+        *,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        timeout: TimeoutType = DEFAULT_TIMEOUT,
     ):
         super().__init__()
 
@@ -70,15 +106,46 @@ class EndpointClient(
         self.auth_ = auth
         self.show_progress = show_progress
         self.page_size = 100
+        self.page_read_ahead = 8
+        self.response_cache = response_cache
+        self.timeout = timeout
+
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=max_retries,
+                backoff_factor=0.5,
+                status_forcelist=(429, 502, 503, 504),
+                allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+                # the last response is returned, its error is converted like the others
+                raise_on_status=False,
+            ),
+        )
+
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+
+        # identical concurrent GETs, from threads or the pagination read-ahead, are only sent once
+        self._coalescer: RequestCoalescer[requests.Response] = RequestCoalescer(copy=_copy_response)
 
     def request(self, method: str, url: str, *args: Any, **kwargs: Any):
         headers: Dict[str, str] = kwargs.pop("headers", None) or {}
         params: Dict[str, str] = kwargs.pop("params", None) or {}
         data: Any = kwargs.pop("data", None)
         files: Any = kwargs.pop("files", None)
+        kwargs.setdefault("timeout", self.timeout)
 
         self.auth_.apply(headers, params, data)
 
+        if method.upper() == "GET" and not args and data is None and files is None and not kwargs.get("stream"):
+            key = ResponseCache.make_key(urllib.parse.urljoin(self.base_url, url), params, headers)
+
+            return self._coalescer.run(
+                key,
+                lambda: self._get(url, headers, params, **kwargs),
+            )
+
         progress: Optional[tqdm] = None
 
         if files is not None:
@@ -140,6 +207,84 @@ class EndpointClient(
             if progress is not None:
                 progress.close()
 
+    def _get(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        params: Dict[str, str],
+        **kwargs: Any,
+    ):
+        if self.response_cache is not None:
+            ttl = self.response_cache.get_ttl(urllib.parse.urlparse(url).path)
+            if ttl is not None:
+                return self._cached_request(url, ttl, headers, params, **kwargs)
+
+        try:
+            return super().request(
+                "GET",
+                urllib.parse.urljoin(self.base_url, url),
+                headers=headers,
+                params=params,
+                **kwargs,
+            )
+        except requests.exceptions.RequestException as error:
+            self._strip_secrets(error)
+            raise error
+
+    def _cached_request(
+        self,
+        url: str,
+        ttl: float,
+        headers: Dict[str, str],
+        params: Dict[str, str],
+        **kwargs: Any,
+    ):
+        """
+        Serve a fresh cached response without asking the server, revalidate an expired one with its `ETag`.
+        If the server cannot be reached, a stale response is better than nothing.
+        """
+
+        cache = cast(ResponseCache, self.response_cache)
+
+        url = urllib.parse.urljoin(self.base_url, url)
+        key = cache.make_key(url, params, headers)
+
+        entry = cache.get(key)
+        if entry is not None and entry.is_fresh(ttl):
+            return entry.to_response()
+
+        if entry is not None and entry.etag:
+            headers["If-None-Match"] = entry.etag
+
+        try:
+            response = super().request(
+                "GET",
+                url,
+                headers=headers,
+                params=params,
+                **kwargs,
+            )
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as error:
+            self._strip_secrets(error)
+
+            if entry is None:
+                raise error
+
+            print(f"api: unreachable, using a cached response from {time.ctime(entry.stored_at)}", file=sys.stderr)
+            return entry.to_response()
+        except requests.exceptions.RequestException as error:
+            self._strip_secrets(error)
+            raise error
+
+        if response.status_code == 304 and entry is not None:
+            cache.refresh(key, entry)
+            return entry.to_response()
+
+        if response.status_code == 200:
+            cache.put(key, url, response)
+
+        return response
+
     def _raise_for_status(
         self,
         response: requests.Response,
@@ -207,6 +352,32 @@ class EndpointClient(
 
         return response.text
 
+    def _result_stream(
+        self,
+        response: requests.Response,
+        key: Optional[str] = None,
+    ) -> JsonArrayStream:
+        """
+        Decode the items of the array one at a time, as they arrive if the request was sent with `stream=True`.
+        The response is closed once the iteration ends, even early or on error.
+        """
+
+        try:
+            self._raise_for_status(response)
+
+            content_type = response.headers.get("content-type")
+            if content_type != "application/json":
+                raise ValueError(f"server did not return json: `{content_type}`: `{response.text}`")
+        except BaseException:
+            response.close()
+            raise
+
+        return JsonArrayStream(
+            response.iter_content(STREAM_CHUNK_SIZE),
+            key,
+            on_close=response.close,
+        )
+
     def _paginated(
         self,
         requester: Callable[[PageRequest], requests.Response],
@@ -216,15 +387,14 @@ class EndpointClient(
             page_size = self.page_size
 
         page_request = PageRequest(0, page_size)
-        while True:
-            response = requester(page_request)
-            self._raise_for_status(response)
+        json = self._read_page(requester(page_request))
 
-            try:
-                json = response.json()
-            except requests.exceptions.JSONDecodeError as json_error:
-                raise ValueError(f"could not parse json: `{response.text}`") from json_error
+        total_pages = _get_total_pages(json)
+        if total_pages is not None and self.page_read_ahead > 1:
+            yield from self._paginated_read_ahead(requester, json, page_size, total_pages)
+            return
 
+        while True:
             content = json["content"]
             for item in content:
                 yield item
@@ -233,6 +403,68 @@ class EndpointClient(
                 break
 
             page_request = page_request.next()
+            json = self._read_page(requester(page_request))
+
+    def _paginated_read_ahead(
+        self,
+        requester: Callable[[PageRequest], requests.Response],
+        first_page: Dict[str, Any],
+        page_size: int,
+        total_pages: int,
+    ):
+        """
+        The next pages are requested while the current one is consumed, up to `page_read_ahead` at a time.
+        """
+
+        pending: Deque["Future[requests.Response]"] = collections.deque()
+        next_page_number = 1
+
+        with ThreadPoolExecutor(max_workers=self.page_read_ahead, thread_name_prefix="crunch-page") as executor:
+            try:
+                json = first_page
+
+                while True:
+                    while next_page_number < total_pages and len(pending) < self.page_read_ahead:
+                        pending.append(executor.submit(requester, PageRequest(next_page_number, page_size)))
+                        next_page_number += 1
+
+                    for item in json["content"]:
+                        yield item
+
+                    if not pending:
+                        break
+
+                    json = self._read_page(pending.popleft().result())
+            finally:
+                # the generator could be closed before its end
+                for future in pending:
+                    future.cancel()
+
+    def _read_page(
+        self,
+        response: requests.Response,
+    ) -> Dict[str, Any]:
+        self._raise_for_status(response)
+
+        try:
+            return response.json()
+        except requests.exceptions.JSONDecodeError as json_error:
+            raise ValueError(f"could not parse json: `{response.text}`") from json_error
+
+
+def _get_total_pages(
+    page: Dict[str, Any],
+) -> Optional[int]:
+    total_pages = page.get("totalPages")
+    if total_pages is not None:
+        return int(total_pages)
+
+    total_elements = page.get("totalElements")
+    page_size = page.get("pageSize")
+    if total_elements is not None and page_size:
+        return -(-int(total_elements) // int(page_size))
+
+    return None
 
 
 class Client:
@@ -245,11 +477,26 @@ class Client:
         project_info: Optional["ProjectInfo"] = None,
         *,
         show_progress: bool = True,
+        response_cache: Optional[ResponseCache] = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        timeout: TimeoutType = DEFAULT_TIMEOUT,
     ):
-        self.api = EndpointClient(api_base_url, auth, show_progress)
+        self.api = EndpointClient(
+            api_base_url,
+            auth,
+            show_progress,
+            response_cache,
+            pool_size=pool_size,
+            max_retries=max_retries,
+            timeout=timeout,
+        )
         self.web_base_url = web_base_url
         self.project_info = project_info
 
+        # shared by every upload, the measurements improve the next chunk sizes
+        self.upload_chunk_policy = ChunkSizePolicy()
+
     @property
     def competitions(self):
         return CompetitionCollection(client=self)
@@ -290,6 +537,9 @@ class Client:
         auth: Optional[Auth] = None,
         *,
         show_progress: bool = True,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        timeout: TimeoutType = DEFAULT_TIMEOUT,
     ):
         store.load_from_env()
 
@@ -300,17 +550,26 @@ class Client:
             else:
                 auth = NoneAuth()
 
-        return Client(
+        key = ("env", store.api_base_url, store.web_base_url, auth.identity, show_progress, store.no_cache, pool_size, max_retries, timeout)
+
+        return _get_or_create(key, lambda: Client(
             store.api_base_url,
             store.web_base_url,
             auth,
             show_progress=show_progress,
-        )
+            response_cache=Client._create_response_cache(),
+            pool_size=pool_size,
+            max_retries=max_retries,
+            timeout=timeout,
+        ))
 
     @staticmethod
     def from_project(
         *,
         show_progress: bool = True,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        timeout: TimeoutType = DEFAULT_TIMEOUT,
     ) -> Tuple["Client", Project]:
         from crunch.utils import read_project_info, read_token
 
@@ -319,15 +578,90 @@ class Client:
         project_info = read_project_info()
         push_token = read_token()
 
-        client = Client(
-            store.api_base_url,
-            store.web_base_url,
-            PushTokenAuth(push_token),
-            project_info,
-            show_progress=show_progress,
-        )
+        def create():
+            client = Client(
+                store.api_base_url,
+                store.web_base_url,
+                PushTokenAuth(push_token),
+                project_info,
+                show_progress=show_progress,
+                response_cache=Client._create_response_cache(),
+                pool_size=pool_size,
+                max_retries=max_retries,
+                timeout=timeout,
+            )
+
+            competition = client.competitions.get(project_info.competition_name)
+            project = competition.projects.get_reference(None, (project_info.user_id, project_info.project_name))
+
+            return client, project
+
+        # the files are read every time, a new token or project gets a new client
+        key = ("project", store.api_base_url, store.web_base_url, push_token, dataclasses.astuple(project_info), show_progress, store.no_cache, pool_size, max_retries, timeout)
+
+        return _get_or_create(key, create)
+
+    @staticmethod
+    def clear_registry():
+        """
+        Forget the clients shared by `from_env()` and `from_project()`, the next calls will create new ones.
+        """
+
+        with _registry_lock:
+            _registry.clear()
+
+    @staticmethod
+    def _create_response_cache() -> Optional[ResponseCache]:
+        from crunch.utils import get_user_cache_directory
+
+        if store.no_cache:
+            return None
+
+        return ResponseCache(os.path.join(get_user_cache_directory(), "responses"))
+
+
+"""
+Clients created by `Client.from_env()` and `Client.from_project()`, shared by the whole process.
+Keyed by their configuration: the base urls, the credentials and the options.
+"""
+_registry: Dict[Hashable, "Future[Any]"] = {}
+_registry_lock = threading.Lock()
+
+
+def _get_or_create(
+    key: Hashable,
+    factory: Callable[[], Any],
+) -> Any:
+    # the lock only guards the dictionary, a slow factory must not block the other keys
+    with _registry_lock:
+        future = _registry.get(key)
+
+        creator = future is None
+        if creator:
+            future = _registry[key] = Future()
+
+    if not creator:
+        return future.result()
+
+    try:
+        value = factory()
+    except BaseException as error:
+        with _registry_lock:
+            if _registry.get(key) is future:
+                del _registry[key]
+
+        future.set_exception(error)
+        raise
+
+    future.set_result(value)
+    return value
+
 
-        competition = client.competitions.get(project_info.competition_name)
-        project = competition.projects.get_reference(None, (project_info.user_id, project_info.project_name))
+def _copy_response(
+    response: requests.Response,
+) -> requests.Response:
+    # not streamed, the content is already read and is kept by the copy
+    copied = copy.copy(response)
+    copied.headers = CaseInsensitiveDict(response.headers)
 
-        return client, project
+    return copied
@@ -0,0 +1,55 @@
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class RequestCoalescer(Generic[T]):
+    """
+    Identical requests sent while one is already in flight wait for it and share its result, instead of being sent again.
+    Nothing is kept once the request is done, this is not a cache.
+
+    The waiters receive `copy(result)`, a mutable result must not be shared between callers.
+    """
+
+    def __init__(
+        self,
+        copy: Optional[Callable[[T], T]] = None,
+    ):
+        self._copy = copy
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, "Future[T]"] = {}
+
+    def run(
+        self,
+        key: Hashable,
+        function: Callable[[], T],
+    ) -> T:
+        with self._lock:
+            future = self._in_flight.get(key)
+
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+
+        if not leader:
+            result = future.result()
+
+            if self._copy is not None:
+                result = self._copy(result)
+
+            return result
+
+        try:
+            result = function()
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
@@ -43,6 +43,8 @@ class CompetitionStatus(Enum):
 
 class Competition(Model):
 
+    __slots__ = ()
+
     resource_identifier_attribute = "name"
 
     @property
@@ -7,6 +7,8 @@ from .phase import Phase
 
 class Crunch(Model):
 
+    __slots__ = ("_phase",)
+
     resource_identifier_attribute = "number"
 
     def __init__(
@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Union
 
 from dataclasses_json import LetterCase, Undefined, dataclass_json
 
-from crunch.api._resource import Collection, Model
+from crunch.api._resource import Collection, Model, memoized_property, require_sync_client
 
 if TYPE_CHECKING:
     from crunch.api._client import Client
@@ -93,6 +93,8 @@ class SizeVariant(Enum):
 
 class DataRelease(Model):
 
+    __slots__ = ("_competition",)
+
     resource_identifier_attribute = "number"
 
     def __init__(
@@ -138,10 +140,12 @@ class DataRelease(Model):
     def target_resolution(self):
         return DataReleaseTargetResolution[self._attrs["target_resolution"]]
 
-    @property
+    @memoized_property
     def data_files(self) -> DataFiles:
         files = self._attrs.get("dataFiles")
         if not files:
+            require_sync_client(self._client, "lazily loading `DataRelease.data_files`")
+
             self.reload()
             files = self._attrs["dataFiles"]
 
@@ -150,10 +154,12 @@ class DataRelease(Model):
             for key, value in files.items()
         }
 
-    @property
+    @memoized_property
     def splits(self) -> List[DataReleaseSplit]:
         splits = self._attrs.get("splits")
         if splits is None:
+            require_sync_client(self._client, "lazily loading `DataRelease.splits`")
+
             self.reload(include_splits=True)
             splits = self._attrs["splits"]
 
@@ -1,16 +1,22 @@
+import itertools
 import typing
 import warnings
 
 from .._identifiers import LeaderboardIdentifierType
-from .._resource import Collection, Model
+from .._resource import Collection, Model, require_sync_client
 from .competition import Competition
 
 if typing.TYPE_CHECKING:
+    import pandas
+    import pyarrow
+
     from .crunch import Crunch
 
 
 class Leaderboard(Model):
 
+    __slots__ = ("_competition",)
+
     resource_identifier_attribute = "name"
 
     def __init__(
@@ -28,70 +34,170 @@ class Leaderboard(Model):
     def name(self):
         return self._attrs["name"]
 
-    def as_dataframe(self):
-        if "targets" not in self._attrs:
-            self.reload()
+    @typing.overload
+    def as_dataframe(self, *, arrow: typing.Literal[False] = False) -> "pandas.DataFrame": ...
+
+    @typing.overload
+    def as_dataframe(self, *, arrow: typing.Literal[True]) -> "pyarrow.Table": ...
+
+    def as_dataframe(
+        self,
+        *,
+        arrow: bool = False,
+    ):
+        """
+        One row per position of every target, built column by column.
+        The repeated strings (target, login, project and team names) are categorical, or dictionary encoded with `arrow=True`.
 
-        rows = []
+        If the targets are not loaded yet, they are decoded one at a time from the response instead of being kept in the attributes.
+        """
 
-        for target in self._attrs.get("targets") or []:
-            crunch = target.get("crunch")
+        if "targets" in self._attrs:
+            targets = self._attrs.get("targets") or []
+        else:
+            require_sync_client(self._client, "`Leaderboard.as_dataframe()` without the targets loaded")
 
-            target_row = {
-                "target.id": target.get("id"),
-                "target.name": target.get("name"),
-                "crunch.id": crunch.get("id"),
-                "crunch.number": crunch.get("number"),
-            }
+            targets = self._client.api.stream_leaderboard_targets(
+                self._competition.resource_identifier,
+                self.resource_identifier,
+            )
+
+        columns: typing.Dict[str, typing.List[typing.Any]] = {
+            name: []
+            for name in _POSITION_COLUMNS
+        }
+
+        def get_metric_column(name: str, size: int):
+            column = columns.get(name)
+            if column is None:
+                column = columns[name] = [None] * size
+
+            return column
+
+        # local references, the loop below runs once per position
+        user_ids, user_logins = columns["user.id"], columns["user.login"]
+        project_ids, project_names = columns["project.id"], columns["project.name"]
+        team_ids, team_names = columns["team.id"], columns["team.name"]
+        position_columns = [
+            (columns[name], key)
+            for name, key in _POSITION_FIELDS
+        ]
+
+        row = 0
+        for target in targets:
+            crunch = target.get("crunch") or {}
+
+            target_values = (
+                ("target.id", target.get("id")),
+                ("target.name", target.get("name")),
+                ("crunch.id", crunch.get("id")),
+                ("crunch.number", crunch.get("number")),
+            )
 
-            metrics_by_id = {
-                metric.get("id"): metric
+            positions = target.get("positions") or []
+            end = row + len(positions)
+
+            for column in columns.values():
+                column.extend(itertools.repeat(None, len(positions)))
+
+            metric_columns_by_id = {
+                metric.get("id"): (
+                    get_metric_column(f"metric.{metric['name']}.score", end),
+                    get_metric_column(f"metric.{metric['name']}.best", end),
+                )
                 for metric in target.get("metrics") or []
             }
 
-            for position in target.get("positions") or []:
-                user = position.get("user")
-                project = position.get("project")
+            for name, value in target_values:
+                columns[name][row:end] = [value] * len(positions)
+
+            for position in positions:
+                user = position.get("user") or {}
+                project = position.get("project") or {}
                 team = position.get("team") or {}
 
-                row = {
-                    **target_row,
-                    "user.id": user.get("id"),
-                    "user.login": user.get("login"),
-                    "project.id": project.get("id"),
-                    "project.name": project.get("name"),
-                    "team.id": team.get("id"),
-                    "team.name": team.get("name"),
-                    "mean": position.get("mean"),
-                    "best": position.get("best"),
-                    "rank": position.get("rank"),
-                    "reward_rank": position.get("rewardRank"),
-                    "successful_run_count": position.get("successfulRunCount"),
-                    "unsuccessful_run_count": position.get("unsuccessfulRunCount"),
-                    "duplicate": position.get("duplicate"),
-                    "deterministic": position.get("deterministic"),
-                    "out_of_range": position.get("outOfRange"),
-                    "team_leader": position.get("teamLeader"),
-                    "round_change": position.get("roundChange"),
-                    "phase_change": position.get("phaseChange"),
-                    "crunch_change": position.get("crunchChange"),
-                    "committed_rewards": position.get("committedRewards"),
-                    "projected_rewards": position.get("projectedRewards"),
-                    "bounty_rewards": position.get("bountyRewards"),
-                }
+                user_ids[row] = user.get("id")
+                user_logins[row] = user.get("login")
+                project_ids[row] = project.get("id")
+                project_names[row] = project.get("name")
+                team_ids[row] = team.get("id")
+                team_names[row] = team.get("name")
 
-                for position_metric in position.get("metrics"):
-                    metric_id = position_metric.get("metricId")
-                    metric = metrics_by_id[metric_id]
-                    key = f"metric.{metric['name']}"
+                for column, key in position_columns:
+                    column[row] = position.get(key)
 
-                    row[f"{key}.score"] = position_metric.get("score")
-                    row[f"{key}.best"] = position_metric.get("best")
+                for position_metric in position.get("metrics") or []:
+                    score_column, best_column = metric_columns_by_id[position_metric.get("metricId")]
 
-                rows.append(row)
+                    score_column[row] = position_metric.get("score")
+                    best_column[row] = position_metric.get("best")
+
+                row += 1
+
+        if arrow:
+            import pyarrow
+
+            return pyarrow.table({
+                name: pyarrow.array(values).dictionary_encode() if name in _CATEGORICAL_COLUMNS else pyarrow.array(values)
+                for name, values in columns.items()
+            })
 
         import pandas
-        return pandas.DataFrame(rows)
+
+        return pandas.DataFrame({
+            name: pandas.Categorical(values) if name in _CATEGORICAL_COLUMNS else values
+            for name, values in columns.items()
+        })
+
+
+"""
+Columns of the position fields, with their key in the api response.
+"""
+_POSITION_FIELDS = (
+    ("mean", "mean"),
+    ("best", "best"),
+    ("rank", "rank"),
+    ("reward_rank", "rewardRank"),
+    ("successful_run_count", "successfulRunCount"),
+    ("unsuccessful_run_count", "unsuccessfulRunCount"),
+    ("duplicate", "duplicate"),
+    ("deterministic", "deterministic"),
+    ("out_of_range", "outOfRange"),
+    ("team_leader", "teamLeader"),
+    ("round_change", "roundChange"),
+    ("phase_change", "phaseChange"),
+    ("crunch_change", "crunchChange"),
+    ("committed_rewards", "committedRewards"),
+    ("projected_rewards", "projectedRewards"),
+    ("bounty_rewards", "bountyRewards"),
+)
+
+"""
+Columns of every leaderboard dataframe, the metric columns follow.
+"""
+_POSITION_COLUMNS = (
+    "target.id",
+    "target.name",
+    "crunch.id",
+    "crunch.number",
+    "user.id",
+    "user.login",
+    "project.id",
+    "project.name",
+    "team.id",
+    "team.name",
+    *(name for name, _ in _POSITION_FIELDS),
+)
+
+"""
+Strings repeated on many rows.
+"""
+_CATEGORICAL_COLUMNS = frozenset((
+    "target.name",
+    "user.login",
+    "project.name",
+    "team.name",
+))
 
 
 class LeaderboardCollection(Collection[Leaderboard]):
@@ -192,6 +298,23 @@ class LeaderboardEndpointMixin:
             json=True
         )
 
+    def stream_leaderboard_targets(
+        self,
+        competition_identifier,
+        leaderboard_identifier,
+        crunch_id=None,
+    ):
+        return self._result_stream(
+            self.get(
+                f"/v2/competitions/{competition_identifier}/leaderboards/{leaderboard_identifier}",
+                params={
+                    "crunchId": crunch_id
+                },
+                stream=True,
+            ),
+            key="targets",
+        )
+
     def get_leaderboard(
         self,
         competition_identifier,
@@ -10,6 +10,8 @@ if typing.TYPE_CHECKING:
 
 class Library(Model):
 
+    __slots__ = ()
+
     @property
     def name(self) -> str:
         return self._attrs["name"]
@@ -26,6 +28,10 @@ class Library(Model):
     def aliases(self) -> typing.Tuple[str]:
         return tuple(self._attrs.get("aliases") or [])
 
+    @property
+    def freeze(self) -> bool:
+        return self._attrs.get("freeze", False)
+
 
 class LibraryCollection(Collection[Library]):
 
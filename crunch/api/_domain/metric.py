@@ -42,6 +42,8 @@ class ReducerFunction(enum.Enum):
 
 class Metric(Model):
 
+    __slots__ = ("_competition", "_target")
+
     resource_identifier_attribute = "name"
 
     def __init__(
@@ -50,6 +50,8 @@ class PhaseType(Enum):
 
 class Phase(Model):
 
+    __slots__ = ("_round",)
+
     resource_identifier_attribute = "type"
 
     def __init__(
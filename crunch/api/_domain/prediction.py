@@ -1,11 +1,13 @@
 import typing
 
-from .._resource import Collection, Model
+from .._resource import Collection, Model, require_sync_client
 from .project import Project
 
 
 class Prediction(Model):
 
+    __slots__ = ("_project",)
+
     def __init__(
         self,
         project: Project,
@@ -79,6 +81,24 @@ class PredictionCollection(Collection[Prediction]):
             )
         )
 
+    def scores_as_dataframe(
+        self,
+        *,
+        arrow: bool = False,
+    ):
+        """
+        Scores of all the predictions of the project, see `crunch.api.scores_as_dataframe()`.
+        """
+
+        from .score import scores_as_dataframe
+
+        require_sync_client(self._client, "`PredictionCollection.scores_as_dataframe()`")
+
+        return scores_as_dataframe(
+            self.list(),
+            arrow=arrow,
+        )
+
     def prepare_model(self, attrs):
         return super().prepare_model(
             attrs,
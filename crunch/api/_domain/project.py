@@ -2,13 +2,15 @@ import datetime
 import enum
 import typing
 
-from .._resource import Collection, Model
+from .._resource import Collection, Model, memoized_property
 from .competition import Competition
 from .user import User
 
 
 class Project(Model):
 
+    __slots__ = ("_competition",)
+
     resource_identifier_attribute = ("userId", "name")
 
     def __init__(
@@ -34,7 +36,7 @@ class Project(Model):
     def name(self) -> str:
         return self._attrs["name"]
 
-    @property
+    @memoized_property
     def user(self) -> User:
         return self._client.users.get(self.user_id)
 
@@ -137,6 +139,8 @@ class ProjectTokenType(enum.Enum):
 
 class ProjectToken(Model):
 
+    __slots__ = ("_competition",)
+
     def __init__(
         self,
         competition: typing.Optional[Competition],
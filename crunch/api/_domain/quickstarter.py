@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
 import dataclasses_json
 
 from crunch.api._domain.enum_ import Language
-from crunch.api._resource import Collection, Model
+from crunch.api._resource import Collection, Model, memoized_property, require_sync_client
 
 if TYPE_CHECKING:
     from crunch.api._client import Client
@@ -56,6 +56,8 @@ class QuickstarterFile:
 
 class Quickstarter(Model):
 
+    __slots__ = ("_competition",)
+
     resource_identifier_attribute = "name"
 
     def __init__(
@@ -81,7 +83,7 @@ class Quickstarter(Model):
     def title(self) -> str:
         return self._attrs["title"]
 
-    @property
+    @memoized_property
     def authors(self) -> List[QuickstarterAuthor]:
         return QuickstarterAuthor.from_dict_array(self._attrs["authors"])
 
@@ -93,10 +95,12 @@ class Quickstarter(Model):
     def notebook(self) -> bool:
         return self._attrs["notebook"]
 
-    @property
+    @memoized_property
     def files(self) -> List[QuickstarterFile]:
         files = self._attrs.get("files")
         if not files:
+            require_sync_client(self._client, "lazily loading `Quickstarter.files`")
+
             self.reload()
             files = self._attrs["files"]
 
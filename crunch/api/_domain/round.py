@@ -11,6 +11,8 @@ if TYPE_CHECKING:
 
 class Round(Model):
 
+    __slots__ = ("_competition",)
+
     resource_identifier_attribute = "number"
 
     def __init__(
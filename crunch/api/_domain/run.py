@@ -6,6 +6,8 @@ from .project import Project
 
 class Run(Model):
 
+    __slots__ = ("_project",)
+
     def __init__(
         self,
         project: Project,
@@ -93,6 +93,8 @@ class RunnerRunMetric:
 
 class RunnerRun(Model):
 
+    __slots__ = ("_run_id",)
+
     def __init__(
         self,
         run_id: int,
@@ -157,6 +159,7 @@ class RunnerRun(Model):
         deterministic: Optional[bool],
         prediction_files: Dict[str, str],
         model_files: Dict[str, str],
+        reused_model_files: Optional[List[str]] = None,
     ):
         self._client.api.submit_runner_run_result(
             self._run_id,
@@ -164,6 +167,7 @@ class RunnerRun(Model):
             deterministic,
             prediction_files,
             model_files,
+            reused_model_files,
         )
 
 
@@ -239,15 +243,21 @@ class RunnerRunEndpointMixin:
         deterministic,
         prediction_files,
         model_files,
+        reused_model_files=None,
     ):
+        body = {
+            "useInitialModel": use_initial_model,
+            "deterministic": deterministic,
+            "predictionFiles": prediction_files,
+            "modelFiles": model_files,
+        }
+
+        if reused_model_files is not None:
+            body["reusedModelFiles"] = reused_model_files
+
         return self._result(
             self.post(
                 f"/v1/runner/runs/{run_id}/result",
-                json={
-                    "useInitialModel": use_initial_model,
-                    "deterministic": deterministic,
-                    "predictionFiles": prediction_files,
-                    "modelFiles": model_files,
-                },
+                json=body,
             )
         )
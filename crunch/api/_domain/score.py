@@ -1,11 +1,16 @@
 import dataclasses
 import typing
+from concurrent.futures import ThreadPoolExecutor
 
 import dataclasses_json
 
-from .._resource import Collection, Model
+from .._resource import Collection, Model, memoized_property
 from .prediction import Prediction
 
+if typing.TYPE_CHECKING:
+    import pandas
+    import pyarrow
+
 
 @dataclasses_json.dataclass_json(
     letter_case=dataclasses_json.LetterCase.CAMEL,
@@ -29,6 +34,8 @@ class ScoreDetail:
 
 class Score(Model):
 
+    __slots__ = ("_prediction",)
+
     def __init__(
         self,
         prediction: Prediction,
@@ -44,7 +51,7 @@ class Score(Model):
     def prediction(self):
         return self._prediction
 
-    @property
+    @memoized_property
     def metric(self):
         from .metric import Metric
 
@@ -54,7 +61,7 @@ class Score(Model):
 
         return None
 
-    @property
+    @memoized_property
     def details(self) -> typing.List[ScoreDetail]:
         return ScoreDetail.from_dict_array(self._attrs.get("details") or [])
 
@@ -94,6 +101,102 @@ class ScoreCollection(Collection[Score]):
         )
 
 
+"""
+Scores are listed per prediction, the predictions are requested concurrently.
+"""
+SCORES_MAX_WORKERS = 16
+
+
+@typing.overload
+def scores_as_dataframe(
+    predictions: typing.Iterable[Prediction],
+    *,
+    max_workers: int = SCORES_MAX_WORKERS,
+    arrow: typing.Literal[False] = False,
+) -> "pandas.DataFrame":
+    ...
+
+
+@typing.overload
+def scores_as_dataframe(
+    predictions: typing.Iterable[Prediction],
+    *,
+    max_workers: int = SCORES_MAX_WORKERS,
+    arrow: typing.Literal[True],
+) -> "pyarrow.Table":
+    ...
+
+
+def scores_as_dataframe(
+    predictions: typing.Iterable[Prediction],
+    *,
+    max_workers: int = SCORES_MAX_WORKERS,
+    arrow: bool = False,
+):
+    """
+    One row per score of every prediction, with a `score.<field>` column per scalar field and a `detail.<key>` column per detail key.
+    The scores are read as returned by the api, without creating a `Score` per row.
+    """
+
+    predictions = list(predictions)
+
+    def fetch(prediction: Prediction) -> typing.List[dict]:
+        project = prediction.project
+
+        return prediction._client.api.list_scores(
+            project.competition.id,
+            project.user_id,
+            project.name,
+            prediction.id,
+        )
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(predictions)))) as executor:
+        scores_list = list(executor.map(fetch, predictions))
+
+    row_count = sum(map(len, scores_list))
+    columns: typing.Dict[str, typing.List[typing.Any]] = {}
+
+    def set_value(name: str, row: int, value: typing.Any):
+        column = columns.get(name)
+        if column is None:
+            column = columns[name] = [None] * row_count
+
+        column[row] = value
+
+    row = 0
+    for prediction, scores in zip(predictions, scores_list):
+        project = prediction.project
+
+        for score in scores:
+            set_value("prediction.id", row, prediction.id)
+            set_value("prediction.name", row, prediction._attrs.get("name"))
+            set_value("project.user_id", row, project.user_id)
+            set_value("project.name", row, project.name)
+
+            for key, value in score.items():
+                if not isinstance(value, (dict, list)):
+                    set_value(f"score.{key}", row, value)
+
+            metric = score.get("metric") or {}
+            set_value("metric.id", row, metric.get("id"))
+            set_value("metric.name", row, metric.get("name"))
+            set_value("target.name", row, (metric.get("target") or {}).get("name"))
+
+            for detail in score.get("details") or []:
+                set_value(f"detail.{detail['key']}", row, detail.get("value"))
+
+            row += 1
+
+    if arrow:
+        import pyarrow
+
+        return pyarrow.Table.from_pydict(columns)
+
+    import pandas
+
+    return pandas.DataFrame(columns)
+
+
 class ScoreEndpointMixin:
 
     def list_scores(
@@ -1,3 +1,4 @@
+import inspect
 from enum import Enum
 from typing import TYPE_CHECKING, Dict, Iterator, List, Optional
 
@@ -22,6 +23,8 @@ class SubmissionType(Enum):
 
 class Submission(Model):
 
+    __slots__ = ("_project",)
+
     resource_identifier_attribute = "number"
 
     def __init__(
@@ -103,6 +106,9 @@ class SubmissionCollection(Collection[Submission]):
         type: SubmissionType,
         code_files: Dict[str, str],
         model_files: Dict[str, str],
+        parent_submission_number: Optional[int] = None,
+        reused_code_files: Optional[List[str]] = None,
+        reused_model_files: Optional[List[str]] = None,
     ) -> Submission:
         return self.prepare_model(
             self._client.api.create_submission(
@@ -115,9 +121,22 @@ class SubmissionCollection(Collection[Submission]):
                 type.name,
                 code_files,
                 model_files,
+                parent_submission_number,
+                reused_code_files,
+                reused_model_files,
             )
         )
 
+    def get_latest(self) -> Optional[Submission]:
+        submissions = self.list()
+        if inspect.isawaitable(submissions):
+            return self._get_latest_async(submissions)  # type: ignore
+
+        return _find_latest(submissions)
+
+    async def _get_latest_async(self, submissions):
+        return _find_latest(await submissions)
+
     def get_next_encryption_id(self) -> str:
         return self._client.api.get_submission_next_encryption_id(
             self.project.competition.id,
@@ -172,20 +191,30 @@ class SubmissionEndpointMixin:
         type,
         code_files,
         model_files,
+        parent_submission_number=None,
+        reused_code_files=None,
+        reused_model_files=None,
     ):
+        body = {
+            "message": message,
+            "mainFilePath": main_file_path,
+            "modelDirectoryPath": model_directory_path,
+            "type": type,
+            "codeFiles": code_files,
+            "modelFiles": model_files,
+            # TODO Use a better way to pass the push token
+            "pushToken": self.auth_._token if isinstance(self.auth_, PushTokenAuth) else None,
+        }
+
+        if parent_submission_number is not None:
+            body["parentSubmissionNumber"] = parent_submission_number
+            body["reusedCodeFiles"] = reused_code_files or []
+            body["reusedModelFiles"] = reused_model_files or []
+
         return self._result(
             self.post(
                 f"/v4/competitions/{competition_identifier}/projects/{user_identifier}/{project_identifier}/submissions",
-                json={
-                    "message": message,
-                    "mainFilePath": main_file_path,
-                    "modelDirectoryPath": model_directory_path,
-                    "type": type,
-                    "codeFiles": code_files,
-                    "modelFiles": model_files,
-                    # TODO Use a better way to pass the push token
-                    "pushToken": self.auth_._token if isinstance(self.auth_, PushTokenAuth) else None,
-                },
+                json=body,
             ),
             json=True,
         )
@@ -204,3 +233,12 @@ class SubmissionEndpointMixin:
                 },
             ),
         )
+
+
+def _find_latest(
+    submissions: List[Submission],
+) -> Optional[Submission]:
+    if not submissions:
+        return None
+
+    return max(submissions, key=lambda submission: submission.number)
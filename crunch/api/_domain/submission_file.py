@@ -6,6 +6,8 @@ from .submission import Submission
 
 class SubmissionFile(Model):
 
+    __slots__ = ("_submission",)
+
     resource_identifier_attribute = "name"
 
     def __init__(
@@ -10,6 +10,8 @@ if TYPE_CHECKING:
 
 class Target(Model):
 
+    __slots__ = ("_competition",)
+
     resource_identifier_attribute = "name"
 
     def __init__(
@@ -1,18 +1,37 @@
 import dataclasses
 import enum
+import json
+import math
 import os
+import threading
 import time
 import typing
-from io import BytesIO
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from io import BufferedReader, BytesIO, FileIO
 
 import dataclasses_json
 import requests
 from tqdm.auto import tqdm
 
+from ...compression import Codec
+from ...utils import atomic_write
+from .._resource import Collection, Model, memoized_property
+
 if typing.TYPE_CHECKING:
     from crunch_encrypt.ecies import EphemeralPublicKeyPem, PublicKeyPem
 
-from .._resource import Collection, Model
+    from ...delta import Signature
+
+
+"""
+Maximum number of uploads created or completed by a single bulk call.
+"""
+BULK_MAX_COUNT = 100
+
+"""
+Packed archives and delta payloads are kept in memory up to this size, then spooled to disk.
+"""
+PACK_SPOOL_MAX_MEMORY_SIZE = 16 * 1024 * 1024
 
 
 class UploadStatus(enum.Enum):
@@ -41,6 +60,8 @@ class PresignedUploadRequest:
 
 class Upload(Model):
 
+    __slots__ = ()
+
     resource_identifier_attribute = "id"
 
     @property
@@ -59,6 +80,14 @@ class Upload(Model):
     def chunked(self) -> bool:
         return self._attrs["chunked"]
 
+    @property
+    def compression(self) -> typing.Optional[Codec]:
+        value = self._attrs.get("compression")
+        if value is None:
+            return None
+
+        return Codec.parse(value)
+
     @property
     def status(self):
         return UploadStatus[self._attrs["status"]]
@@ -71,7 +100,7 @@ class Upload(Model):
     def provider(self):
         return UploadProvider[self._attrs["provider"]]
 
-    @property
+    @memoized_property
     def chunks(self) -> typing.List["UploadChunk"]:
         return [
             UploadChunk(self, chunk_attrs, self._client)
@@ -79,21 +108,21 @@ class Upload(Model):
         ]
 
     def complete(self):
-        self._attrs.update(
+        self._update_attrs(
             self._client.api.complete_upload(
                 self.id,
             )
         )
 
     def abort(self):
-        self._attrs.update(
+        self._update_attrs(
             self._client.api.abort_upload(
                 self.id,
             )
         )
 
     def delete(self):
-        self._attrs.update(
+        self._update_attrs(
             self._client.api.delete_upload(
                 self.id,
             )
@@ -102,6 +131,8 @@ class Upload(Model):
 
 class UploadChunk(Model):
 
+    __slots__ = ("_upload",)
+
     id_attribute = None
     resource_identifier_attribute = "number"
 
@@ -142,6 +173,11 @@ class UploadChunk(Model):
 
     @property
     def request(self) -> PresignedUploadRequest:
+        # bulk uploads are created with their requests, avoiding a call per chunk
+        inline = self._attrs.get("request")
+        if inline is not None:
+            return PresignedUploadRequest.from_dict(inline)
+
         return PresignedUploadRequest.from_dict(
             self._client.api.get_upload_chunk_request(
                 self.upload.id,
@@ -150,7 +186,7 @@ class UploadChunk(Model):
         )
 
     def confirm(self, hash: str):
-        self._attrs.update(
+        self._update_attrs(
             self._client.api.confirm_upload_chunk(
                 self.upload.id,
                 self.number,
@@ -164,7 +200,18 @@ class UploadChunk(Model):
         max_retry: int = 10,
         byte_callback: typing.Optional[typing.Callable[[int], None]] = None,
         retry_callback: typing.Optional[typing.Callable[[], None]] = None,
-    ):
+        timing_callback: typing.Optional[typing.Callable[[int, float, float], None]] = None,
+        confirm: bool = True,
+    ) -> str:
+        """
+        The `timing_callback` receives the chunk size, the seconds spent transferring it and the seconds spent on the api calls around it.
+
+        A `fd` that is not seekable is read into memory first, so that the chunk can be retried: up to `ChunkSizePolicy.MAXIMUM_CHUNK_SIZE`.
+
+        Returns:
+            The hash of the chunk, to confirm it later if `confirm` is False.
+        """
+
         from ...utils import LimitedSizeIO
 
         seek_back_to = self.offset
@@ -182,7 +229,10 @@ class UploadChunk(Model):
             try:
                 fd.seek(seek_back_to)
 
+                start = time.monotonic()
                 request = self.request
+                requested = time.monotonic()
+
                 response = requests.request(
                     request.method,
                     request.url,
@@ -191,6 +241,7 @@ class UploadChunk(Model):
                 )
 
                 response.raise_for_status()
+                transferred = time.monotonic()
 
                 break
             except (requests.exceptions.ConnectionError, KeyboardInterrupt) as error:
@@ -209,7 +260,187 @@ class UploadChunk(Model):
         else:
             raise ValueError(f"unknown provider: {provider}")
 
-        self.confirm(hash)
+        if confirm:
+            self.confirm(hash)
+
+        if timing_callback is not None:
+            timing_callback(
+                self.size,
+                transferred - requested,
+                (requested - start) + (time.monotonic() - transferred),
+            )
+
+        return hash
+
+
+class ChunkSizePolicy:
+    """
+    Pick the chunk size and the number of chunks sent in parallel, from the file size and from the throughput and latency measured on the previous chunks.
+
+    A chunk should take about `target_chunk_seconds` to transfer, which bounds the work lost when it must be retried.
+    It is also made big enough for the api calls around it to stay negligible.
+    """
+
+    # S3 refuses smaller multipart parts
+    MINIMUM_CHUNK_SIZE = 5 * 1024 * 1024
+    MAXIMUM_CHUNK_SIZE = 512 * 1024 * 1024
+
+    # S3 refuses more parts
+    MAXIMUM_CHUNK_COUNT = 10_000
+
+    # assumed before anything is measured, gives the historical 50MB chunks
+    DEFAULT_THROUGHPUT = 2_500_000
+
+    # weight of the latest measurement in the moving averages
+    SMOOTHING = 0.3
+
+    def __init__(
+        self,
+        *,
+        target_chunk_seconds: float = 20,
+        maximum_overhead_ratio: float = 0.1,
+        maximum_parallelism: int = 4,
+    ):
+        self.target_chunk_seconds = target_chunk_seconds
+        self.maximum_overhead_ratio = maximum_overhead_ratio
+        self.maximum_parallelism = maximum_parallelism
+
+        self.throughput: typing.Optional[float] = None
+        self.latency: typing.Optional[float] = None
+
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        size: int,
+        transfer_seconds: float,
+        overhead_seconds: float,
+    ):
+        """
+        Measurement of a single chunk, as reported by `UploadChunk.send(timing_callback=...)`.
+        """
+
+        throughput = size / max(transfer_seconds, 1e-3)
+
+        with self._lock:
+            self.throughput = self._smooth(self.throughput, throughput)
+            self.latency = self._smooth(self.latency, overhead_seconds)
+
+    def choose_chunk_size(
+        self,
+        size: int,
+    ) -> int:
+
+        with self._lock:
+            throughput = self.throughput or self.DEFAULT_THROUGHPUT
+            latency = self.latency or 0
+
+        chunk_size = max(
+            throughput * self.target_chunk_seconds,
+            throughput * latency / self.maximum_overhead_ratio,
+            math.ceil(size / self.MAXIMUM_CHUNK_COUNT),
+        )
+
+        return int(min(max(chunk_size, self.MINIMUM_CHUNK_SIZE), self.MAXIMUM_CHUNK_SIZE))
+
+    def choose_parallelism(
+        self,
+        chunk_count: int,
+    ) -> int:
+        """
+        A single stream rarely saturates the link, but more streams than chunks is pointless.
+        """
+
+        return max(1, min(chunk_count, self.maximum_parallelism))
+
+    def _smooth(
+        self,
+        previous: typing.Optional[float],
+        value: float,
+    ) -> float:
+        if previous is None:
+            return value
+
+        return previous + self.SMOOTHING * (value - previous)
+
+
+class UploadJournal:
+    """
+    Remember the uploads that are still in progress, so that a retry or a new process can resume them instead of starting from zero.
+
+    Entries are keyed by the file identity (name, size, modification time, inode and compression), a modified file will never resume a stale upload.
+    """
+
+    def __init__(
+        self,
+        path: str,
+    ):
+        self.path = path
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        path: str,
+        name: str,
+        compression: typing.Optional[Codec] = None,
+    ) -> str:
+        stat = os.stat(path)
+        codec = compression.name if compression is not None else ""
+
+        return f"{name}:{stat.st_size}:{stat.st_mtime_ns}:{stat.st_ino}:{codec}"
+
+    def get(
+        self,
+        key: str,
+    ) -> typing.Optional[str]:
+        with self._lock:
+            return self._read().get(key)
+
+    def put(
+        self,
+        key: str,
+        upload_id: str,
+    ):
+        with self._lock:
+            entries = self._read()
+            entries[key] = upload_id
+            self._write(entries)
+
+    def remove(
+        self,
+        key: str,
+    ):
+        with self._lock:
+            entries = self._read()
+            if entries.pop(key, None) is not None:
+                self._write(entries)
+
+    def _read(self) -> typing.Dict[str, str]:
+        try:
+            with open(self.path) as fd:
+                entries = json.load(fd)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+        if not isinstance(entries, dict):
+            return {}
+
+        return entries
+
+    def _write(self, entries: typing.Dict[str, str]):
+        with atomic_write(self.path) as fd:
+            json.dump(entries, fd)
+
+
+def _get_reopenable_path(io: typing.BinaryIO) -> typing.Optional[str]:
+    if not isinstance(io, (BufferedReader, FileIO)):
+        return None
+
+    path = getattr(io, "name", None)
+    if not isinstance(path, str) or not os.path.isfile(path):
+        return None
+
+    return path
 
 
 class UploadCollection(Collection[Upload]):
@@ -225,7 +456,8 @@ class UploadCollection(Collection[Upload]):
         name: str,
         size: int,
         encrypted: bool = False,
-        preferred_chunk_size: typing.Optional[int] = None
+        preferred_chunk_size: typing.Optional[int] = None,
+        compression: typing.Optional[Codec] = None,
     ) -> Upload:
         return self.prepare_model(
             self._client.api.create_upload(
@@ -233,9 +465,10 @@ class UploadCollection(Collection[Upload]):
                 size,
                 encrypted,
                 preferred_chunk_size,
+                compression.name if compression is not None else None,
             )
         )
-    
+
     def send_from_file(
         self,
         *,
@@ -245,10 +478,14 @@ class UploadCollection(Collection[Upload]):
         preferred_chunk_size: typing.Optional[int] = None,
         progress_bar: bool = False,
         max_retry: int = 10,
+        compression: typing.Optional[Codec] = None,
+        journal: typing.Optional[UploadJournal] = None,
     ) -> Upload:
         if size is None:
             size = os.path.getsize(path)
 
+        journal_key = UploadJournal.make_key(path, name, compression) if journal is not None else None
+
         with open(path, "rb") as file:
             return self.send_from_io(
                 io=file,
@@ -258,8 +495,39 @@ class UploadCollection(Collection[Upload]):
                 preferred_chunk_size=preferred_chunk_size,
                 progress_bar=progress_bar,
                 max_retry=max_retry,
+                compression=compression,
+                journal=journal,
+                journal_key=journal_key,
             )
 
+    def send_encrypted_file(
+        self,
+        *,
+        path: str,
+        name: str,
+        preferred_chunk_size: typing.Optional[int] = None,
+        progress_bar: bool = False,
+        max_retry: int = 10,
+    ) -> Upload:
+        """
+        Upload a file that is already encrypted.
+        """
+
+        size = os.path.getsize(path)
+
+        with open(path, "rb") as file:
+            return typing.cast(Upload, self._send_from_io(
+                io=file,
+                name=name,
+                size=size,
+                public_key_pem=None,
+                preferred_chunk_size=preferred_chunk_size,
+                progress_bar=progress_bar,
+                max_retry=max_retry,
+                compression=None,
+                encrypted=True,
+            ))
+
     @typing.overload
     def send_from_io(
         self,
@@ -271,6 +539,9 @@ class UploadCollection(Collection[Upload]):
         preferred_chunk_size: typing.Optional[int],
         progress_bar: bool,
         max_retry: int = 10,
+        compression: typing.Optional[Codec] = None,
+        journal: typing.Optional[UploadJournal] = None,
+        journal_key: typing.Optional[str] = None,
     ) -> Upload:
         pass
 
@@ -285,6 +556,9 @@ class UploadCollection(Collection[Upload]):
         preferred_chunk_size: typing.Optional[int],
         progress_bar: bool,
         max_retry: int = 10,
+        compression: typing.Optional[Codec] = None,
+        journal: typing.Optional[UploadJournal] = None,
+        journal_key: typing.Optional[str] = None,
     ) -> typing.Tuple[Upload, "EphemeralPublicKeyPem"]:
         pass
 
@@ -298,11 +572,72 @@ class UploadCollection(Collection[Upload]):
         preferred_chunk_size: typing.Optional[int] = None,
         progress_bar: bool = False,
         max_retry: int = 10,
+        compression: typing.Optional[Codec] = None,
+        journal: typing.Optional[UploadJournal] = None,
+        journal_key: typing.Optional[str] = None,
+    ) -> typing.Union[Upload, typing.Tuple[Upload, "EphemeralPublicKeyPem"]]:
+        """
+        When a `journal` and a `journal_key` are provided, a failed upload is not aborted and will be resumed by the next call with the same key.
+        Encrypted uploads are never resumed: the ephemeral key changes every time.
+        """
+
+        if journal is None or journal_key is None or public_key_pem is not None:
+            journal, journal_key = None, None
+
+        # the download would decompress the ciphertext, before it could be decrypted
+        if compression is not None and public_key_pem is not None:
+            raise ValueError("compression is not supported for encrypted uploads")
+
+        if compression is None:
+            return self._send_from_io(
+                io=io,
+                name=name,
+                size=size,
+                public_key_pem=public_key_pem,
+                preferred_chunk_size=preferred_chunk_size,
+                progress_bar=progress_bar,
+                max_retry=max_retry,
+                compression=None,
+                journal=journal,
+                journal_key=journal_key,
+            )
+
+        from ...compression import compress
+
+        compressed_io, compressed_size = compress(io, compression)
+        with compressed_io:
+            return self._send_from_io(
+                io=compressed_io,
+                name=name,
+                size=compressed_size,
+                public_key_pem=public_key_pem,
+                preferred_chunk_size=preferred_chunk_size,
+                progress_bar=progress_bar,
+                max_retry=max_retry,
+                compression=compression,
+                journal=journal,
+                journal_key=journal_key,
+            )
+
+    def _send_from_io(
+        self,
+        *,
+        io: typing.BinaryIO,
+        name: str,
+        size: int,
+        public_key_pem: typing.Optional["PublicKeyPem"],
+        preferred_chunk_size: typing.Optional[int],
+        progress_bar: bool,
+        max_retry: int,
+        compression: typing.Optional[Codec],
+        journal: typing.Optional[UploadJournal] = None,
+        journal_key: typing.Optional[str] = None,
+        encrypted: bool = False,
     ) -> typing.Union[Upload, typing.Tuple[Upload, "EphemeralPublicKeyPem"]]:
         ephemeral_public_key_pem: typing.Optional[str] = None
 
-        encrypted = public_key_pem is not None
-        if encrypted:
+        if public_key_pem is not None:
+            encrypted = True
             from crunch_encrypt.ecies import (OVERHEAD_BYTES_COUNT,
                                               ECIESEncryptIO)
 
@@ -314,12 +649,26 @@ class UploadCollection(Collection[Upload]):
             ephemeral_public_key_pem = io.ephemeral_public_key_pem
             size += OVERHEAD_BYTES_COUNT
 
-        upload = self.create(
-            name=name,
-            size=size,
-            encrypted=encrypted,
-            preferred_chunk_size=preferred_chunk_size,
-        )
+        policy = self._client.upload_chunk_policy
+
+        if preferred_chunk_size is None:
+            preferred_chunk_size = policy.choose_chunk_size(size)
+
+        upload: typing.Optional[Upload] = None
+        if journal is not None and journal_key is not None:
+            upload = self._find_resumable(journal, journal_key, size, compression)
+
+        if upload is None:
+            upload = self.create(
+                name=name,
+                size=size,
+                encrypted=encrypted,
+                preferred_chunk_size=preferred_chunk_size,
+                compression=compression,
+            )
+
+            if journal is not None and journal_key is not None:
+                journal.put(journal_key, upload.id)
 
         progress = tqdm(
             total=size,
@@ -332,25 +681,77 @@ class UploadCollection(Collection[Upload]):
             leave=False,
         )
 
-        try:
-            for chunk in upload.chunks:
-                def retry_callback():
-                    progress.last_print_n = progress.n = chunk.offset
-                    progress.refresh()
+        chunks = upload.chunks
+        if progress_bar and not upload.chunked:
+            progress.desc = f"uploading `{name}` (direct)"
+
+        pending_chunks: typing.List[UploadChunk] = []
+        for chunk in chunks:
+            if chunk.completed:
+                progress.update(chunk.size)
+            else:
+                pending_chunks.append(chunk)
+
+        # each worker needs its own file descriptor, only possible if the file can be re-opened
+        # the other streams, like an encryption on the fly, are sent one chunk at a time on the calling thread
+        path = _get_reopenable_path(io)
+        parallelism = policy.choose_parallelism(len(pending_chunks)) if path is not None else 1
+
+        def send(chunk: UploadChunk, fd: typing.BinaryIO):
+            sent = 0
+
+            def byte_callback(count: int):
+                nonlocal sent
+                sent += count
+                progress.update(count)
+
+            def retry_callback():
+                nonlocal sent
+                progress.update(-sent)
+                sent = 0
+
+            if progress_bar and upload.chunked and parallelism == 1:
+                progress.desc = f"uploading `{name}` (chunk {chunk.number}/{len(chunks)})"
+
+            chunk.send(
+                fd,
+                max_retry=max_retry,
+                byte_callback=byte_callback,
+                retry_callback=retry_callback,
+                timing_callback=policy.record,
+            )
 
+        def send_from_new_fd(chunk: UploadChunk):
+            assert path is not None
+
+            with open(path, "rb") as fd:
+                send(chunk, fd)
+
+        try:
+            if parallelism == 1:
+                for chunk in pending_chunks:
+                    send(chunk, io)
+            else:
                 if progress_bar:
-                    if upload.chunked:
-                        progress.desc = f"uploading `{name}` (chunk {chunk.number}/{len(upload.chunks)})"
-                    else:
-                        progress.desc = f"uploading `{name}` (direct)"
+                    progress.desc = f"uploading `{name}` ({len(pending_chunks)} chunks, {parallelism} in parallel)"
 
-                chunk.send(
-                    io,
-                    max_retry=max_retry,
-                    byte_callback=progress.update,  # type: ignore
-                    retry_callback=retry_callback,
-                )
+                with ThreadPoolExecutor(max_workers=parallelism) as executor:
+                    futures = [
+                        executor.submit(send_from_new_fd, chunk)
+                        for chunk in pending_chunks
+                    ]
+
+                    done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+                    for future in not_done:
+                        future.cancel()
+
+                    for future in done:
+                        future.result()
         except (Exception, KeyboardInterrupt) as error:
+            # keep the completed chunks for the next attempt
+            if journal is not None:
+                raise
+
             try:
                 upload.abort()
             except Exception as error2:
@@ -362,12 +763,348 @@ class UploadCollection(Collection[Upload]):
 
         upload.complete()
 
+        if journal is not None and journal_key is not None:
+            journal.remove(journal_key)
+
         if public_key_pem is not None:
             assert ephemeral_public_key_pem is not None
             return upload, ephemeral_public_key_pem
 
         return upload
 
+    def _find_resumable(
+        self,
+        journal: UploadJournal,
+        journal_key: str,
+        size: int,
+        compression: typing.Optional[Codec],
+    ) -> typing.Optional[Upload]:
+        from .._errors import ApiException
+
+        upload_id = journal.get(journal_key)
+        if upload_id is None:
+            return None
+
+        try:
+            upload = self.get(upload_id)
+        except ApiException:
+            upload = None
+
+        if (
+            upload is None
+            or upload.status not in (UploadStatus.PENDING, UploadStatus.IN_PROGRESS)
+            or upload.size != size
+            or upload.encrypted
+            or upload.compression != compression
+        ):
+            journal.remove(journal_key)
+            return None
+
+        return upload
+
+    def create_bulk(
+        self,
+        files: typing.List[typing.Tuple[str, int]],
+        *,
+        preferred_chunk_size: typing.Optional[int] = None,
+    ) -> typing.List[Upload]:
+        """
+        Create many uploads in a single call, their chunks come with their presigned requests.
+
+        Args:
+            files: Pairs of name and size.
+        """
+
+        return self.prepare_models(
+            self._client.api.create_bulk_uploads([
+                {
+                    "name": name,
+                    "size": size,
+                    "encrypted": False,
+                    "preferredChunkSize": preferred_chunk_size,
+                }
+                for name, size in files
+            ])
+        )
+
+    def complete_bulk(
+        self,
+        hashes: typing.Dict[Upload, typing.Dict[int, str]],
+    ):
+        """
+        Confirm the chunks and complete many uploads in a single call.
+
+        Args:
+            hashes: The hash of each chunk, by chunk number, for each upload.
+        """
+
+        attrs_list = self._client.api.complete_bulk_uploads([
+            {
+                "id": upload.id,
+                "chunks": [
+                    {
+                        "number": number,
+                        "hash": hash,
+                    }
+                    for number, hash in sorted(chunk_hashes.items())
+                ],
+            }
+            for upload, chunk_hashes in hashes.items()
+        ])
+
+        uploads_by_id = {
+            upload.id: upload
+            for upload in hashes.keys()
+        }
+
+        for attrs in attrs_list:
+            uploads_by_id[attrs["id"]]._update_attrs(attrs)
+
+    def send_bulk_from_files(
+        self,
+        *,
+        files: typing.List[typing.Tuple[str, str]],
+        max_retry: int = 10,
+    ) -> typing.Dict[str, Upload]:
+        """
+        Send many files with a constant number of api calls, instead of a few per file and per chunk.
+        Files are sent in batches of `BULK_MAX_COUNT`.
+
+        Args:
+            files: Pairs of local path and name.
+
+        Returns:
+            The uploads, by name.
+        """
+
+        uploads: typing.Dict[str, Upload] = {}
+
+        for start in range(0, len(files), BULK_MAX_COUNT):
+            batch = files[start:start + BULK_MAX_COUNT]
+            uploads.update(self._send_bulk_batch(batch, max_retry))
+
+        return uploads
+
+    def _send_bulk_batch(
+        self,
+        files: typing.List[typing.Tuple[str, str]],
+        max_retry: int,
+    ) -> typing.Dict[str, Upload]:
+        policy = self._client.upload_chunk_policy
+
+        sizes = [
+            os.path.getsize(path)
+            for path, _ in files
+        ]
+
+        created = self.create_bulk(
+            [
+                (name, size)
+                for (_, name), size in zip(files, sizes)
+            ],
+            preferred_chunk_size=policy.choose_chunk_size(max(sizes, default=0)),
+        )
+
+        tasks = [
+            (path, upload, chunk)
+            for (path, _), upload in zip(files, created)
+            for chunk in upload.chunks
+        ]
+
+        hashes: typing.Dict[Upload, typing.Dict[int, str]] = {
+            upload: {}
+            for upload in created
+        }
+
+        lock = threading.Lock()
+
+        def send(path: str, upload: Upload, chunk: UploadChunk):
+            with open(path, "rb") as fd:
+                hash = chunk.send(
+                    fd,
+                    max_retry=max_retry,
+                    timing_callback=policy.record,
+                    confirm=False,
+                )
+
+            with lock:
+                hashes[upload][chunk.number] = hash
+
+        try:
+            with ThreadPoolExecutor(max_workers=policy.choose_parallelism(len(tasks))) as executor:
+                futures = [
+                    executor.submit(send, *task)
+                    for task in tasks
+                ]
+
+                done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+                for future in not_done:
+                    future.cancel()
+
+                for future in done:
+                    future.result()
+
+            self.complete_bulk(hashes)
+        except (Exception, KeyboardInterrupt):
+            for upload in created:
+                try:
+                    upload.abort()
+                except Exception:
+                    pass
+
+            raise
+
+        return {
+            name: upload
+            for (_, name), upload in zip(files, created)
+        }
+
+    def send_packed(
+        self,
+        *,
+        files: typing.List[typing.Tuple[str, str]],
+        name: str = "pack.tar",
+        preferred_chunk_size: typing.Optional[int] = None,
+        progress_bar: bool = False,
+        max_retry: int = 10,
+    ) -> typing.Dict[str, Upload]:
+        """
+        Send many small files as a single tar archive, which the server expands into one upload per file.
+        This saves the five api calls that each file would otherwise cost.
+
+        Args:
+            files: Pairs of local path and name.
+
+        Returns:
+            The expanded uploads, by name.
+        """
+
+        import tarfile
+        import tempfile
+
+        index: typing.List[typing.Dict[str, typing.Any]] = []
+
+        with tempfile.SpooledTemporaryFile(max_size=PACK_SPOOL_MAX_MEMORY_SIZE) as archive:
+            with tarfile.open(fileobj=archive, mode="w", format=tarfile.PAX_FORMAT) as tar:  # type: ignore
+                for path, file_name in files:
+                    info = tar.gettarinfo(path, arcname=file_name)
+
+                    with open(path, "rb") as fd:
+                        tar.addfile(info, fd)
+
+                    # the data is padded to a full block, right after the header
+                    padded_size = -(-info.size // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+
+                    index.append({
+                        "name": file_name,
+                        "offset": tar.offset - padded_size,
+                        "size": info.size,
+                    })
+
+            size = archive.tell()
+            archive.seek(0)
+
+            pack = self.send_from_io(
+                io=archive,  # type: ignore
+                name=name,
+                size=size,
+                public_key_pem=None,
+                preferred_chunk_size=preferred_chunk_size,
+                progress_bar=progress_bar,
+                max_retry=max_retry,
+            )
+
+        try:
+            expanded = self._client.api.unpack_upload(
+                pack.id,
+                "TAR",
+                index,
+            )
+        finally:
+            try:
+                pack.delete()
+            except Exception as exception:
+                print(f"failed to delete pack upload {pack.id}: {exception}")
+
+        return {
+            file_name: self.prepare_model(attrs)
+            for file_name, attrs in expanded.items()
+        }
+
+    def get_signature(
+        self,
+        hash: str,
+        block_size: typing.Optional[int] = None,
+    ) -> "Signature":
+        """
+        Signature of a previously uploaded file, identified by its SHA-256.
+        """
+
+        from ...delta import DEFAULT_BLOCK_SIZE, Signature
+
+        return Signature.from_dict(
+            self._client.api.get_upload_signature(
+                hash,
+                block_size or DEFAULT_BLOCK_SIZE,
+            )
+        )
+
+    def send_delta(
+        self,
+        *,
+        path: str,
+        name: str,
+        base_hash: str,
+        signature: "Signature",
+        maximum_data_ratio: float = 0.5,
+        progress_bar: bool = False,
+        max_retry: int = 10,
+    ) -> typing.Optional[Upload]:
+        """
+        Send only the blocks that are not in the base file, the server rebuilds the file by applying the patch.
+
+        Returns:
+            The rebuilt upload, or None if too much of the file changed for a delta to be worth it.
+        """
+
+        import tempfile
+
+        from ...delta import compute_delta
+
+        delta = compute_delta(signature, path)
+        if delta.data_size > delta.size * maximum_data_ratio:
+            return None
+
+        with tempfile.SpooledTemporaryFile(max_size=PACK_SPOOL_MAX_MEMORY_SIZE) as payload:
+            delta.write_data(path, payload)  # type: ignore
+
+            size = payload.tell()
+            payload.seek(0)
+
+            patch = self.send_from_io(
+                io=payload,  # type: ignore
+                name=f"{name}.patch",
+                size=size,
+                public_key_pem=None,
+                progress_bar=progress_bar,
+                max_retry=max_retry,
+            )
+
+        try:
+            attrs = self._client.api.patch_upload(
+                patch.id,
+                name,
+                base_hash,
+                delta.to_recipe(),
+            )
+        finally:
+            try:
+                patch.delete()
+            except Exception as exception:
+                print(f"failed to delete patch upload {patch.id}: {exception}")
+
+        return self.prepare_model(attrs)
+
     def get(
         self,
         id: str
@@ -386,17 +1123,23 @@ class UploadEndpointMixin:
         name,
         size,
         encrypted,
-        preferred_chunk_size
+        preferred_chunk_size,
+        compression=None,
     ):
+        body = {
+            "name": name,
+            "size": size,
+            "encrypted": encrypted,
+            "preferredChunkSize": preferred_chunk_size
+        }
+
+        if compression is not None:
+            body["compression"] = compression
+
         return self._result(
             self.post(
                 "/v1/uploads",
-                json={
-                    "name": name,
-                    "size": size,
-                    "encrypted": encrypted,
-                    "preferredChunkSize": preferred_chunk_size
-                }
+                json=body
             ),
             json=True
         )
@@ -464,6 +1207,86 @@ class UploadEndpointMixin:
             json=True
         )
 
+    def create_bulk_uploads(
+        self,
+        uploads,
+    ):
+        return self._result(
+            self.post(
+                "/v1/uploads/bulk",
+                json={
+                    "uploads": uploads,
+                },
+            ),
+            json=True
+        )["uploads"]
+
+    def complete_bulk_uploads(
+        self,
+        uploads,
+    ):
+        return self._result(
+            self.post(
+                "/v1/uploads/bulk/complete",
+                json={
+                    "uploads": uploads,
+                },
+            ),
+            json=True
+        )["uploads"]
+
+    def unpack_upload(
+        self,
+        id,
+        format,
+        files,
+    ):
+        return self._result(
+            self.post(
+                f"/v1/uploads/{id}/unpack",
+                json={
+                    "format": format,
+                    "files": files,
+                },
+            ),
+            json=True
+        )
+
+    def get_upload_signature(
+        self,
+        hash,
+        block_size,
+    ):
+        return self._result(
+            self.get(
+                "/v1/uploads/signature",
+                params={
+                    "hash": hash,
+                    "blockSize": block_size,
+                },
+            ),
+            json=True
+        )
+
+    def patch_upload(
+        self,
+        id,
+        name,
+        base_hash,
+        recipe,
+    ):
+        return self._result(
+            self.post(
+                f"/v1/uploads/{id}/patch",
+                json={
+                    "name": name,
+                    "baseHash": base_hash,
+                    "recipe": recipe,
+                },
+            ),
+            json=True
+        )
+
     def delete_upload(
         self,
         id
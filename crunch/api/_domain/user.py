@@ -6,6 +6,8 @@ from .._resource import Collection, Model
 
 class User(Model):
 
+    __slots__ = ()
+
     resource_identifier_attribute = "login"
 
     @property
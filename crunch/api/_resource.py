@@ -2,16 +2,74 @@
 Heavily inspired (copied) from https://github.com/docker/docker-py/blob/main/docker/models/resource.py.
 """
 
+import inspect
 from types import GeneratorType
-from typing import TYPE_CHECKING, Any, Dict, Generic, Iterator, List, Optional, Type, TypeVar, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, Generic, Iterator, List, Optional, Type, TypeVar, Union, overload
 
 if TYPE_CHECKING:
     from crunch.api._client import Client
 
 
+V = TypeVar('V')
+
+
+def require_sync_client(
+    client: Any,
+    feature: str,
+):
+    """
+    Raise for the helpers that need loaded values, the async client would hand them awaitables.
+    """
+
+    if getattr(client, "is_async", False):
+        raise NotImplementedError(f"{feature} is not supported by the async client, await the loading method first or use the synchronous client")
+
+
+class memoized_property(Generic[V]):
+    """
+    Like `functools.cached_property`, but stored in the `_memoized` slot of the models since they have no `__dict__`.
+    The values are derived from `_attrs` and forgotten every time they are replaced or updated.
+    """
+
+    def __init__(
+        self,
+        function: Callable[[Any], V],
+    ):
+        self.function = function
+        self.name = function.__name__
+        self.__doc__ = function.__doc__
+
+    def __set_name__(self, owner: Any, name: str):
+        self.name = name
+
+    @overload
+    def __get__(self, instance: None, owner: Any = None) -> "memoized_property[V]": ...
+
+    @overload
+    def __get__(self, instance: "Model", owner: Any = None) -> V: ...
+
+    def __get__(self, instance: Optional["Model"], owner: Any = None):
+        if instance is None:
+            return self
+
+        memoized = instance._memoized
+        if self.name in memoized:
+            return memoized[self.name]
+
+        value = self.function(instance)
+
+        # with the async client, a coroutine can only be awaited once
+        if not inspect.isawaitable(value):
+            memoized[self.name] = value
+
+        return value
+
+
 # TODO: add better support for composite key resources
 class Model:
 
+    __slots__ = ("_attrs", "_client", "_collection", "_memoized")
+
     id_attribute = 'id'
     resource_identifier_attribute = 'id'
 
@@ -24,6 +82,7 @@ class Model:
         self._attrs: Dict[str, Any] = attrs or {}
         self._client = client
         self._collection = collection
+        self._memoized: Dict[str, Any] = {}
 
     def __repr__(self):
         repr = f"{self.__class__.__name__}(id={self.id}"
@@ -74,9 +133,38 @@ class Model:
             **kwargs
         )
 
-        self._attrs = new_model._attrs
+        if inspect.isawaitable(new_model):
+            return self._reload_async(new_model)
+
+        self._set_attrs(new_model._attrs)
+        return self
+
+    async def _reload_async(self, new_model):
+        self._set_attrs((await new_model)._attrs)
         return self
 
+    def _set_attrs(
+        self,
+        attrs: Dict[str, Any],
+    ):
+        """
+        Replace the attributes, the memoized properties will be computed again.
+        """
+
+        self._attrs = attrs
+        self._memoized.clear()
+
+    def _update_attrs(
+        self,
+        attrs: Dict[str, Any],
+    ):
+        """
+        Update the attributes, the memoized properties will be computed again.
+        """
+
+        self._attrs.update(attrs)
+        self._memoized.clear()
+
     @classmethod
     def from_dict(
         cls,
@@ -110,6 +198,18 @@ class Collection(Generic[T]):
     def __iter__(self) -> Iterator[T]:
         return iter(self.list())
 
+    async def __aiter__(self):
+        models = self.list()
+        if inspect.isawaitable(models):
+            models = await models
+
+        if inspect.isasyncgen(models):
+            async for model in models:
+                yield model
+        else:
+            for model in models:
+                yield model
+
     def __getitem__(self, key) -> T:
         if isinstance(key, slice):
             return self.__getslice__(key.start, key.stop, key.step)
@@ -169,6 +269,9 @@ class Collection(Generic[T]):
         return self.prepare_model(attrs)
 
     def prepare_model(self, attrs, *args) -> T:
+        if inspect.isawaitable(attrs):
+            return self._prepare_model_async(attrs, args)
+
         if isinstance(attrs, self.model):
             attrs._client = self._client
             attrs._collection = self
@@ -188,6 +291,12 @@ class Collection(Generic[T]):
         if isinstance(attrs_list, GeneratorType):
             return self._prepare_models_with_yield(attrs_list, args)
 
+        if inspect.isasyncgen(attrs_list):
+            return self._prepare_models_with_async_yield(attrs_list, args)
+
+        if inspect.isawaitable(attrs_list):
+            return self._prepare_models_async(attrs_list, args)
+
         return [
             self.prepare_model(attrs, *args)
             for attrs in attrs_list
@@ -198,3 +307,14 @@ class Collection(Generic[T]):
             yield self.prepare_model(attrs, *args)
 
         return GeneratorExit
+
+    async def _prepare_model_async(self, attrs, args):
+        # the overrides already added their arguments
+        return Collection.prepare_model(self, await attrs, *args)
+
+    async def _prepare_models_async(self, attrs_list, args):
+        return self.prepare_models(await attrs_list, *args)
+
+    async def _prepare_models_with_async_yield(self, attrs_list, args):
+        async for attrs in attrs_list:
+            yield self.prepare_model(attrs, *args)
@@ -0,0 +1,191 @@
+"""
+Incremental decoding of the json responses made of a large array, one item at a time.
+
+Only the current item is decoded into python objects, instead of the whole document.
+"""
+
+import codecs
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+"""
+Size of the chunks read from the response.
+"""
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACES = " \t\n\r"
+_NUMBER_TERMINATORS = _WHITESPACES + ",]}"
+
+
+class JsonArrayStream:
+    """
+    Iterate over the items of the top-level array, or of the array under `key` if the document is an object.
+    The other values of the object are available in `others` once their position in the document is reached, all of them after the iteration.
+
+    `on_close` is called once the iteration ends, even early or on error, to release the underlying response.
+    A stream that is never iterated must be closed explicitly, with `close()` or as a context manager.
+    """
+
+    def __init__(
+        self,
+        chunks: Iterable[bytes],
+        key: Optional[str] = None,
+        on_close: Optional[Callable[[], None]] = None,
+    ):
+        self.key = key
+        self.others: Dict[str, Any] = {}
+
+        self._on_close = on_close
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._index = 0
+        self._pending: List[str] = []
+        self._pending_length = 0
+        self._exhausted = False
+        self._started = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args: Any):
+        self.close()
+
+    def close(self):
+        on_close, self._on_close = self._on_close, None
+
+        if on_close is not None:
+            on_close()
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._started:
+            raise RuntimeError("stream already consumed")
+
+        self._started = True
+
+        try:
+            yield from self._iter_document()
+        finally:
+            self.close()
+
+    def _iter_document(self) -> Iterator[Any]:
+        if self.key is None:
+            yield from self._iter_array()
+            return
+
+        self._expect("{")
+
+        if self._peek() == "}":
+            self._index += 1
+            return
+
+        while True:
+            name = self._read_value()
+            self._expect(":")
+
+            if name == self.key:
+                yield from self._iter_array()
+            else:
+                self.others[name] = self._read_value()
+
+            if self._expect(",}") == "}":
+                break
+
+    def _iter_array(self) -> Iterator[Any]:
+        self._expect("[")
+
+        if self._peek() == "]":
+            self._index += 1
+            return
+
+        while True:
+            yield self._read_value()
+
+            if self._expect(",]") == "]":
+                break
+
+    def _read_value(self) -> Any:
+        self._peek()
+
+        minimum_length = 0
+        while True:
+            available = len(self._buffer) - self._index + self._pending_length
+
+            if available > minimum_length or self._exhausted:
+                self._flush()
+
+                try:
+                    value, end = self._json_decoder.raw_decode(self._buffer, self._index)
+
+                    if self._exhausted or self._is_complete(value, end):
+                        self._index = end
+                        self._compact()
+
+                        return value
+                except json.JSONDecodeError:
+                    if self._exhausted:
+                        raise
+
+                # wait for much more before the next attempt, a large item is not decoded over and over
+                minimum_length = available * 4
+
+            self._read()
+
+    def _is_complete(self, value: Any, end: int) -> bool:
+        # a number at the end of the buffer could continue in the next chunk: `1` of `12`, `0` of `0.5`
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return end < len(self._buffer) and self._buffer[end] in _NUMBER_TERMINATORS
+
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            while self._index < len(self._buffer) and self._buffer[self._index] in _WHITESPACES:
+                self._index += 1
+
+            if self._index < len(self._buffer):
+                return self._buffer[self._index]
+
+            if not self._read():
+                raise json.JSONDecodeError("unexpected end of document", self._buffer, self._index)
+
+            self._flush()
+
+    def _expect(self, characters: str) -> str:
+        character = self._peek()
+        if character not in characters:
+            raise json.JSONDecodeError(f"expected one of `{characters}`", self._buffer, self._index)
+
+        self._index += 1
+        return character
+
+    def _read(self) -> bool:
+        if self._exhausted:
+            return False
+
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._exhausted = True
+            text = self._decoder.decode(b"", final=True)
+        else:
+            text = self._decoder.decode(chunk)
+
+        self._pending.append(text)
+        self._pending_length += len(text)
+
+        return True
+
+    def _flush(self):
+        # joined once, appending every chunk to a large buffer would copy it over and over
+        if self._pending:
+            self._buffer = self._buffer[self._index:] + "".join(self._pending)
+            self._index = 0
+
+            self._pending.clear()
+            self._pending_length = 0
+
+    def _compact(self):
+        if self._index > STREAM_CHUNK_SIZE:
+            self._buffer = self._buffer[self._index:]
+            self._index = 0
@@ -8,6 +8,7 @@ from typing import Any, Callable, List, Optional, Union
 import click
 
 from crunch.api import CompetitionFormat, PhaseType, RoundIdentifierType
+from crunch.compression import Codec
 from crunch.dev.cli import group as dev_group
 from crunch.runner.types import KwargsLike
 from crunch.unstructured.cli import organize_test_group
@@ -85,6 +86,7 @@ def _echo_version():
 @click.option("--competitions-branch", envvar=constants.COMPETITIONS_BRANCH_ENV_VAR, default=constants.COMPETITIONS_BRANCH, help="Set the Competitions GitHub branch name (only for testing).")
 @click.option("--competitions-directory-path", envvar=constants.COMPETITIONS_DIRECTORY_PATH_ENV_VAR, default=None, required=False, help="Set the Competitions repository to a local directory (only for testing).")
 @click.option("--environment", "--env", "environment_name", envvar=constants.ENVIRONMENT_ENV_VAR, help="Connect to another environment.")
+@click.option("--no-cache", envvar=constants.NO_CACHE_ENV_VAR, is_flag=True, help="Do not use the cached API responses.")
 def cli(
     debug: bool,
     api_base_url: str,
@@ -93,10 +95,12 @@ def cli(
     competitions_branch: str,
     competitions_directory_path: Optional[str],
     environment_name: str,
+    no_cache: bool,
 ):
     constants.RUN_VIA_CLI = True
 
     store.debug = debug
+    store.no_cache = no_cache
     store.api_base_url = api_base_url
     store.web_base_url = web_base_url
     store.competitions_repository = competitions_repository
@@ -413,6 +417,8 @@ def convert_if_necessary(
 @click.option("--export", "export_path", show_default=True, type=str, help="Copy the `.tar` to the specified file.")
 @click.option("--no-pip-freeze", is_flag=True, help="Do not do a `pip freeze` to know preferred packages version.")
 @click.option("--dry", is_flag=True, help="Prepare file but do not really create the submission.")
+@click.option("--full", is_flag=True, help="Upload every file, even the ones unchanged since the previous submission.")
+@click.option("--compression", "compression_name", type=click.Choice([x.name.lower() for x in Codec], case_sensitive=False), required=False, help="Compress the model files before uploading them, not available on encrypted competitions.")
 def push(
     message: str,
     main_file_path: str,
@@ -420,6 +426,8 @@ def push(
     export_path: Optional[str],
     no_pip_freeze: bool,
     dry: bool,
+    full: bool,
+    compression_name: Optional[str],
 ):
     utils.change_root()
 
@@ -436,6 +444,8 @@ def push(
                 include_installed_packages_version=not no_pip_freeze,
                 no_afterword=False,
                 dry=dry,
+                incremental=not full,
+                model_compression=Codec.parse(compression_name) if compression_name else None,
             )
         except api.ApiException as error:
             utils.exit_via(error)
@@ -615,6 +625,9 @@ def local(
 # ---
 @click.option("--max-retry", envvar="MAX_RETRY", default=3, type=int)
 @click.option("--retry-seconds", envvar="RETRY_WAIT", default=60, type=int)
+# ---
+@click.option("--stream-predictions", envvar="STREAM_PREDICTIONS", type=bool, default=False)
+@click.option("--compression", "compression_name", envvar="COMPRESSION", type=click.Choice([x.name.lower() for x in Codec], case_sensitive=False), default=None)
 def cloud(
     competition_name: str,
     # ---
@@ -639,7 +652,10 @@ def cloud(
     crunch_cli_commit_hash: str,
     # ---
     max_retry: int,
-    retry_seconds: int
+    retry_seconds: int,
+    # ---
+    stream_predictions: bool,
+    compression_name: Optional[str],
 ):
     from .runner import is_inside
     if not is_inside:
@@ -693,6 +709,9 @@ def cloud(
         # ---
         max_retry,
         retry_seconds,
+        # ---
+        stream_predictions,
+        Codec.parse(compression_name) if compression_name else None,
     )
 
     runner.start()
@@ -1,21 +1,55 @@
 import json
 import os
 import sys
+import tempfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 from io import BytesIO
-from typing import TYPE_CHECKING, BinaryIO, Callable, Dict, Iterable, List, Literal, Optional, Tuple, overload
+from typing import TYPE_CHECKING, BinaryIO, Callable, Deque, Dict, Iterable, List, Literal, Optional, Set, Tuple, overload
 
 import click
 import requests
 
-from crunch import store
-from crunch.api import ApiException, Client, ForbiddenLibraryException, Project, Submission, SubmissionType, Upload
-from crunch.constants import COLAB_DETECTION_ENV_VAR, COLAB_IGNORED_CODE_FILES, ENCRYPTION_JSON, IGNORED_CODE_FILES, IGNORED_MODEL_FILES, SUBMISSION_MESSAGE_LENGTH
+from crunch.api import ApiException, Client, ForbiddenLibraryException, Project, Submission, SubmissionFile, SubmissionType, Upload, UploadJournal
+from crunch.compression import Codec
+from crunch.constants import BULK_UPLOAD_MAX_FILE_SIZE, COLAB_DETECTION_ENV_VAR, COLAB_IGNORED_CODE_FILES, DELTA_MIN_FILE_SIZE, DOT_CRUNCH_DIRECTORY, ENCRYPTION_JSON, IGNORED_CODE_FILES, IGNORED_MODEL_FILES, SUBMISSION_MESSAGE_LENGTH, UPLOAD_JOURNAL_FILE, WORKSPACE_INDEX_FILE
 from crunch.external.humanfriendly import format_size
+from crunch.index import WorkspaceIndex
+from crunch.library import CachedSitePackageVersionFinder, SnapshotWhitelist
+from crunch.utils import hash_file
 
 if TYPE_CHECKING:
+    from crunch_convert.requirements_txt import VersionFinder, Whitelist
     from crunch_encrypt.ecies import EphemeralPublicKeyPem, PublicKeyPem
 
+HASH_WORKER_COUNT = min(32, (os.cpu_count() or 1) + 4)
+
+"""
+Files up to this size are packed into a single archive upload.
+"""
+PACK_MAX_FILE_SIZE = 256 * 1024
+
+"""
+Below this number of small files, packing does not save enough api calls to be worth it.
+"""
+PACK_MIN_FILE_COUNT = 8
+
+ENCRYPTION_WORKER_COUNT = os.cpu_count() or 1
+
+"""
+Files being encrypted or waiting for their upload, bounds the number of temporary files.
+"""
+ENCRYPTION_MAX_PENDING_COUNT = ENCRYPTION_WORKER_COUNT + 1
+
+"""
+Total size of the files being encrypted or waiting for their upload, bounds the disk space used by the temporary files.
+A single bigger file is still encrypted alone, the disk space used is then its size.
+"""
+ENCRYPTION_MAX_PENDING_SIZE = 1024 * 1024 * 1024
+
+ENCRYPTION_BUFFER_SIZE = 1024 * 1024
+
 
 @dataclass
 class EncryptedFileInfo:
@@ -47,6 +81,106 @@ class EncryptionInfo:
         }, indent=4)
 
 
+def _encrypt_file(
+    source_path: str,
+    destination_path: str,
+    public_key_pem: "PublicKeyPem",
+) -> "EphemeralPublicKeyPem":
+    """
+    Run in a worker process, must stay at the module level to be picklable.
+    """
+
+    from crunch_encrypt.ecies import ECIESEncryptIO
+
+    with open(source_path, "rb") as input, open(destination_path, "wb") as output:
+        encrypt_io = ECIESEncryptIO(
+            input,
+            public_key_pem=public_key_pem,
+        )
+
+        while True:
+            buffer = encrypt_io.read(ENCRYPTION_BUFFER_SIZE)
+            if not buffer:
+                break
+
+            output.write(buffer)
+
+        return encrypt_io.ephemeral_public_key_pem
+
+
+class _EncryptionPipeline:
+    """
+    Encrypt files in worker processes while the previous ones are being uploaded.
+
+    The uploads are done one file at a time on the calling thread, by `on_encrypted`.
+    Only the encryption of the next files overlaps with them.
+    """
+
+    def __init__(
+        self,
+        *,
+        public_key_pem: "PublicKeyPem",
+        on_encrypted: Callable[[EncryptedFileInfo, str], None],
+        worker_count: int = ENCRYPTION_WORKER_COUNT,
+        max_pending_count: int = ENCRYPTION_MAX_PENDING_COUNT,
+        max_pending_size: int = ENCRYPTION_MAX_PENDING_SIZE,
+    ):
+        self._public_key_pem = public_key_pem
+        self._on_encrypted = on_encrypted
+        self._max_pending_count = max_pending_count
+        self._max_pending_size = max_pending_size
+
+        self._directory = tempfile.TemporaryDirectory(prefix="crunch-encrypt-")
+        self._executor = ProcessPoolExecutor(max_workers=worker_count)
+        self._pending: Deque[Tuple[EncryptedFileInfo, str, int, "Future[EphemeralPublicKeyPem]"]] = deque()
+        self._pending_size = 0
+        self._counter = 0
+
+    def submit(
+        self,
+        path: str,
+        info: EncryptedFileInfo,
+        size: int,
+    ):
+        # the previous files are uploaded first, until the new one fits
+        while self._pending and (
+            len(self._pending) >= self._max_pending_count
+            or self._pending_size + size > self._max_pending_size
+        ):
+            self._upload_next()
+
+        self._counter += 1
+        destination_path = os.path.join(self._directory.name, f"{self._counter}.enc")
+
+        future = self._executor.submit(_encrypt_file, path, destination_path, self._public_key_pem)
+        self._pending.append((info, destination_path, size, future))
+        self._pending_size += size
+
+    def flush(self):
+        while self._pending:
+            self._upload_next()
+
+    def close(self):
+        for _, _, _, future in self._pending:
+            future.cancel()
+
+        self._pending.clear()
+        self._pending_size = 0
+        self._executor.shutdown(wait=True)
+        self._directory.cleanup()
+
+    def _upload_next(self):
+        info, destination_path, size, future = self._pending.popleft()
+        self._pending_size -= size
+
+        try:
+            info.public_key_pem = future.result()
+            self._on_encrypted(info, destination_path)
+        finally:
+            if os.path.exists(destination_path):
+                os.unlink(destination_path)
+
+
 def _to_unix_path(input: str):
     if input == ".":
         return input + "/"
@@ -67,31 +201,40 @@ def _build_gitignore(
     directory_path: str,
     ignored_paths: List[str],
     use_parent_gitignore: bool,
-) -> Callable[[str], Tuple[bool, bool]]:
+) -> Callable[[str, bool], Tuple[bool, bool]]:
     from ..external import gitignorefile
 
-    rules: List[gitignorefile._IgnoreRule] = []  # type: ignore
-    for line in ignored_paths:
-        line = line.rstrip("\r\n")
-        rule = gitignorefile._rule_from_pattern(line)  # type: ignore
-        if rule:
-            rules.append(rule)
+    ignored_files = gitignorefile.compile_rules(ignored_paths, directory_path)
 
-    ignored_files = gitignorefile._IgnoreRules(  # type: ignore
-        rules=rules,
-        base_path=directory_path,
-    )
-
-    parts_depth = 2 if use_parent_gitignore else 1
-    parts = tuple(gitignorefile._path_split(directory_path))[:-parts_depth]  # type: ignore
+    absolute_directory_path = os.path.abspath(directory_path)
+    parts = tuple(gitignorefile._path_split(absolute_directory_path))[:-1]  # type: ignore
 
     git_ignores = gitignorefile.Cache()
     git_ignores._Cache__gitignores[parts] = []  # type: ignore
 
-    return lambda name: (
-        ignored_files.match(name),  # type: ignore
-        git_ignores(name)
-    )
+    # the parent rules are applied relative to the directory, its own name must not match (e.g. `resources/`)
+    parent_git_ignores = [
+        gitignorefile.parse(ignore_path, base_path=absolute_directory_path)
+        for ignore_path in (
+            os.path.join(os.path.dirname(absolute_directory_path), ignore_name)
+            for ignore_name in gitignorefile.DEFAULT_IGNORE_NAMES
+        )
+        if use_parent_gitignore and os.path.isfile(ignore_path)
+    ]
+
+    def is_ignored(path: str, is_dir: bool) -> Tuple[bool, bool]:
+        # parsed once for every matcher
+        parsed_path = gitignorefile._Path(path)  # type: ignore
+
+        return (
+            ignored_files.match(parsed_path, is_dir=is_dir),
+            git_ignores(parsed_path, is_dir=is_dir) or any(
+                match(parsed_path, is_dir=is_dir)
+                for match in parent_git_ignores
+            ),
+        )
+
+    return is_ignored
 
 
 def _list_files(
@@ -100,30 +243,42 @@ def _list_files(
     *,
     use_parent_gitignore: bool = False,
 ):
+    """
+    Walk top-down and skip ignored directories as a whole, instead of matching every file inside them.
+    """
+
     directory_path = _to_unix_path(directory_path)
-    directory_path_prefix = (
-        len(directory_path)
-        + int(not directory_path.endswith("/"))  # add 1 if value not ends with a slash
-    )
 
     is_ignored = _build_gitignore(directory_path, ignored_paths, use_parent_gitignore)
 
-    for root, _, files in os.walk(directory_path, topdown=False):
-        root = _to_unix_path(root)
+    stack = [""]
+    while stack:
+        relative_root = stack.pop()
 
-        if root.startswith(directory_path):
-            root = root[directory_path_prefix:]
-        elif root == directory_path:
-            root = ""
+        try:
+            entries = os.scandir(os.path.join(directory_path, relative_root))
+        except OSError:
+            continue
 
-        for file in files:
-            relative_path = _to_unix_path(os.path.join(root, file))
-            absolute_path = _to_unix_path(os.path.join(directory_path, relative_path))
+        with entries:
+            for entry in entries:
+                relative_path = relative_root + entry.name
+                path = _to_unix_path(os.path.join(directory_path, relative_path))
 
-            if any(is_ignored(relative_path)):
-                continue
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+
+                if any(is_ignored(path, is_dir)):
+                    continue
+
+                if not is_dir:
+                    yield path, relative_path
 
-            yield absolute_path, relative_path
+                # like os.walk(), symbolic links to directories are not followed
+                elif not entry.is_symlink():
+                    stack.append(relative_path + "/")
 
 
 def list_code_files(
@@ -158,6 +313,84 @@ def list_model_files(
     )
 
 
+def _get_previous_files(
+    project: Project,
+    model_directory_relative_path: str,
+) -> Tuple[Optional[Submission], Dict[str, SubmissionFile], Dict[str, SubmissionFile]]:
+    """
+    Index the files of the latest submission, split between code and model files.
+    Model file names are made relative to the model directory, like the ones that are pushed.
+    """
+
+    try:
+        submission = project.submissions.get_latest()
+        if submission is None:
+            return None, {}, {}
+
+        files = submission.files.list()
+    except ApiException as exception:
+        print(f"incremental: could not list previous files: {exception}")
+        return None, {}, {}
+
+    model_directory_prefix = _to_unix_path(f"{model_directory_relative_path}/")
+
+    code_files: Dict[str, SubmissionFile] = {}
+    model_files: Dict[str, SubmissionFile] = {}
+
+    for file in files:
+        if file.name.startswith(model_directory_prefix):
+            model_files[file.name[len(model_directory_prefix):]] = file
+        else:
+            code_files[file.name] = file
+
+    return submission, code_files, model_files
+
+
+def _find_unchanged_files(
+    file_paths: List[Tuple[str, str]],
+    previous_files: Dict[str, SubmissionFile],
+    index: Optional[WorkspaceIndex] = None,
+    compression: Optional[Codec] = None,
+) -> Set[str]:
+    """
+    Hash, in parallel, the files that might not have changed since the previous submission.
+    Files with a different size are not even read, files known by the `index` neither.
+
+    With a `compression`, the previous files are compressed ones: the `index` maps the local hashes to the ones of their compressed uploads.
+    Without an `index`, every file is considered changed.
+    """
+
+    if compression is not None and index is None:
+        return set()
+
+    candidates: List[Tuple[str, str, SubmissionFile]] = []
+    for path, name in file_paths:
+        previous = previous_files.get(name)
+        if previous is None or (compression is None and os.path.getsize(path) != previous.size):
+            continue
+
+        candidates.append((path, name, previous))
+
+    if not candidates:
+        return set()
+
+    if compression is not None:
+        assert index is not None
+
+        hash_function: Callable[[str], Optional[str]] = lambda path: index.get_compressed_hash(index.hash_file(path), compression)
+    else:
+        hash_function = index.hash_file if index is not None else hash_file
+
+    with ThreadPoolExecutor(max_workers=HASH_WORKER_COUNT) as executor:
+        hashes = executor.map(hash_function, (path for path, _, _ in candidates))
+
+        return {
+            name
+            for (_, name, previous), hash in zip(candidates, hashes)
+            if hash == previous.hash
+        }
+
+
 def _upload_files(
     *,
     group_name: str,
@@ -165,14 +398,30 @@ def _upload_files(
     file_iterator: Iterable[Tuple[str, str]],
     dry: bool,
     client: Client,
-    preferred_chunk_size: int,
+    preferred_chunk_size: Optional[int],
     encryption_info: Optional[EncryptionInfo],
     encrypted_files_storage: List[EncryptedFileInfo],
     freeze_requirements: bool,
+    previous_files: Dict[str, SubmissionFile],
+    reused_storage: List[str],
+    compression: Optional[Codec] = None,
+    journal: Optional[UploadJournal] = None,
+    pack_small_files: bool = False,
+    delta: bool = False,
+    index: Optional[WorkspaceIndex] = None,
+    whitelist: Optional["Whitelist"] = None,
+    version_finder: Optional["VersionFinder"] = None,
 ):
     from crunch_convert import RequirementLanguage, requirements_txt
 
     total_size = 0
+    reused_size = 0
+
+    if whitelist is None:
+        whitelist = SnapshotWhitelist(client)
+
+    if version_finder is None:
+        version_finder = CachedSitePackageVersionFinder()
 
     def handle_bytes(
         data: bytes,
@@ -194,6 +443,7 @@ def _upload_files(
         size: int,
         encrypt_if_possible: bool = True,
         log_action: Optional[str] = None,
+        journal_key: Optional[str] = None,
     ):
         nonlocal total_size
 
@@ -218,6 +468,7 @@ def _upload_files(
                 public_key_pem=encryption_info.public_key_pem,
                 preferred_chunk_size=preferred_chunk_size,
                 progress_bar=True,
+                compression=compression,
             )
 
             encrypted_files_storage.append(EncryptedFileInfo(
@@ -232,9 +483,148 @@ def _upload_files(
                 public_key_pem=None,
                 preferred_chunk_size=preferred_chunk_size,
                 progress_bar=True,
+                compression=compression,
+                journal=journal,
+                journal_key=journal_key,
+            )
+
+        storage[name] = upload
+
+    def handle_encrypted_file(
+        path: str,
+        name: str,
+        size: int,
+    ):
+        nonlocal total_size
+
+        total_size += size
+        print(f"found {group_name} file: {name} ({format_size(size)})")
+
+        assert encryption_pipeline is not None
+
+        # the slot keeps the order of the files, the key is only known once encrypted
+        info = EncryptedFileInfo(
+            name=name,
+            public_key_pem="",
+        )
+
+        encrypted_files_storage.append(info)
+        encryption_pipeline.submit(path, info, size)
+
+    def upload_encrypted_file(
+        info: EncryptedFileInfo,
+        encrypted_path: str,
+    ):
+        storage[info.name] = client.uploads.send_encrypted_file(
+            path=encrypted_path,
+            name=info.name,
+            preferred_chunk_size=preferred_chunk_size,
+            progress_bar=True,
+        )
+
+    def handle_pack(
+        files: List[Tuple[str, str, int]],
+    ):
+        nonlocal total_size
+
+        for _, name, size in files:
+            total_size += size
+            print(f"found {group_name} file: {name} ({format_size(size)})")
+
+        if dry:
+            return
+
+        try:
+            uploads = client.uploads.send_packed(
+                files=[(path, name) for path, name, _ in files],
+                preferred_chunk_size=preferred_chunk_size,
+                progress_bar=True,
+            )
+        except ApiException as exception:
+            print(f"packing not available ({exception}), uploading {len(files)} {group_name} files one by one")
+
+            # counted again by handle()
+            total_size -= sum(size for _, _, size in files)
+            handle_one_by_one(files, log_action=f"upload {group_name} file")
+
+            return
+
+        print(f"packed {len(uploads)} {group_name} files into a single upload")
+        storage.update(uploads)
+
+    def handle_bulk(
+        files: List[Tuple[str, str, int]],
+    ):
+        nonlocal total_size
+
+        for _, name, size in files:
+            total_size += size
+            print(f"found {group_name} file: {name} ({format_size(size)})")
+
+        if dry:
+            return
+
+        try:
+            uploads = client.uploads.send_bulk_from_files(
+                files=[(path, name) for path, name, _ in files],
             )
+        except ApiException as exception:
+            print(f"bulk upload not available ({exception}), uploading {len(files)} {group_name} files one by one")
+
+            # counted again by handle()
+            total_size -= sum(size for _, _, size in files)
+            handle_one_by_one(files, log_action=f"upload {group_name} file")
+
+            return
+
+        print(f"uploaded {len(uploads)} {group_name} files in bulk")
+        storage.update(uploads)
+
+    def handle_one_by_one(
+        files: List[Tuple[str, str, int]],
+        log_action: Optional[str] = None,
+    ):
+        for path, name, size in files:
+            with open(path, "rb") as fd:
+                handle(fd, name, size, log_action=log_action)
+
+    def handle_delta(
+        path: str,
+        name: str,
+        size: int,
+        previous: SubmissionFile,
+    ) -> bool:
+        nonlocal total_size, delta
+
+        if dry:
+            return False
+
+        try:
+            signature = client.uploads.get_signature(previous.hash)
+
+            upload = client.uploads.send_delta(
+                path=path,
+                name=name,
+                base_hash=previous.hash,
+                signature=signature,
+                progress_bar=True,
+            )
+        except ApiException as exception:
+            print(f"delta not available ({exception}), uploading the remaining {group_name} files whole")
+
+            # the next files would most likely fail the same way, one request each
+            delta = False
+            return False
+
+        if upload is None:
+            print(f"too many changes for a delta in {group_name} file: {name}")
+            return False
+
+        total_size += size
+        print(f"delta {group_name} file: {name} ({format_size(size)})")
 
         storage[name] = upload
+        return True
 
     def handle_requirements(
         *,
@@ -250,13 +640,13 @@ def _upload_files(
             file_content=original_requirements_file,
         )
 
-        whitelist = requirements_txt.CachedWhitelist(
-            requirements_txt.CrunchHubWhitelist(
-                api_base_url=store.api_base_url,
-            )
-        )
-
         if validate_locally:
+            if isinstance(whitelist, SnapshotWhitelist):
+                whitelist.prefetch(
+                    language=language,
+                    names=[requirement.name for requirement in requirements],
+                )
+
             forbidden_names: List[str] = []
             for requirement in requirements:
                 library = whitelist.find_library(
@@ -276,7 +666,7 @@ def _upload_files(
         frozen_requirements = requirements_txt.freeze(
             requirements=requirements,
             freeze_only_if_required=False,
-            version_finder=requirements_txt.LocalSitePackageVersionFinder(),
+            version_finder=version_finder,
         )
 
         if requirements == frozen_requirements:
@@ -320,32 +710,114 @@ def _upload_files(
     # Also, requirements files should be processed first.
     validate_requirements_locally = encryption_info is not None
 
-    for path, name in file_iterator:
-        if freeze_requirements:
-            if name in original_requirements_txts:
-                continue
+    file_paths = list(file_iterator)
 
-            elif name == python_requirements_txt:
-                handle_requirements(
-                    path=path,
-                    language=RequirementLanguage.PYTHON,
-                    validate_locally=validate_requirements_locally,
-                )
+    # encrypted files cannot be compared, each one is using a new ephemeral key
+    unchanged_names: Set[str] = set()
+    if previous_files and encryption_info is None:
+        unchanged_names = _find_unchanged_files(file_paths, previous_files, index, compression)
 
-                continue
+    # the server reports the hash of the encrypted content, which is different on every upload
+    if encryption_info is not None:
+        index = None
 
-            elif name == r_requirements_txt:
-                handle_requirements(
-                    path=path,
-                    language=RequirementLanguage.R,
-                    validate_locally=validate_requirements_locally,
-                )
+    # encrypted files must be sent one by one, each with its own ephemeral key
+    pack_small_files = pack_small_files and encryption_info is None
+    small_files: List[Tuple[str, str, int]] = []
+
+    # bigger files are sent alone, so that they can be resumed
+    bulk = encryption_info is None and compression is None
+    bulk_files: List[Tuple[str, str, int]] = []
 
+    # files are encrypted by worker processes, the upload of one overlaps the encryption of the next ones
+    encryption_pipeline: Optional[_EncryptionPipeline] = None
+    if encryption_info is not None and not dry:
+        encryption_pipeline = _EncryptionPipeline(
+            public_key_pem=encryption_info.public_key_pem,
+            on_encrypted=upload_encrypted_file,
+        )
+
+    try:
+        for path, name in file_paths:
+            if freeze_requirements:
+                if name in original_requirements_txts:
+                    continue
+
+                elif name == python_requirements_txt:
+                    handle_requirements(
+                        path=path,
+                        language=RequirementLanguage.PYTHON,
+                        validate_locally=validate_requirements_locally,
+                    )
+
+                    continue
+
+                elif name == r_requirements_txt:
+                    handle_requirements(
+                        path=path,
+                        language=RequirementLanguage.R,
+                        validate_locally=validate_requirements_locally,
+                    )
+
+                    continue
+
+            if name in unchanged_names:
+                size = previous_files[name].size
+                reused_size += size
+
+                print(f"unchanged {group_name} file: {name} ({format_size(size)})")
+                reused_storage.append(name)
                 continue
 
-        with open(path, "rb") as fd:
-            size = os.fstat(fd.fileno()).st_size
-            handle(fd, name, size)
+            if index is not None:
+                index.stage(path, compression)
+
+            # compressed uploads cannot be patched
+            previous = previous_files.get(name)
+            if delta and previous is not None and compression is None:
+                size = os.path.getsize(path)
+                if size >= DELTA_MIN_FILE_SIZE and handle_delta(path, name, size, previous):
+                    continue
+
+            if pack_small_files:
+                size = os.path.getsize(path)
+                if size <= PACK_MAX_FILE_SIZE:
+                    small_files.append((path, name, size))
+                    continue
+
+            if bulk:
+                size = os.path.getsize(path)
+                if size < BULK_UPLOAD_MAX_FILE_SIZE:
+                    bulk_files.append((path, name, size))
+                    continue
+
+            if encryption_pipeline is not None:
+                handle_encrypted_file(path, name, os.path.getsize(path))
+                continue
+
+            journal_key = UploadJournal.make_key(path, name, compression) if journal is not None else None
+
+            with open(path, "rb") as fd:
+                size = os.fstat(fd.fileno()).st_size
+                handle(fd, name, size, journal_key=journal_key)
+
+        if encryption_pipeline is not None:
+            encryption_pipeline.flush()
+    finally:
+        if encryption_pipeline is not None:
+            encryption_pipeline.close()
+
+    if len(small_files) >= PACK_MIN_FILE_COUNT:
+        handle_pack(small_files)
+    elif bulk:
+        bulk_files.extend(small_files)
+    else:
+        handle_one_by_one(small_files)
+
+    if len(bulk_files) > 1:
+        handle_bulk(bulk_files)
+    else:
+        handle_one_by_one(bulk_files)
 
     if dry:
         return
@@ -362,7 +834,10 @@ def _upload_files(
             log_action=f"create {group_name} encryption file",
         )
 
-    print(f"total {group_name} size: {format_size(total_size)}")
+    if reused_size:
+        print(f"total {group_name} size: {format_size(total_size)} (reused {format_size(reused_size)})")
+    else:
+        print(f"total {group_name} size: {format_size(total_size)}")
 
 
 def _get_encryption_info(
@@ -396,7 +871,9 @@ def push(
     model_directory_relative_path: str,
     include_installed_packages_version: bool,
     no_afterword: bool,
-    dry: Literal[True]
+    dry: Literal[True],
+    incremental: bool = True,
+    model_compression: Optional[Codec] = None,
 ) -> None:
     ...
 
@@ -410,6 +887,8 @@ def push(
     include_installed_packages_version: bool,
     no_afterword: bool,
     dry: Literal[False],
+    incremental: bool = True,
+    model_compression: Optional[Codec] = None,
 ) -> Submission:
     ...
 
@@ -422,6 +901,8 @@ def push(
     include_installed_packages_version: bool,
     no_afterword: bool,
     dry: bool,
+    incremental: bool = True,
+    model_compression: Optional[Codec] = None,
 ) -> Optional[Submission]:
     message_length = len(message)
     if message_length > SUBMISSION_MESSAGE_LENGTH:
@@ -433,16 +914,47 @@ def push(
     client, project = Client.from_project()
     competition = project.competition
 
-    preferred_chunk_size = 50_000_000
+    # let the client adapt the chunk size to the measured throughput
+    preferred_chunk_size: Optional[int] = None
 
     encryption_info = _get_encryption_info(client, project)
 
+    # the downloaded ciphertext could not be decompressed, compression must be undone after the decryption
+    if model_compression is not None and encryption_info is not None:
+        print("compression: not supported on encrypted competitions, push again without --compression", file=sys.stderr)
+        raise click.Abort()
+
     code_uploads: Dict[str, Upload] = {}
     encrypted_code_files: List[EncryptedFileInfo] = []
 
     model_uploads: Dict[str, Upload] = {}
     encrypted_model_files: List[EncryptedFileInfo] = []
 
+    parent_submission: Optional[Submission] = None
+    previous_code_files: Dict[str, SubmissionFile] = {}
+    previous_model_files: Dict[str, SubmissionFile] = {}
+    if incremental and encryption_info is None:
+        (
+            parent_submission,
+            previous_code_files,
+            previous_model_files,
+        ) = _get_previous_files(project, model_directory_relative_path)
+
+    reused_code_files: List[str] = []
+    reused_model_files: List[str] = []
+
+    # an interrupted push will resume its partial uploads on the next run
+    journal = UploadJournal(os.path.join(submission_directory_path, DOT_CRUNCH_DIRECTORY, UPLOAD_JOURNAL_FILE))
+
+    # unchanged files are not read again to be compared with the previous submission
+    index = WorkspaceIndex(submission_directory_path, os.path.join(submission_directory_path, DOT_CRUNCH_DIRECTORY, WORKSPACE_INDEX_FILE))
+
+    # shared by both groups, a large requirements file lists the whole whitelist at most once per push
+    whitelist = SnapshotWhitelist(client)
+
+    # the installed distributions are only scanned again if an environment directory changed
+    version_finder = CachedSitePackageVersionFinder()
+
     try:
         _upload_files(
             group_name="code",
@@ -454,6 +966,13 @@ def push(
             encryption_info=encryption_info,
             encrypted_files_storage=encrypted_code_files,
             freeze_requirements=include_installed_packages_version,
+            previous_files=previous_code_files,
+            reused_storage=reused_code_files,
+            journal=journal,
+            pack_small_files=True,
+            index=index,
+            whitelist=whitelist,
+            version_finder=version_finder,
         )
 
         _upload_files(
@@ -466,9 +985,19 @@ def push(
             encryption_info=encryption_info,
             encrypted_files_storage=encrypted_model_files,
             freeze_requirements=False,
+            previous_files=previous_model_files,
+            reused_storage=reused_model_files,
+            compression=model_compression,
+            journal=journal,
+            delta=True,
+            index=index,
+            whitelist=whitelist,
+            version_finder=version_finder,
         )
 
         if dry:
+            _save_index(index)
+
             print("dry run, not uploading files")
             return None
 
@@ -486,8 +1015,17 @@ def push(
                 path: upload.id
                 for path, upload in model_uploads.items()
             },
+            parent_submission_number=(
+                parent_submission.number
+                if parent_submission is not None and (reused_code_files or reused_model_files)
+                else None
+            ),
+            reused_code_files=reused_code_files,
+            reused_model_files=reused_model_files,
         )
 
+        _update_index(index, submission)
+
         if not no_afterword:
             _print_success(client, submission)
 
@@ -497,6 +1035,32 @@ def push(
             _cleanup(code_uploads, model_uploads)
 
 
+def _update_index(
+    index: WorkspaceIndex,
+    submission: Submission,
+):
+    try:
+        files = submission.files.list()
+    except ApiException as exception:
+        print(f"index: could not list submission files: {exception}")
+    else:
+        index.commit({
+            file.name: file.hash
+            for file in files
+        })
+
+    _save_index(index)
+
+
+def _save_index(
+    index: WorkspaceIndex,
+):
+    try:
+        index.save()
+    except OSError as exception:
+        print(f"index: could not save: {exception}")
+
+
 def _cleanup(
     code_uploads: dict[str, Upload],
     model_uploads: dict[str, Upload]
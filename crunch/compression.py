@@ -0,0 +1,144 @@
+import enum
+import os
+import shutil
+import tempfile
+from typing import Any, BinaryIO, Tuple
+
+"""
+Object metadata set by the server on compressed uploads, returned with the file on download.
+"""
+COMPRESSION_METADATA_HEADER = "x-amz-meta-crunch-compression"
+
+"""
+Compressed data is kept in memory up to this size, then spooled to disk.
+"""
+SPOOL_MAX_MEMORY_SIZE = 16 * 1024 * 1024
+
+BUFFER_SIZE = 1024 * 1024
+
+
+class Codec(enum.Enum):
+
+    GZIP = "GZIP"
+    ZSTD = "ZSTD"
+
+    def __repr__(self):
+        return self.name
+
+    @staticmethod
+    def parse(name: str) -> "Codec":
+        try:
+            return Codec[name.upper()]
+        except KeyError:
+            supported = ", ".join(codec.name.lower() for codec in Codec)
+            raise ValueError(f"unsupported compression: {name} (supported: {supported}), a newer version of the cli could be required") from None
+
+
+def _import_zstandard():
+    try:
+        import zstandard  # type: ignore
+    except ImportError as error:
+        raise ImportError("zstd compression requires the `zstandard` package, install it with: pip install zstandard") from error
+
+    return zstandard  # type: ignore
+
+
+def _open_compressor(
+    codec: Codec,
+    output: BinaryIO,
+) -> Any:
+    if codec == Codec.GZIP:
+        import gzip
+
+        # mtime=0 and no file name make the output reproducible, which is needed to resume an upload or to compare it with the previous one
+        return gzip.GzipFile(filename="", fileobj=output, mode="wb", compresslevel=6, mtime=0)
+
+    if codec == Codec.ZSTD:
+        zstandard = _import_zstandard()
+        return zstandard.ZstdCompressor(level=3).stream_writer(output, closefd=False)  # type: ignore
+
+    raise ValueError(f"unsupported codec: {codec}")
+
+
+def _open_decompressor(
+    codec: Codec,
+    input: BinaryIO,
+) -> Any:
+    if codec == Codec.GZIP:
+        import gzip
+
+        return gzip.GzipFile(fileobj=input, mode="rb")
+
+    if codec == Codec.ZSTD:
+        zstandard = _import_zstandard()
+        return zstandard.ZstdDecompressor().stream_reader(input, closefd=False)  # type: ignore
+
+    raise ValueError(f"unsupported codec: {codec}")
+
+
+def compress(
+    io: BinaryIO,
+    codec: Codec,
+) -> Tuple[BinaryIO, int]:
+    """
+    Compress a stream into a spooled temporary file.
+    The caller is responsible for closing the returned file.
+
+    Returns:
+        The compressed file positioned at the start, and its size.
+    """
+
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY_SIZE)
+
+    try:
+        compressor = _open_compressor(codec, output)  # type: ignore
+        with compressor:
+            shutil.copyfileobj(io, compressor, BUFFER_SIZE)
+
+        size = output.tell()
+        output.seek(0)
+
+        return output, size  # type: ignore
+    except BaseException:
+        output.close()
+        raise
+
+
+def compress_file(
+    source_path: str,
+    destination_path: str,
+    codec: Codec,
+):
+    with open(source_path, "rb") as input, open(destination_path, "wb") as output:
+        compressor = _open_compressor(codec, output)  # type: ignore
+        with compressor:
+            shutil.copyfileobj(input, compressor, BUFFER_SIZE)
+
+
+def decompress_file(
+    source_path: str,
+    destination_path: str,
+    codec: Codec,
+):
+    with open(source_path, "rb") as input, open(destination_path, "wb") as output:
+        decompressor = _open_decompressor(codec, input)  # type: ignore
+        with decompressor:
+            shutil.copyfileobj(decompressor, output, BUFFER_SIZE)
+
+
+def decompress_in_place(
+    path: str,
+    codec: Codec,
+):
+    directory_path = os.path.dirname(path) or "."
+
+    fd, temporary_path = tempfile.mkstemp(prefix=f"{os.path.basename(path)}.", dir=directory_path)
+    os.close(fd)
+
+    try:
+        decompress_file(path, temporary_path, codec)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
@@ -3,6 +3,8 @@ DOT_DATA_DIRECTORY = "data"
 DOT_PREDICTION_DIRECTORY = "prediction"
 TOKEN_FILE = "token"
 PROJECT_FILE = "project.json"
+UPLOAD_JOURNAL_FILE = "uploads.json"
+WORKSPACE_INDEX_FILE = "index.json"
 DOT_GITIGNORE_FILE = ".gitignore"
 REQUIREMENTS_TXT = "requirements.txt"
 REQUIREMENTS_R_TXT = "requirements.r.txt"
@@ -40,6 +42,8 @@ COLAB_IGNORED_CODE_FILES = [
 ]
 
 DEBUG_ENV_VAR = "CRUNCH_DEBUG"
+CACHE_DIRECTORY_ENV_VAR = "CRUNCH_CACHE_DIRECTORY"
+NO_CACHE_ENV_VAR = "CRUNCH_NO_CACHE"
 API_KEY_ENV_VAR = "CRUNCH_API_KEY"
 ENVIRONMENT_ENV_VAR = "CRUNCH_ENVIRONMENT"
 
@@ -72,3 +76,13 @@ TEXT_FILE_EXTENSIONS = [
 RUN_VIA_CLI = False
 
 SUBMISSION_MESSAGE_LENGTH = 1000
+
+"""
+Smaller files are always uploaded in full, a delta would not save enough to pay for the signature.
+"""
+DELTA_MIN_FILE_SIZE = 16 * 1024 * 1024
+
+"""
+Smaller files are uploaded together in a single bulk session, bigger ones on their own so that they can be resumed.
+"""
+BULK_UPLOAD_MAX_FILE_SIZE = 16 * 1024 * 1024
@@ -0,0 +1,353 @@
+"""
+Block-level delta between two versions of a file, in the spirit of rsync.
+
+The receiver, which has the old version, computes a `Signature`: a weak and a strong checksum for each block.
+The sender slides a window over the new version, looking for blocks of the old version at any offset.
+The result is a `Delta`: a list of ranges to copy from the old version, and ranges of new data.
+"""
+
+import dataclasses
+import hashlib
+import mmap
+import os
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+import numpy
+
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+
+"""
+Number of window positions checked at once, bounds the memory used by the rolling checksums to a few tens of megabytes.
+"""
+SEGMENT_SIZE = 1024 * 1024
+
+BUFFER_SIZE = 1024 * 1024
+
+_MODULO_MASK = 0xFFFF
+_FILTER_MASK = 0xFFFFFF
+
+
+def _weak_checksum(block: bytes) -> int:
+    # the sums are kept modulo 2^16, wrapping 32-bit arithmetic gives the same low bits
+    values = numpy.frombuffer(block, dtype=numpy.uint8).astype(numpy.uint32)
+    weights = numpy.arange(len(values), 0, -1, dtype=numpy.uint32)
+
+    a = int(values.sum()) & _MODULO_MASK
+    b = int((weights * values).sum()) & _MODULO_MASK
+
+    return a | (b << 16)
+
+
+def _rolling_weak_checksums(
+    data: bytes,
+    block_size: int,
+) -> numpy.ndarray:
+    """
+    Weak checksum of every window of `block_size` bytes, computed from prefix sums instead of rolling byte by byte.
+
+    The prefix sums overflow, but they wrap modulo 2^32 and only the low 16 bits are kept, like in `_weak_checksum()`.
+    """
+
+    values = numpy.frombuffer(data, dtype=numpy.uint8).astype(numpy.uint32)
+    count = len(values) - block_size + 1
+    if count <= 0:
+        return numpy.empty(0, dtype=numpy.uint32)
+
+    prefix = numpy.zeros(len(values) + 1, dtype=numpy.uint32)
+    numpy.cumsum(values, out=prefix[1:])
+
+    values *= numpy.arange(len(values), dtype=numpy.uint32)
+
+    weighted_prefix = numpy.zeros(len(values) + 1, dtype=numpy.uint32)
+    numpy.cumsum(values, out=weighted_prefix[1:])
+    del values
+
+    a = prefix[block_size:] - prefix[:count]
+    del prefix
+
+    b = numpy.arange(block_size, block_size + count, dtype=numpy.uint32) * a
+    b -= weighted_prefix[block_size:]
+    b += weighted_prefix[:count]
+
+    a &= _MODULO_MASK
+    b &= _MODULO_MASK
+    b <<= 16
+    b |= a
+
+    return b
+
+
+def _strong_checksum(block: bytes) -> str:
+    return hashlib.blake2b(block, digest_size=16).hexdigest()
+
+
+@dataclasses.dataclass(frozen=True)
+class Signature:
+
+    block_size: int
+    size: int
+    weak: List[int]
+    strong: List[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "blockSize": self.block_size,
+            "size": self.size,
+            "blocks": [
+                {
+                    "weak": weak,
+                    "strong": strong,
+                }
+                for weak, strong in zip(self.weak, self.strong)
+            ],
+        }
+
+    @staticmethod
+    def from_dict(root: Dict[str, Any]) -> "Signature":
+        blocks = root["blocks"]
+
+        return Signature(
+            block_size=root["blockSize"],
+            size=root["size"],
+            weak=[block["weak"] for block in blocks],
+            strong=[block["strong"] for block in blocks],
+        )
+
+
+def compute_signature(
+    io: BinaryIO,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> Signature:
+    weak: List[int] = []
+    strong: List[str] = []
+    size = 0
+
+    while True:
+        block = io.read(block_size)
+        if not block:
+            break
+
+        size += len(block)
+        weak.append(_weak_checksum(block))
+        strong.append(_strong_checksum(block))
+
+    return Signature(
+        block_size=block_size,
+        size=size,
+        weak=weak,
+        strong=strong,
+    )
+
+
+def compute_file_signature(
+    path: str,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> Signature:
+    with open(path, "rb") as fd:
+        return compute_signature(fd, block_size)
+
+
+@dataclasses.dataclass(frozen=True)
+class Delta:
+    """
+    Operations are `(from_base, offset, size)`.
+    The offset is in the old version for a copy, and in the new version for new data.
+    """
+
+    size: int
+    operations: List[Tuple[bool, int, int]]
+
+    @property
+    def data_size(self) -> int:
+        return sum(
+            size
+            for from_base, _, size in self.operations
+            if not from_base
+        )
+
+    def write_data(
+        self,
+        path: str,
+        output: BinaryIO,
+    ):
+        """
+        Write the new data ranges of the file, in order, which is the payload expected by `to_recipe()`.
+        """
+
+        with open(path, "rb") as fd:
+            for from_base, offset, size in self.operations:
+                if from_base:
+                    continue
+
+                fd.seek(offset)
+                _copy_range(fd, output, size)
+
+    def to_recipe(self) -> Dict[str, Any]:
+        """
+        Operations reference the base file, or the payload written by `write_data()`.
+        """
+
+        operations: List[Dict[str, Any]] = []
+        data_offset = 0
+
+        for from_base, offset, size in self.operations:
+            if from_base:
+                operations.append({
+                    "source": "BASE",
+                    "offset": offset,
+                    "size": size,
+                })
+            else:
+                operations.append({
+                    "source": "DATA",
+                    "offset": data_offset,
+                    "size": size,
+                })
+
+                data_offset += size
+
+        return {
+            "size": self.size,
+            "operations": operations,
+        }
+
+
+def _append_operation(
+    operations: List[Tuple[bool, int, int]],
+    from_base: bool,
+    offset: int,
+    size: int,
+):
+    if size <= 0:
+        return
+
+    if operations:
+        last_from_base, last_offset, last_size = operations[-1]
+        if last_from_base == from_base and last_offset + last_size == offset:
+            operations[-1] = (from_base, last_offset, last_size + size)
+            return
+
+    operations.append((from_base, offset, size))
+
+
+def compute_delta(
+    signature: Signature,
+    path: str,
+) -> Delta:
+    block_size = signature.block_size
+    size = os.path.getsize(path)
+
+    # the last block is only matched if it is complete
+    blocks_by_weak: Dict[int, List[int]] = {}
+    for index, weak in enumerate(signature.weak):
+        if (index + 1) * block_size <= signature.size:
+            blocks_by_weak.setdefault(weak, []).append(index)
+
+    operations: List[Tuple[bool, int, int]] = []
+
+    if not blocks_by_weak or size < block_size:
+        _append_operation(operations, False, 0, size)
+        return Delta(size, operations)
+
+    known_weaks = numpy.array(sorted(blocks_by_weak.keys()), dtype=numpy.int64)
+
+    # cheap pre-filter on the low bits, confirmed by a binary search
+    known_filter = numpy.zeros(_FILTER_MASK + 1, dtype=numpy.bool_)
+    known_filter[known_weaks & _FILTER_MASK] = True
+
+    def find_block(data: Any, offset: int, weak: int) -> Optional[int]:
+        strong = _strong_checksum(data[offset:offset + block_size])
+
+        for index in blocks_by_weak[weak]:
+            if signature.strong[index] == strong:
+                return index
+
+        return None
+
+    data_start = 0
+    position = 0
+    next_index: Optional[int] = None
+
+    with open(path, "rb") as fd, mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        while position + block_size <= size:
+            # unchanged regions are common, try the block following the last match before rolling
+            if next_index is not None:
+                if (
+                    next_index < len(signature.strong)
+                    and (next_index + 1) * block_size <= signature.size
+                    and _strong_checksum(data[position:position + block_size]) == signature.strong[next_index]
+                ):
+                    _append_operation(operations, False, data_start, position - data_start)
+                    _append_operation(operations, True, next_index * block_size, block_size)
+
+                    position = data_start = position + block_size
+                    next_index += 1
+                    continue
+
+                next_index = None
+
+            segment_end = min(size, position + SEGMENT_SIZE + block_size - 1)
+            weaks = _rolling_weak_checksums(data[position:segment_end], block_size)
+
+            candidates = numpy.flatnonzero(known_filter[weaks & _FILTER_MASK])
+            if len(candidates):
+                positions = numpy.minimum(numpy.searchsorted(known_weaks, weaks[candidates]), len(known_weaks) - 1)
+                candidates = candidates[known_weaks[positions] == weaks[candidates]]
+
+            cursor = position
+            candidate_index = 0
+            while candidate_index < len(candidates):
+                candidate = int(candidates[candidate_index])
+                offset = position + candidate
+
+                index = find_block(data, offset, int(weaks[candidate]))
+                if index is None:
+                    candidate_index += 1
+                    continue
+
+                _append_operation(operations, False, data_start, offset - data_start)
+                _append_operation(operations, True, index * block_size, block_size)
+
+                cursor = data_start = offset + block_size
+                next_index = index + 1
+
+                # windows overlapping the matched block cannot match anymore
+                candidate_index = int(numpy.searchsorted(candidates, cursor - position))
+
+            if next_index is not None and cursor == data_start:
+                # continue from the last match, the next block is likely to follow
+                position = cursor
+            else:
+                position = max(cursor, position + len(weaks))
+
+    _append_operation(operations, False, data_start, size - data_start)
+
+    return Delta(size, operations)
+
+
+def apply_recipe(
+    base: BinaryIO,
+    payload: BinaryIO,
+    recipe: Dict[str, Any],
+    output: BinaryIO,
+):
+    for operation in recipe["operations"]:
+        source = base if operation["source"] == "BASE" else payload
+
+        source.seek(operation["offset"])
+        _copy_range(source, output, operation["size"])
+
+
+def _copy_range(
+    source: BinaryIO,
+    output: BinaryIO,
+    size: int,
+):
+    while size > 0:
+        buffer = source.read(min(size, BUFFER_SIZE))
+        if not buffer:
+            raise EOFError("source is shorter than expected")
+
+        output.write(buffer)
+        size -= len(buffer)
+
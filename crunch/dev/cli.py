@@ -1,3 +1,5 @@
+from typing import List, Optional
+
 import click
 
 
@@ -24,3 +26,114 @@ def fake_server(
         port=port,
         storage_directory_path=storage_directory_path,
     )
+
+
+@group.group()
+def uploads():
+    pass
+
+
+@uploads.command(name="fake-server")
+@click.option('--port', default=5124, help='Port to run the fake server on.')
+@click.option('--latency', "latency_milliseconds", default=0.0, help='Delay added to every api call, in milliseconds.')
+@click.option('--bandwidth', "bandwidth_megabytes", default=None, type=float, help='Maximum speed of each chunk upload, in MB/s.')
+@click.option('--failure-rate', default=0.0, type=click.FloatRange(0, 1), help='Probability of a chunk upload to fail.')
+@click.option('--keep-content', is_flag=True, help='Keep the uploaded content in memory, required to unpack archives and apply patches.')
+def uploads_fake_server(
+    port: int,
+    latency_milliseconds: float,
+    bandwidth_megabytes: Optional[float],
+    failure_rate: float,
+    keep_content: bool,
+):
+    from crunch.dev.uploads import run_fake_server
+
+    run_fake_server(
+        port=port,
+        latency=latency_milliseconds / 1000,
+        bandwidth=bandwidth_megabytes * 1_000_000 if bandwidth_megabytes else None,
+        failure_rate=failure_rate,
+        keep_content=keep_content,
+    )
+
+
+@uploads.command(name="benchmark")
+@click.option('--size', "sizes_megabytes", multiple=True, type=int, default=[10, 100], show_default=True, help='Size of the uploaded files, in MB.')
+@click.option('--latency', "latency_milliseconds", default=0.0, help='Delay added to every api call, in milliseconds.')
+@click.option('--bandwidth', "bandwidth_megabytes", default=None, type=float, help='Maximum speed of each chunk upload, in MB/s.')
+@click.option('--failure-rate', default=0.0, type=click.FloatRange(0, 1), help='Probability of a chunk upload to fail.')
+@click.option('--no-encrypted', "no_encrypted", is_flag=True, help='Skip the encrypted upload.')
+def uploads_benchmark(
+    sizes_megabytes: List[int],
+    latency_milliseconds: float,
+    bandwidth_megabytes: Optional[float],
+    failure_rate: float,
+    no_encrypted: bool,
+):
+    from crunch.dev.uploads import run_benchmark
+
+    run_benchmark(
+        sizes=[size * 1_000_000 for size in sizes_megabytes],
+        latency=latency_milliseconds / 1000,
+        bandwidth=bandwidth_megabytes * 1_000_000 if bandwidth_megabytes else None,
+        failure_rate=failure_rate,
+        encrypted=not no_encrypted,
+    )
+
+
+@group.group()
+def listing():
+    pass
+
+
+@listing.command(name="benchmark")
+@click.option('--directory', "directory_path", default=None, type=click.Path(exists=True, file_okay=False, dir_okay=True), help='Directory to list, a tree is generated if not set.')
+@click.option('--code-files', "code_file_count", default=1_000, show_default=True, help='Number of code files of the generated tree.')
+@click.option('--ignored-files', "ignored_file_count", default=10_000, show_default=True, help='Number of files of each ignored directory of the generated tree.')
+@click.option('--rules', "rule_count", default=200, show_default=True, help='Number of generated ignore rules for the matcher comparison.')
+@click.option('--repeat', default=3, show_default=True, help='Number of runs, the best one is kept.')
+def listing_benchmark(
+    directory_path: Optional[str],
+    code_file_count: int,
+    ignored_file_count: int,
+    rule_count: int,
+    repeat: int,
+):
+    from crunch.dev.listing import run_benchmark
+
+    run_benchmark(
+        directory_path=directory_path,
+        code_file_count=code_file_count,
+        ignored_file_count=ignored_file_count,
+        rule_count=rule_count,
+        repeat=repeat,
+    )
+
+
+@group.group()
+def models():
+    pass
+
+
+@models.command(name="benchmark")
+@click.option('--models', "model_count", default=100_000, show_default=True, help='Number of models for the memory comparison.')
+@click.option('--splits', "split_count", default=1_000, show_default=True, help='Number of splits of the data release.')
+@click.option('--chunks', "chunk_count", default=100, show_default=True, help='Number of chunks of the upload.')
+@click.option('--accesses', "access_count", default=10, show_default=True, help='Number of accesses to each property.')
+@click.option('--repeat', default=3, show_default=True, help='Number of runs, the best one is kept.')
+def models_benchmark(
+    model_count: int,
+    split_count: int,
+    chunk_count: int,
+    access_count: int,
+    repeat: int,
+):
+    from crunch.dev.models import run_benchmark
+
+    run_benchmark(
+        model_count=model_count,
+        split_count=split_count,
+        chunk_count=chunk_count,
+        access_count=access_count,
+        repeat=repeat,
+    )
@@ -0,0 +1,161 @@
+import os
+import tempfile
+import time
+from typing import Any, Iterator, List, Optional, Tuple
+
+from crunch.command.push import _build_gitignore, _list_files, _to_unix_path
+from crunch.constants import IGNORED_CODE_FILES
+from crunch.external import gitignorefile
+
+
+def list_files_os_walk(
+    directory_path: str,
+    ignored_paths: List[str],
+    *,
+    use_parent_gitignore: bool = False,
+) -> Iterator[Tuple[str, str]]:
+    """
+    Previous implementation of `push._list_files()`, which matches every file of the ignored directories.
+    Kept as a reference for the benchmark.
+    """
+
+    directory_path = _to_unix_path(directory_path)
+    directory_path_prefix = (
+        len(directory_path)
+        + int(not directory_path.endswith("/"))  # add 1 if value not ends with a slash
+    )
+
+    is_ignored = _build_gitignore(directory_path, ignored_paths, use_parent_gitignore)
+
+    for root, _, files in os.walk(directory_path, topdown=False):
+        root = _to_unix_path(root)
+
+        if root.startswith(directory_path):
+            root = root[directory_path_prefix:]
+
+        for file in files:
+            relative_path = _to_unix_path(os.path.join(root, file))
+            path = _to_unix_path(os.path.join(directory_path, relative_path))
+
+            if any(is_ignored(path, None)):  # type: ignore
+                continue
+
+            yield path, relative_path
+
+
+def create_tree(
+    directory_path: str,
+    *,
+    code_file_count: int,
+    ignored_file_count: int,
+):
+    """
+    Mimic a submission: a few nested code files, next to big ignored trees.
+    """
+
+    def touch(path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w"):
+            pass
+
+    for index in range(code_file_count):
+        touch(os.path.join(directory_path, "src", f"package{index % 10}", f"module{index}.py"))
+
+    for index in range(ignored_file_count):
+        touch(os.path.join(directory_path, "data", f"part{index % 100}", f"{index}.parquet"))
+        touch(os.path.join(directory_path, ".git", "objects", f"{index % 256:02x}", f"{index:038x}"))
+        touch(os.path.join(directory_path, "venv", "lib", f"package{index % 50}", f"module{index}.py"))
+
+    with open(os.path.join(directory_path, ".gitignore"), "w") as fd:
+        fd.write("venv/\n")
+
+
+def create_rules(
+    count: int,
+) -> List[str]:
+    """
+    Mimic a long ignore list, with a few negations in the middle.
+    """
+
+    rules: List[str] = []
+
+    for index in range(count):
+        kind = index % 4
+        if kind == 0:
+            rules.append(f"*.ext{index}")
+        elif kind == 1:
+            rules.append(f"directory{index}/")
+        elif kind == 2:
+            rules.append(f"/src/**/generated{index}_*.py")
+        elif index % 20 == 3:
+            rules.append(f"!keep{index}.ext{index - 3}")
+        else:
+            rules.append(f"cache{index}")
+
+    return rules
+
+
+def run_benchmark(
+    *,
+    directory_path: Optional[str] = None,
+    code_file_count: int = 1_000,
+    ignored_file_count: int = 10_000,
+    rule_count: int = 200,
+    repeat: int = 3,
+    print: Any = print,
+):
+    """
+    Compare the pruning walker with the previous one, on `directory_path` or on a generated tree.
+    Then compare the compiled ignore rules with the ones matched one by one, on the listed files and a long ignore list.
+    """
+
+    with tempfile.TemporaryDirectory() as temporary_directory_path:
+        if directory_path is None:
+            directory_path = temporary_directory_path
+
+            create_tree(
+                directory_path,
+                code_file_count=code_file_count,
+                ignored_file_count=ignored_file_count,
+            )
+
+        implementations = [
+            ("os.walk", list_files_os_walk),
+            ("scandir (pruning)", _list_files),
+        ]
+
+        print(f"{'implementation':<20} {'files':>8} {'best seconds':>12}")
+
+        for name, implementation in implementations:
+            best = float("inf")
+            count = 0
+
+            for _ in range(repeat):
+                start = time.monotonic()
+                count = sum(1 for _ in implementation(directory_path, IGNORED_CODE_FILES))
+                best = min(best, time.monotonic() - start)
+
+            print(f"{name:<20} {count:>8} {best:>12.3f}")
+
+        print()
+
+        rules = [*IGNORED_CODE_FILES, *create_rules(rule_count)]
+        paths = [path for path, _ in _list_files(directory_path, IGNORED_CODE_FILES)]
+
+        matchers = [
+            ("one regex per rule", gitignorefile._IgnoreRules([rule for rule in map(gitignorefile._rule_from_pattern, rules) if rule], directory_path).match),  # type: ignore
+            ("compiled", gitignorefile.compile_rules(rules, directory_path).match),
+        ]
+
+        print(f"{'matcher':<20} {'rules':>8} {'ignored':>8} {'best seconds':>12}")
+
+        for name, match in matchers:
+            best = float("inf")
+            count = 0
+
+            for _ in range(repeat):
+                start = time.monotonic()
+                count = sum(1 for path in paths if match(path, is_dir=False))
+                best = min(best, time.monotonic() - start)
+
+            print(f"{name:<20} {len(rules):>8} {count:>8} {best:>12.3f}")
@@ -0,0 +1,140 @@
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from crunch.api import DataRelease, Project, Upload
+
+
+def create_data_release(
+    split_count: int,
+) -> DataRelease:
+    return DataRelease(
+        None,  # type: ignore
+        attrs={
+            "id": 1,
+            "number": 1,
+            "splits": [
+                {
+                    "key": index,
+                    "group": "TRAIN" if index % 2 else "TEST",
+                    "reduced": None,
+                }
+                for index in range(split_count)
+            ],
+            "dataFiles": {
+                name: {
+                    "name": f"{name}.parquet",
+                    "url": f"https://example.com/{name}.parquet",
+                    "size": 1_000_000,
+                    "signed": False,
+                    "compressed": False,
+                }
+                for name in ["X_train", "y_train", "X_test", "y_test", "example_prediction"]
+            },
+        },
+    )
+
+
+def create_upload(
+    chunk_count: int,
+) -> Upload:
+    return Upload(
+        attrs={
+            "id": "upload",
+            "chunks": [
+                {
+                    "number": index,
+                    "offset": index * 50_000_000,
+                    "size": 50_000_000,
+                    "last": index == chunk_count - 1,
+                    "completed": False,
+                }
+                for index in range(chunk_count)
+            ],
+        },
+    )
+
+
+def measure_instance_size(
+    factory: Callable[[int], Any],
+    count: int,
+) -> float:
+    tracemalloc.start()
+
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        instances = [factory(index) for index in range(count)]
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    del instances
+    return (after - before) / count
+
+
+def measure_access(
+    read: Callable[[], Any],
+    access_count: int,
+    repeat: int,
+) -> float:
+    best = float("inf")
+
+    for _ in range(repeat):
+        start = time.monotonic()
+
+        for _ in range(access_count):
+            read()
+
+        best = min(best, time.monotonic() - start)
+
+    return best
+
+
+def run_benchmark(
+    *,
+    model_count: int = 100_000,
+    split_count: int = 1_000,
+    chunk_count: int = 100,
+    access_count: int = 10,
+    repeat: int = 3,
+    print: Any = print,
+):
+    """
+    Compare the memory of the models with and without `__slots__`, like a leaderboard worth of projects.
+    Then compare the memoized properties with parsing the attributes on every access.
+    """
+
+    ProjectWithDict = type("ProjectWithDict", (Project,), {})
+
+    attrs_list: List[Dict[str, Any]] = [
+        {"id": index, "userId": index, "name": f"project-{index}"}
+        for index in range(model_count)
+    ]
+
+    print(f"{'model':<20} {'count':>8} {'bytes per instance':>20}")
+
+    for name, model_class in [
+        ("Project (__dict__)", ProjectWithDict),
+        ("Project (__slots__)", Project),
+    ]:
+        size = measure_instance_size(lambda index: model_class(None, attrs_list[index]), model_count)
+        print(f"{name:<20} {model_count:>8} {size:>20.1f}")
+
+    print()
+
+    data_release = create_data_release(split_count)
+    upload = create_upload(chunk_count)
+
+    properties = [
+        ("DataRelease.splits", data_release, DataRelease.splits, split_count),
+        ("DataRelease.data_files", data_release, DataRelease.data_files, 5),
+        ("Upload.chunks", upload, Upload.chunks, chunk_count),
+    ]
+
+    print(f"{'property':<24} {'items':>8} {'accesses':>8} {'parsed seconds':>16} {'memoized seconds':>18}")
+
+    for name, instance, memoized_property, item_count in properties:
+        parsed = measure_access(lambda: memoized_property.function(instance), access_count, repeat)
+        memoized = measure_access(lambda: memoized_property.__get__(instance), access_count, repeat)
+
+        print(f"{name:<24} {item_count:>8} {access_count:>8} {parsed:>16.4f} {memoized:>18.4f}")
@@ -0,0 +1,716 @@
+import hashlib
+import math
+import os
+import random
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from io import BytesIO
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
+
+from crunch.compression import COMPRESSION_METADATA_HEADER
+
+if TYPE_CHECKING:
+    from flask import Flask
+
+DEFAULT_CHUNK_SIZE = 50_000_000
+
+"""
+Same limit as S3, smaller chunks are refused for multipart uploads.
+"""
+MINIMUM_CHUNK_SIZE = 5 * 1024 * 1024
+
+READ_BLOCK_SIZE = 64 * 1024
+
+
+class FakeUploadStore:
+    """
+    In-memory state of the fake server.
+    The content of the received chunks is only kept if `keep_content` is set, which the unpack, signature and patch endpoints need.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0,
+        bandwidth: Optional[float] = None,
+        failure_rate: float = 0,
+        minimum_chunk_size: int = MINIMUM_CHUNK_SIZE,
+        keep_content: bool = False,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.failure_rate = failure_rate
+        self.minimum_chunk_size = minimum_chunk_size
+        self.keep_content = keep_content
+
+        self.uploads: Dict[str, Dict[str, Any]] = {}
+        self.etags: Dict[str, Dict[int, str]] = {}
+        self.contents: Dict[str, Dict[int, bytes]] = {}
+        self.hashes: Dict[str, str] = {}
+        self.counters: Counter[str] = Counter()
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            return self._random.random() < self.failure_rate
+
+    def create(
+        self,
+        *,
+        name: str,
+        size: int,
+        encrypted: bool,
+        preferred_chunk_size: Optional[int],
+        compression: Optional[str],
+    ):
+        chunk_size = max(preferred_chunk_size or DEFAULT_CHUNK_SIZE, self.minimum_chunk_size)
+        chunk_count = max(1, math.ceil(size / chunk_size))
+
+        chunks: List[Dict[str, Any]] = []
+        for index in range(chunk_count):
+            offset = index * chunk_size
+
+            chunks.append({
+                "number": index + 1,
+                "offset": offset,
+                "size": min(chunk_size, size - offset),
+                "last": index == chunk_count - 1,
+                "completed": False,
+            })
+
+        upload = {
+            "id": str(uuid.uuid4()),
+            "name": name,
+            "size": size,
+            "encrypted": encrypted,
+            "chunked": chunk_count > 1,
+            "compression": compression,
+            "status": "PENDING",
+            "statusMessage": None,
+            "provider": "AWS_S3",
+            "chunks": chunks,
+        }
+
+        with self._lock:
+            self.uploads[upload["id"]] = upload
+            self.etags[upload["id"]] = {}
+            self.contents[upload["id"]] = {}
+
+        return upload
+
+    def create_completed(
+        self,
+        *,
+        name: str,
+        content: bytes,
+    ):
+        upload = self.create(
+            name=name,
+            size=len(content),
+            encrypted=False,
+            preferred_chunk_size=max(len(content), 1),
+            compression=None,
+        )
+
+        for chunk in upload["chunks"]:
+            chunk["completed"] = True
+
+        upload["status"] = "SUCCEEDED"
+        self.contents[upload["id"]] = {1: content}
+        self.hashes[hashlib.sha256(content).hexdigest()] = upload["id"]
+
+        return upload
+
+    def find_content_by_hash(
+        self,
+        hash: str,
+    ) -> Optional[bytes]:
+        id = self.hashes.get(hash)
+        if id is None:
+            return None
+
+        return self.read(id)
+
+    def read(
+        self,
+        id: str,
+    ) -> Optional[bytes]:
+        parts = self.contents.get(id)
+        upload = self.uploads.get(id)
+        if parts is None or upload is None or len(parts) != len(upload["chunks"]):
+            return None
+
+        return b"".join(
+            parts[number]
+            for number in sorted(parts)
+        )
+
+
+def create_fake_server_app(
+    store: FakeUploadStore,
+) -> "Flask":
+    from flask import Flask, jsonify, request
+
+    app = Flask(__name__)
+
+    def error(status: int, code: str, message: str):
+        response = jsonify({
+            "code": code,
+            "message": message,
+        })
+
+        response.status_code = status
+        return response
+
+    def find_upload(id: str):
+        upload = store.uploads.get(id)
+        if upload is None:
+            return None, error(404, "UPLOAD_NOT_FOUND", f"upload {id} not found")
+
+        return upload, None
+
+    def find_chunk(upload: Dict[str, Any], number: int):
+        for chunk in upload["chunks"]:
+            if chunk["number"] == number:
+                return chunk, None
+
+        return None, error(404, "UPLOAD_CHUNK_NOT_FOUND", f"chunk {number} not found")
+
+    def presigned_request(id: str, number: int):
+        return {
+            "method": "PUT",
+            "url": f"{request.host_url}s3/{id}/{number}",
+            "headers": {},
+        }
+
+    @app.before_request
+    def before_request():  # type: ignore
+        store.count(f"{request.method} {request.url_rule.rule if request.url_rule else request.path}")
+
+        if request.path.startswith("/v1/"):
+            store.count("api")
+
+            if store.latency:
+                time.sleep(store.latency)
+
+    @app.route('/')
+    def index():  # type: ignore
+        return jsonify({
+            "routes": [
+                "/v1/uploads",
+                "/v1/uploads/{id}",
+                "/v1/uploads/bulk",
+                "/v1/uploads/bulk/complete",
+                "/v1/uploads/{id}/chunks/{number}/request",
+                "/v1/uploads/{id}/chunks/{number}/confirm",
+                "/v1/uploads/{id}/abort",
+                "/v1/uploads/{id}/complete",
+                "/v1/uploads/{id}/unpack",
+                "/v1/uploads/{id}/patch",
+                "/v1/uploads/signature",
+                "/s3/{id}",
+                "/s3/{id}/{number}",
+                "/stats",
+            ]
+        })
+
+    @app.route('/stats')
+    def get_stats():  # type: ignore
+        return jsonify(dict(store.counters))
+
+    @app.route('/v1/uploads', methods=["POST"])
+    def create_upload():  # type: ignore
+        body = request.get_json()
+
+        return jsonify(store.create(
+            name=body["name"],
+            size=body["size"],
+            encrypted=body.get("encrypted", False),
+            preferred_chunk_size=body.get("preferredChunkSize"),
+            compression=body.get("compression"),
+        ))
+
+    @app.route('/v1/uploads/bulk', methods=["POST"])
+    def create_bulk_uploads():  # type: ignore
+        uploads: List[Dict[str, Any]] = []
+
+        for body in request.get_json()["uploads"]:
+            upload = store.create(
+                name=body["name"],
+                size=body["size"],
+                encrypted=body.get("encrypted", False),
+                preferred_chunk_size=body.get("preferredChunkSize"),
+                compression=body.get("compression"),
+            )
+
+            uploads.append({
+                **upload,
+                "chunks": [
+                    {
+                        **chunk,
+                        "request": presigned_request(upload["id"], chunk["number"]),
+                    }
+                    for chunk in upload["chunks"]
+                ],
+            })
+
+        return jsonify({
+            "uploads": uploads,
+        })
+
+    @app.route('/v1/uploads/bulk/complete', methods=["POST"])
+    def complete_bulk_uploads():  # type: ignore
+        bodies = request.get_json()["uploads"]
+
+        for body in bodies:
+            upload, response = find_upload(body["id"])
+            if response:
+                return response
+
+            for chunk_body in body["chunks"]:
+                chunk, response = find_chunk(upload, chunk_body["number"])
+                if response:
+                    return response
+
+                if store.etags[upload["id"]].get(chunk["number"]) != chunk_body["hash"]:
+                    return error(400, "UPLOAD_CHUNK_HASH_MISMATCH", f"{upload['name']}: chunk {chunk['number']} hash does not match")
+
+                chunk["completed"] = True
+
+            missing = [
+                chunk["number"]
+                for chunk in upload["chunks"]
+                if not chunk["completed"]
+            ]
+
+            if missing:
+                return error(400, "UPLOAD_NOT_COMPLETED", f"{upload['name']}: chunks not completed: {missing}")
+
+        uploads: List[Dict[str, Any]] = []
+        for body in bodies:
+            upload = store.uploads[body["id"]]
+            upload["status"] = "SUCCEEDED"
+
+            content = store.read(upload["id"])
+            if content is not None:
+                store.hashes[hashlib.sha256(content).hexdigest()] = upload["id"]
+
+            uploads.append(upload)
+
+        return jsonify({
+            "uploads": uploads,
+        })
+
+    @app.route('/v1/uploads/<id>', methods=["GET"])
+    def get_upload(id: str):  # type: ignore
+        upload, response = find_upload(id)
+        return response or jsonify(upload)
+
+    @app.route('/v1/uploads/<id>', methods=["DELETE"])
+    def delete_upload(id: str):  # type: ignore
+        upload, response = find_upload(id)
+        if response:
+            return response
+
+        store.uploads.pop(upload["id"], None)
+        store.etags.pop(upload["id"], None)
+        store.contents.pop(upload["id"], None)
+
+        return "", 204
+
+    @app.route('/v1/uploads/<id>/chunks/<int:number>/request')
+    def get_upload_chunk_request(id: str, number: int):  # type: ignore
+        upload, response = find_upload(id)
+        if response:
+            return response
+
+        _, response = find_chunk(upload, number)
+        if response:
+            return response
+
+        return jsonify(presigned_request(id, number))
+
+    @app.route('/v1/uploads/<id>/chunks/<int:number>/confirm', methods=["POST"])
+    def confirm_upload_chunk(id: str, number: int):  # type: ignore
+        upload, response = find_upload(id)
+        if response:
+            return response
+
+        chunk, response = find_chunk(upload, number)
+        if response:
+            return response
+
+        hash = request.get_json()["hash"]
+        if store.etags[id].get(number) != hash:
+            return error(400, "UPLOAD_CHUNK_HASH_MISMATCH", f"chunk {number} hash does not match")
+
+        chunk["completed"] = True
+        upload["status"] = "IN_PROGRESS"
+
+        return jsonify(chunk)
+
+    @app.route('/v1/uploads/<id>/abort', methods=["POST"])
+    def abort_upload(id: str):  # type: ignore
+        upload, response = find_upload(id)
+        if response:
+            return response
+
+        upload["status"] = "FAILED"
+        upload["statusMessage"] = "aborted"
+
+        return jsonify(upload)
+
+    @app.route('/v1/uploads/<id>/complete', methods=["POST"])
+    def complete_upload(id: str):  # type: ignore
+        upload, response = find_upload(id)
+        if response:
+            return response
+
+        missing = [
+            chunk["number"]
+            for chunk in upload["chunks"]
+            if not chunk["completed"]
+        ]
+
+        if missing:
+            return error(400, "UPLOAD_NOT_COMPLETED", f"chunks not completed: {missing}")
+
+        upload["status"] = "SUCCEEDED"
+
+        content = store.read(id)
+        if content is not None:
+            store.hashes[hashlib.sha256(content).hexdigest()] = id
+
+        return jsonify(upload)
+
+    @app.route('/v1/uploads/signature')
+    def get_upload_signature():  # type: ignore
+        from crunch.delta import compute_signature
+
+        hash = request.args["hash"]
+        block_size = int(request.args["blockSize"])
+
+        content = store.find_content_by_hash(hash)
+        if content is None:
+            return error(404, "UPLOAD_NOT_FOUND", f"no upload with hash {hash}")
+
+        return jsonify(compute_signature(BytesIO(content), block_size).to_dict())
+
+    @app.route('/v1/uploads/<id>/patch', methods=["POST"])
+    def patch_upload(id: str):  # type: ignore
+        from crunch.delta import apply_recipe
+
+        upload, response = find_upload(id)
+        if response:
+            return response
+
+        payload = store.read(id)
+        if upload["status"] != "SUCCEEDED" or payload is None:
+            return error(400, "UPLOAD_NOT_COMPLETED", "only a completed upload can be used as a patch")
+
+        body = request.get_json()
+
+        base = store.find_content_by_hash(body["baseHash"])
+        if base is None:
+            return error(404, "UPLOAD_NOT_FOUND", f"no upload with hash {body['baseHash']}")
+
+        output = BytesIO()
+        try:
+            apply_recipe(BytesIO(base), BytesIO(payload), body["recipe"], output)
+        except EOFError as exception:
+            return error(400, "INVALID_PATCH_RECIPE", str(exception))
+
+        content = output.getvalue()
+        if len(content) != body["recipe"]["size"]:
+            return error(400, "INVALID_PATCH_RECIPE", f"expected {body['recipe']['size']} bytes, got {len(content)}")
+
+        return jsonify(store.create_completed(
+            name=body["name"],
+            content=content,
+        ))
+
+    @app.route('/v1/uploads/<id>/unpack', methods=["POST"])
+    def unpack_upload(id: str):  # type: ignore
+        upload, response = find_upload(id)
+        if response:
+            return response
+
+        if upload["status"] != "SUCCEEDED":
+            return error(400, "UPLOAD_NOT_COMPLETED", "only a completed upload can be unpacked")
+
+        content = store.read(id)
+        if content is None:
+            return error(400, "UPLOAD_CONTENT_NOT_AVAILABLE", "start the server with content keeping enabled")
+
+        body = request.get_json()
+        if body.get("format") != "TAR":
+            return error(400, "UNSUPPORTED_PACK_FORMAT", f"unsupported format: {body.get('format')}")
+
+        expanded: Dict[str, Any] = {}
+        for file in body["files"]:
+            offset, size = file["offset"], file["size"]
+            if offset < 0 or offset + size > len(content):
+                return error(400, "INVALID_PACK_INDEX", f"{file['name']}: out of bounds")
+
+            expanded[file["name"]] = store.create_completed(
+                name=file["name"],
+                content=content[offset:offset + size],
+            )
+
+        return jsonify(expanded)
+
+    @app.route('/s3/<id>', methods=["GET"])
+    def get_object(id: str):  # type: ignore
+        content = store.read(id)
+        if content is None:
+            return "NoSuchKey", 404
+
+        headers: Dict[str, str] = {}
+
+        # like the real bucket, the codec of a compressed upload is returned as object metadata
+        compression = store.uploads[id]["compression"]
+        if compression:
+            headers[COMPRESSION_METADATA_HEADER] = compression
+
+        return content, 200, headers
+
+    @app.route('/s3/<id>/<int:number>', methods=["PUT"])
+    def put_object(id: str, number: int):  # type: ignore
+        upload = store.uploads.get(id)
+        if upload is None:
+            return "NoSuchUpload", 404
+
+        if store.should_fail():
+            store.count("failures")
+            return "SlowDown", 503
+
+        digest = hashlib.md5()
+        received = 0
+        blocks: List[bytes] = []
+        start = time.monotonic()
+
+        while True:
+            block = request.stream.read(READ_BLOCK_SIZE)
+            if not block:
+                break
+
+            digest.update(block)
+            received += len(block)
+
+            if store.keep_content:
+                blocks.append(block)
+
+            if store.bandwidth:
+                ahead = received / store.bandwidth - (time.monotonic() - start)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+        store.count("bytes", received)
+
+        etag = f'"{digest.hexdigest()}"'
+        store.etags[id][number] = etag
+
+        if store.keep_content:
+            store.contents[id][number] = b"".join(blocks)
+
+        return "", 200, {
+            "ETag": etag,
+        }
+
+    return app
+
+
+def run_fake_server(
+    *,
+    port: int,
+    latency: float = 0,
+    bandwidth: Optional[float] = None,
+    failure_rate: float = 0,
+    keep_content: bool = False,
+):
+    app = create_fake_server_app(FakeUploadStore(
+        latency=latency,
+        bandwidth=bandwidth,
+        failure_rate=failure_rate,
+        keep_content=keep_content,
+    ))
+
+    app.run(
+        port=port,
+        threaded=True,
+    )
+
+
+@contextmanager
+def start_fake_server(
+    store: FakeUploadStore,
+) -> Iterator[str]:
+    """
+    Run the fake server in a background thread, on a random port.
+
+    Yields:
+        The base url of the server.
+    """
+
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class QuietRequestHandler(WSGIRequestHandler):
+
+        def log_request(self, *args: Any, **kwargs: Any):
+            pass
+
+    server = make_server(
+        "127.0.0.1",
+        0,
+        create_fake_server_app(store),
+        threaded=True,
+        request_handler=QuietRequestHandler,
+    )
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/"
+    finally:
+        server.shutdown()
+        thread.join()
+
+
+def _write_random_file(
+    path: str,
+    size: int,
+):
+    with open(path, "wb") as fd:
+        while size > 0:
+            block = os.urandom(min(size, 1024 * 1024))
+            fd.write(block)
+
+            size -= len(block)
+
+
+class _PeakMemorySampler:
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.peak = 0
+
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+
+    def __enter__(self):
+        from crunch.utils import get_process_memory
+
+        self.baseline = get_process_memory()
+        self.peak = self.baseline
+        self._thread.start()
+
+        return self
+
+    def __exit__(self, *args: Any):
+        self._stop_event.set()
+        self._thread.join()
+
+    @property
+    def increase(self):
+        return self.peak - self.baseline
+
+    def _loop(self):
+        from crunch.utils import get_process_memory
+
+        while not self._stop_event.wait(self.interval):
+            self.peak = max(self.peak, get_process_memory())
+
+
+def run_benchmark(
+    *,
+    sizes: List[int],
+    latency: float = 0,
+    bandwidth: Optional[float] = None,
+    failure_rate: float = 0,
+    encrypted: bool = True,
+    print: Any = print,
+):
+    """
+    Measure the throughput, the number of api calls per GB and the memory increase of the upload paths.
+    """
+
+    import requests
+
+    from crunch.api import Client
+    from crunch.api._auth import NoneAuth
+    from crunch.external.humanfriendly import format_size
+
+    public_key_pem = None
+    if encrypted:
+        from crunch_encrypt.ecies import generate_keypair_pem
+
+        _, public_key_pem = generate_keypair_pem()
+
+    store = FakeUploadStore(
+        latency=latency,
+        bandwidth=bandwidth,
+        failure_rate=failure_rate,
+    )
+
+    with start_fake_server(store) as base_url, tempfile.TemporaryDirectory() as directory_path:
+        client = Client(base_url, base_url, NoneAuth(), show_progress=False)
+
+        def send_from_file(path: str, size: int):
+            client.uploads.send_from_file(path=path, name="file", size=size)
+
+        def send_from_io(path: str, size: int):
+            with open(path, "rb") as fd:
+                client.uploads.send_from_io(io=fd, name="file", size=size, public_key_pem=None)
+
+        def send_from_io_encrypted(path: str, size: int):
+            with open(path, "rb") as fd:
+                client.uploads.send_from_io(io=fd, name="file", size=size, public_key_pem=public_key_pem)
+
+        scenarios = [
+            ("send_from_file", send_from_file),
+            ("send_from_io", send_from_io),
+        ]
+
+        if encrypted:
+            scenarios.append(("send_from_io encrypted", send_from_io_encrypted))
+
+        print(f"{'scenario':<24} {'size':>10} {'seconds':>8} {'throughput':>12} {'api calls':>9} {'calls/GB':>9} {'memory':>10}")
+
+        for size in sizes:
+            path = os.path.join(directory_path, f"{size}.bin")
+            _write_random_file(path, size)
+
+            for name, scenario in scenarios:
+                before = requests.get(f"{base_url}stats").json()
+
+                with _PeakMemorySampler() as memory:
+                    start = time.monotonic()
+
+                    try:
+                        scenario(path, size)
+                        status = ""
+                    except Exception as exception:
+                        status = f" failed: {exception.__class__.__name__}"
+
+                    elapsed = time.monotonic() - start
+
+                after = requests.get(f"{base_url}stats").json()
+
+                api_calls = after.get("api", 0) - before.get("api", 0)
+                calls_per_gb = api_calls * 1e9 / size if size else 0
+
+                print(f"{name:<24} {format_size(size):>10} {elapsed:>8.2f} {format_size(int(size / elapsed)) + '/s':>12} {api_calls:>9} {calls_per_gb:>9.0f} {format_size(memory.increase):>10}{status}")
+
+            os.unlink(path)
@@ -23,15 +23,29 @@ def parse(path, base_path=None):
     if base_path is None:
         base_path = os.path.dirname(path) or os.path.dirname(os.path.abspath(path))
 
-    rules = []
     with open(path) as ignore_file:
-        for line in ignore_file:
-            line = line.rstrip("\r\n")
-            rule = _rule_from_pattern(line)
-            if rule:
-                rules.append(rule)
+        return compile_rules(ignore_file, base_path).match
+
+
+def compile_rules(lines, base_path):
+    """Compiles ignore rules into a few combined regular expressions.
+
+    Args:
+        lines (Iterable[str]): Lines of a `.gitignore` file.
+        base_path (str): Base path for applying ignore rules.
+
+    Returns:
+        _CompiledIgnoreRules: Rules with a `match(path, is_dir=None)` method.
+    """
+
+    rules = []
+    for line in lines:
+        line = line.rstrip("\r\n")
+        rule = _rule_from_pattern(line)
+        if rule:
+            rules.append(rule)
 
-    return _IgnoreRules(rules, base_path).match
+    return _CompiledIgnoreRules(rules, base_path)
 
 
 def ignore(ignore_names=DEFAULT_IGNORE_NAMES):
@@ -89,7 +103,9 @@ class Cache:
             is_dir (bool, optional): Set if you know whether the specified path is a directory.
         """
 
-        path = _Path(path)
+        if isinstance(path, str):
+            path = _Path(path)
+
         add_to_children = {}
         plain_paths = []
         for parent in path.parents():
@@ -256,7 +272,7 @@ def _rule_from_pattern(pattern):
         i -= 1
 
     regexp = _fnmatch_pathname_to_regexp(pattern, anchored, directory_only)
-    return _IgnoreRule(regexp, negation, directory_only)
+    return _IgnoreRule(regexp, negation, directory_only, pattern=pattern, anchored=anchored)
 
 
 class _IgnoreRules:
@@ -291,11 +307,208 @@ class _IgnoreRules:
             return False
 
 
+class _CompiledIgnoreRules:
+    # Consecutive rules with the same negation are merged into a `_RuleGroup`.
+    # The last matching rule wins, so the groups are tested from the last one.
+    # Most paths are not ignored at all: a single group with every non-negated rule answers them first.
+    # Matches of directories are cached, they are tested again for each of their files by the callers.
+
+    def __init__(self, rules, base_path):
+        self.__any_ignore = _RuleGroup(False)
+
+        groups = []
+        for rule in rules:
+            if not groups or groups[-1].negation != rule.negation:
+                groups.append(_RuleGroup(rule.negation))
+
+            groups[-1].add(rule)
+
+            if not rule.negation:
+                self.__any_ignore.add(rule)
+
+        for group in groups:
+            group.compile()
+
+        self.__any_ignore.compile()
+
+        # without negation, the first group is the same as the one with every rule
+        self.__groups = groups[::-1] if len(groups) > 1 else []
+        self.__base_path = _Path(base_path) if isinstance(base_path, str) else base_path
+        self.__directory_cache = {}
+
+    def match(self, path, is_dir=None):
+        if isinstance(path, str):
+            path = _Path(path)
+
+        rel_path = path.relpath(self.__base_path)
+        if rel_path is None:
+            return False
+
+        if is_dir is None:
+            is_dir = path.isdir()
+
+        if is_dir:
+            matched = self.__directory_cache.get(rel_path)
+            if matched is None:
+                matched = self.__directory_cache[rel_path] = self.__match(rel_path, True)
+
+            return matched
+
+        return self.__match(rel_path, False)
+
+    def __match(self, rel_path, is_dir):
+        path = _SplitPath(rel_path, is_dir)
+
+        if not self.__any_ignore.match(path):
+            return False
+
+        if not self.__groups:
+            return True
+
+        for group in self.__groups:
+            if group.match(path):
+                return not group.negation
+
+        return False
+
+
+class _SplitPath:
+    # Components and prefixes of a relative path, computed at most once for all the groups.
+    # The `directory_*` variants only contain the parts which are known to be directories.
+
+    def __init__(self, rel_path, is_dir):
+        self.rel_path = rel_path
+        self.is_dir = is_dir
+
+        self.components = rel_path.split("/")
+        self.directory_components = self.components if is_dir else self.components[:-1]
+
+        self.__prefixes = None
+
+    @property
+    def prefixes(self):
+        if self.__prefixes is None:
+            self.__prefixes = []
+
+            end = -1
+            for component in self.components:
+                end += len(component) + 1
+                self.__prefixes.append(self.rel_path[:end])
+
+        return self.__prefixes
+
+    @property
+    def directory_prefixes(self):
+        return self.prefixes if self.is_dir else self.prefixes[:-1]
+
+    @property
+    def component_starts(self):
+        return [len(prefix) - len(component) for prefix, component in zip(self.prefixes, self.components)]
+
+
+class _RuleGroup:
+    # Rules are sorted by shape, most of them do not need a regular expression:
+    # - `name` matches any component, looked up in a set,
+    # - `*.ext` matches the end of any component, tested with a single `str.endswith()`,
+    # - `/path/to/name` matches a prefix of the path, looked up in a set,
+    # - anything else is merged into combined regular expressions.
+    # Rules not anchored to the base path are only tried at the start of each component, instead of backtracking over `.+/`.
+    # Directory-only rules have a variant for files, which only matches if the file is inside the directory.
+
+    def __init__(self, negation):
+        self.negation = negation
+
+        self.__names = set()
+        self.__directory_names = set()
+        self.__suffixes = []
+        self.__directory_suffixes = []
+        self.__prefixes = set()
+        self.__directory_prefixes = set()
+        self.__patterns = {}
+        self.__matchers = {}
+
+    def add(self, rule):
+        pattern = rule.pattern
+
+        if pattern and not _GLOB_CHARACTERS.search(pattern):
+            if rule.anchored:
+                (self.__directory_prefixes if rule.directory_only else self.__prefixes).add(pattern)
+                return
+
+            elif "/" not in pattern:
+                (self.__directory_names if rule.directory_only else self.__names).add(pattern)
+                return
+
+        if pattern and pattern.startswith("*") and not rule.anchored and not _GLOB_CHARACTERS.search(pattern[1:]) and "/" not in pattern:
+            (self.__directory_suffixes if rule.directory_only else self.__suffixes).append(pattern[1:])
+            return
+
+        regexp = rule.regexp.pattern.replace("(.+/)?", "(?:.+/)?")
+
+        anchored = not regexp.startswith(_UNANCHORED_PREFIX)
+        if not anchored:
+            regexp = regexp[len(_UNANCHORED_PREFIX):]
+
+        if rule.directory_only:
+            assert regexp.endswith(_DIRECTORY_ONLY_SUFFIX)
+            regexp = regexp[: -len(_DIRECTORY_ONLY_SUFFIX)]
+
+            file_regexp = f"{regexp}/.+$"
+            directory_regexp = f"{regexp}(?:/.+)?$"
+
+        else:
+            file_regexp = directory_regexp = regexp
+
+        self.__patterns.setdefault((anchored, False), []).append(file_regexp)
+        self.__patterns.setdefault((anchored, True), []).append(directory_regexp)
+
+    def compile(self):
+        self.__suffixes = tuple(self.__suffixes)
+        self.__directory_suffixes = tuple(self.__directory_suffixes)
+
+        self.__matchers = {
+            key: re.compile("|".join(f"(?:{regexp})" for regexp in regexps)).match
+            for key, regexps in self.__patterns.items()
+        }
+
+    def match(self, path):
+        if self.__names and not self.__names.isdisjoint(path.components):
+            return True
+
+        if self.__directory_names and not self.__directory_names.isdisjoint(path.directory_components):
+            return True
+
+        if self.__suffixes and any(component.endswith(self.__suffixes) for component in path.components):
+            return True
+
+        if self.__directory_suffixes and any(component.endswith(self.__directory_suffixes) for component in path.directory_components):
+            return True
+
+        if self.__prefixes and not self.__prefixes.isdisjoint(path.prefixes):
+            return True
+
+        if self.__directory_prefixes and not self.__directory_prefixes.isdisjoint(path.directory_prefixes):
+            return True
+
+        anchored_match = self.__matchers.get((True, path.is_dir))
+        if anchored_match is not None and anchored_match(path.rel_path):
+            return True
+
+        unanchored_match = self.__matchers.get((False, path.is_dir))
+        if unanchored_match is not None:
+            rel_path = path.rel_path
+            return any(unanchored_match(rel_path, start) for start in path.component_starts)
+
+        return False
+
+
 class _IgnoreRule:
-    def __init__(self, regexp, negation, directory_only):
+    def __init__(self, regexp, negation, directory_only, pattern=None, anchored=None):
         self.__regexp = re.compile(regexp)
         self.__negation = negation
         self.__directory_only = directory_only
+        self.__pattern = pattern
+        self.__anchored = anchored
         self.__match = self.__regexp.match
 
     @property
@@ -306,6 +519,18 @@ class _IgnoreRule:
     def negation(self):
         return self.__negation
 
+    @property
+    def directory_only(self):
+        return self.__directory_only
+
+    @property
+    def pattern(self):
+        return self.__pattern
+
+    @property
+    def anchored(self):
+        return self.__anchored
+
     def match(self, rel_path, is_dir):
         m = self.__match(rel_path)
 
@@ -324,6 +549,11 @@ else:
     def _path_split(path): return path.split(os.sep)
 
 
+_UNANCHORED_PREFIX = "(?:^|.+/)"
+_GLOB_CHARACTERS = re.compile(r"[*?\[\\]")
+_DIRECTORY_ONLY_SUFFIX = "(/.+)?$"
+
+
 def _fnmatch_pathname_to_regexp(pattern, anchored, directory_only):
     # Implements `fnmatch` style-behavior, as though with `FNM_PATHNAME` flagged;
     # the path separator will not match shell-style `*` and `.` wildcards.
@@ -0,0 +1,256 @@
+"""
+Index of the workspace files, in the spirit of the git index.
+
+The content hash of each file is remembered with its stat data (size, modification time and inode).
+A file with the same stat data is not read again to know its hash.
+
+The hash of the compressed uploads is remembered by content hash and codec, a file is not compressed again to know whether it changed.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from crunch.compression import Codec
+from crunch.utils import atomic_write, hash_file
+
+"""
+Files modified that close to the last save could be modified again without their modification time changing, their hash is not trusted.
+"""
+RACY_WINDOW_NS = 2 * 1_000_000_000
+
+
+@dataclass(frozen=True)
+class IndexEntry:
+
+    size: int
+    mtime_ns: int
+    inode: int
+    hash: str
+
+    def matches(
+        self,
+        stat: os.stat_result,
+    ) -> bool:
+        return (
+            self.size == stat.st_size
+            and self.mtime_ns == stat.st_mtime_ns
+            and self.inode == stat.st_ino
+        )
+
+
+class WorkspaceIndex:
+    """
+    Entries are keyed by their path relative to `root_path`.
+    Only the entries used since the load are saved, the index follows the listed files instead of growing forever.
+    """
+
+    def __init__(
+        self,
+        root_path: str,
+        path: str,
+    ):
+        self.root_path = root_path
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, IndexEntry] = {}
+        self._used: Dict[str, IndexEntry] = {}
+        self._compressed_hashes: Dict[str, str] = {}
+        self._used_compressed_hashes: Dict[str, str] = {}
+        self._staged: Dict[str, Tuple[os.stat_result, Optional[Codec], Optional[str]]] = {}
+        self._saved_at_ns = 0
+
+        self._load()
+
+    def get_hash(
+        self,
+        path: str,
+        stat: Optional[os.stat_result] = None,
+    ) -> Optional[str]:
+        if stat is None:
+            stat = os.stat(path)
+
+        key = self._make_key(path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry.matches(stat) or entry.mtime_ns >= self._saved_at_ns - RACY_WINDOW_NS:
+                return None
+
+            self._used[key] = entry
+            return entry.hash
+
+    def hash_file(
+        self,
+        path: str,
+    ) -> str:
+        stat = os.stat(path)
+
+        hash = self.get_hash(path, stat)
+        if hash is not None:
+            return hash
+
+        hash = hash_file(path)
+
+        # the file could have been modified while being read
+        if _is_same_file(stat, os.stat(path)):
+            self.record(path, stat, hash)
+
+        return hash
+
+    def get_compressed_hash(
+        self,
+        hash: str,
+        codec: Codec,
+    ) -> Optional[str]:
+        """
+        Hash reported by the server for the last upload of this content compressed with `codec`.
+        """
+
+        key = _make_compressed_key(hash, codec)
+
+        with self._lock:
+            compressed_hash = self._compressed_hashes.get(key)
+            if compressed_hash is not None:
+                self._used_compressed_hashes[key] = compressed_hash
+
+            return compressed_hash
+
+    def record(
+        self,
+        path: str,
+        stat: os.stat_result,
+        hash: str,
+    ):
+        key = self._make_key(path)
+        entry = IndexEntry(
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            inode=stat.st_ino,
+            hash=hash,
+        )
+
+        with self._lock:
+            self._entries[key] = entry
+            self._used[key] = entry
+
+    def stage(
+        self,
+        path: str,
+        compression: Optional[Codec] = None,
+    ):
+        """
+        Remember the stat data of a file before its upload, its hash is only known once the push succeeded.
+        With a `compression`, the server reports the hash of the compressed content, the file is hashed now to be matched later.
+        """
+
+        stat = os.stat(path)
+
+        hash = None
+        if compression is not None:
+            hash = self.hash_file(path)
+
+        with self._lock:
+            self._staged[self._make_key(path)] = (stat, compression, hash)
+
+    def commit(
+        self,
+        hashes: Dict[str, str],
+    ):
+        """
+        Record the staged files with the hashes reported by the server, keyed by their path relative to `root_path`.
+        """
+
+        with self._lock:
+            staged = self._staged
+            self._staged = {}
+
+        for key, (stat, compression, plain_hash) in staged.items():
+            hash = hashes.get(key)
+            if hash is None:
+                continue
+
+            path = os.path.join(self.root_path, key)
+
+            try:
+                modified = not _is_same_file(stat, os.stat(path))
+            except FileNotFoundError:
+                modified = True
+
+            if modified:
+                continue
+
+            if compression is None or plain_hash is None:
+                self.record(path, stat, hash)
+                continue
+
+            self.record(path, stat, plain_hash)
+
+            compressed_key = _make_compressed_key(plain_hash, compression)
+            with self._lock:
+                self._compressed_hashes[compressed_key] = hash
+                self._used_compressed_hashes[compressed_key] = hash
+
+    def save(self):
+        with self._lock:
+            entries = dict(self._used)
+            compressed_hashes = dict(self._used_compressed_hashes)
+
+        now_ns = time.time_ns()
+
+        with atomic_write(self.path) as fd:
+            json.dump({
+                "version": 1,
+                "savedAtNs": now_ns,
+                "entries": {
+                    key: [entry.size, entry.mtime_ns, entry.inode, entry.hash]
+                    for key, entry in entries.items()
+                },
+                "compressedHashes": compressed_hashes,
+            }, fd)
+
+    def _load(self):
+        try:
+            with open(self.path) as fd:
+                root = json.load(fd)
+
+            if root.get("version") != 1:
+                return
+
+            self._saved_at_ns = int(root["savedAtNs"])
+            self._entries = {
+                key: IndexEntry(size, mtime_ns, inode, hash)
+                for key, (size, mtime_ns, inode, hash) in root["entries"].items()
+            }
+            self._compressed_hashes = dict(root.get("compressedHashes", {}))
+        except (FileNotFoundError, ValueError, KeyError, TypeError, AttributeError):
+            self._entries = {}
+            self._compressed_hashes = {}
+
+    def _make_key(
+        self,
+        path: str,
+    ) -> str:
+        return os.path.relpath(path, self.root_path).replace("\\", "/")
+
+
+def _is_same_file(
+    before: os.stat_result,
+    after: os.stat_result,
+) -> bool:
+    return (
+        before.st_size == after.st_size
+        and before.st_mtime_ns == after.st_mtime_ns
+        and before.st_ino == after.st_ino
+    )
+
+
+def _make_compressed_key(
+    hash: str,
+    codec: Codec,
+) -> str:
+    return f"{codec.name}:{hash}"
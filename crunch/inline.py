@@ -69,6 +69,8 @@ class _Inline:
     @cached_property
     def _competition(self) -> Competition:
         _, project = Client.from_project()
+
+        # the project is shared by the whole process, it could have been fetched long ago
         competition = project.competition.reload()  # pyright: ignore[reportUnknownMemberType]
 
         return competition
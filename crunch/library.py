@@ -1,28 +1,349 @@
+import hashlib
+import json
 import logging
 import os
+import re
+import sys
+import time
 import warnings
 from collections import defaultdict
 from types import ModuleType
-from typing import Any, Dict, List, NamedTuple, Optional, Set, overload
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, overload
 
 from crunch_convert import RequirementLanguage
 from crunch_convert.notebook import BadCellHandling, extract_from_cells
-from crunch_convert.requirements_txt import CachedWhitelist, CrunchHubWhitelist, MultipleLibraryAliasCandidateException, Whitelist, parse_from_file
+from crunch_convert.requirements_txt import CachedWhitelist, CrunchHubWhitelist, Library, LocalWhitelist, MultipleLibraryAliasCandidateException, VersionFinder, Whitelist, parse_from_file
 
 import crunch.store as store
-from crunch.api import Client
+from crunch.api import ApiException, Client
 from crunch.constants import REQUIREMENTS_R_TXT, REQUIREMENTS_TXT
-from crunch.utils import try_get_competition_name
+from crunch.utils import atomic_write, get_user_cache_directory, try_get_competition_name
 
 __all__ = [
     "extract_from_requirements",
     "extract_from_notebook_modules",
     "find_problematic",
     "scan",
+    "SnapshotWhitelist",
+    "CachedSitePackageVersionFinder",
     "find_forbidden",  # deprecated
 ]
 
 
+"""
+Below this number of distinct lookups for a language, the libraries are looked up one by one.
+Listing the whole whitelist costs about twenty pages, far more than a few-line requirements file.
+"""
+SNAPSHOT_MIN_LOOKUP_COUNT = 50
+
+"""
+How long a listing persisted in the user cache directory is used, in seconds.
+"""
+SNAPSHOT_TTL = 6 * 60 * 60
+
+
+class SnapshotWhitelist(Whitelist):
+    """
+    Whitelist answering from a listing of every library of a language, persisted in the user cache directory.
+
+    Without a fresh persisted listing, the first lookups are delegated to `fallback` one by one.
+    Only once enough libraries are looked up, the whole whitelist is listed at once, instead of one request per entry.
+    Callers knowing every name up front should `prefetch(...)` them, to list it before the first lookup.
+
+    A library missing from a listing is looked up again, it could have been whitelisted since.
+    """
+
+    def __init__(
+        self,
+        client: Optional[Client] = None,
+        fallback: Optional[Whitelist] = None,
+        *,
+        min_lookup_count: int = SNAPSHOT_MIN_LOOKUP_COUNT,
+        ttl: float = SNAPSHOT_TTL,
+        cache_directory_path: Optional[str] = None,
+    ):
+        super().__init__()
+
+        self._client = client
+        self._fallback = fallback
+        self._min_lookup_count = min_lookup_count
+        self._ttl = ttl
+        self._cache_directory_path = cache_directory_path
+
+        self._snapshots: Dict[RequirementLanguage, Optional[LocalWhitelist]] = {}
+        self._lookups: Dict[RequirementLanguage, Set[Tuple[Optional[str], Optional[str]]]] = defaultdict(set)
+
+    def find_library(  # type: ignore
+        self,
+        *,
+        language: RequirementLanguage = RequirementLanguage.PYTHON,
+        name: Optional[str] = None,
+        alias: Optional[str] = None,
+    ) -> Optional[Library]:
+        snapshot = self._record_lookups(language, [(name, alias)])
+        if snapshot is not None:
+            library = snapshot.find_library(language=language, name=name, alias=alias)  # type: ignore
+            if library is not None:
+                return library
+
+        return self._get_fallback().find_library(language=language, name=name, alias=alias)  # type: ignore
+
+    def prefetch(
+        self,
+        *,
+        language: RequirementLanguage = RequirementLanguage.PYTHON,
+        names: Iterable[str] = (),
+        aliases: Iterable[str] = (),
+    ) -> None:
+        """
+        Records the lookups that are about to be made.
+        If they are enough, the whole whitelist is listed now, instead of one request per lookup until the threshold is reached.
+        """
+
+        lookups = [(name, None) for name in names]
+        lookups.extend((None, alias) for alias in aliases)
+
+        self._record_lookups(language, lookups)
+
+    def _record_lookups(
+        self,
+        language: RequirementLanguage,
+        lookups: List[Tuple[Optional[str], Optional[str]]],
+    ) -> Optional[LocalWhitelist]:
+        recorded = self._lookups[language]
+        recorded.update(lookups)
+
+        return self._get_snapshot(language, list_if_missing=len(recorded) >= self._min_lookup_count)
+
+    def _get_fallback(self) -> Whitelist:
+        if self._fallback is None:
+            self._fallback = CachedWhitelist(CrunchHubWhitelist(
+                api_base_url=store.api_base_url,
+            ))
+
+        return self._fallback
+
+    def _get_snapshot(
+        self,
+        language: RequirementLanguage,
+        list_if_missing: bool,
+    ) -> Optional[LocalWhitelist]:
+        if language in self._snapshots:
+            return self._snapshots[language]
+
+        if self._client is None:
+            self._client = Client.from_env()
+
+        cache_file_path = self._get_cache_file_path(language)
+
+        libraries = self._read(cache_file_path)
+        if libraries is None:
+            if not list_if_missing:
+                return None
+
+            libraries = self._list(language)
+            if libraries is not None:
+                self._write(cache_file_path, libraries)
+
+        snapshot: Optional[LocalWhitelist] = None
+        if libraries is not None:
+            snapshot = LocalWhitelist([
+                Library(
+                    language=language,
+                    name=library["name"],
+                    aliases=library["aliases"],
+                    standard=library["standard"],
+                    freeze=library["freeze"],
+                )
+                for library in libraries
+            ])
+
+        self._snapshots[language] = snapshot
+        return snapshot
+
+    def _list(
+        self,
+        language: RequirementLanguage,
+    ) -> Optional[List[Dict[str, Any]]]:
+        try:
+            return [
+                {
+                    "name": library.name,
+                    "aliases": list(library.aliases),
+                    "standard": library.standard,
+                    "freeze": library.freeze,
+                }
+                for library in self._client.libraries.list(language=language)  # type: ignore
+            ]
+        except (ApiException, OSError) as exception:
+            logging.getLogger(__name__).debug("whitelist snapshot not available for %s: %s", language.name, exception)
+            return None
+
+    def _get_cache_file_path(
+        self,
+        language: RequirementLanguage,
+    ) -> str:
+        directory_path = self._cache_directory_path or get_user_cache_directory()
+
+        # one file per api, a staging whitelist must not be used in production
+        api_id = hashlib.sha256(self._client.api.base_url.encode("utf-8")).hexdigest()[:16]  # type: ignore
+
+        return os.path.join(directory_path, f"whitelist-{api_id}-{language.name.lower()}.json")
+
+    def _read(
+        self,
+        path: str,
+    ) -> Optional[List[Dict[str, Any]]]:
+        if store.no_cache:
+            return None
+
+        try:
+            with open(path) as fd:
+                root = json.load(fd)
+
+            if time.time() - root["storedAt"] >= self._ttl:
+                return None
+
+            return list(root["libraries"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write(
+        self,
+        path: str,
+        libraries: List[Dict[str, Any]],
+    ):
+        try:
+            with atomic_write(path) as fd:
+                json.dump({
+                    "storedAt": time.time(),
+                    "libraries": libraries,
+                }, fd)
+        except OSError as exception:
+            logging.getLogger(__name__).debug("could not write the whitelist snapshot: %s", exception)
+
+
+_IndexKey = Tuple[Tuple[str, int], ...]
+
+_installed_distributions_by_key: Dict[_IndexKey, Dict[str, str]] = {}
+
+
+def _normalize_distribution_name(name: str) -> str:
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+class CachedSitePackageVersionFinder(VersionFinder):
+    """
+    Same as `LocalSitePackageVersionFinder`, but the installed distributions are scanned once into an index.
+
+    The index is kept in memory and in the user cache directory, keyed by the modification time of the `sys.path` directories.
+    Installing or removing a distribution changes the modification time of its directory, which invalidates the index.
+    """
+
+    def __init__(
+        self,
+        cache_directory_path: Optional[str] = None,
+    ):
+        super().__init__()
+
+        self._cache_directory_path = cache_directory_path
+        self._versions: Optional[Dict[str, str]] = None
+
+    def find_latest(
+        self,
+        *,
+        language: RequirementLanguage = RequirementLanguage.PYTHON,
+        name: str
+    ) -> Optional[str]:
+        if language != RequirementLanguage.PYTHON:
+            return None
+
+        if self._versions is None:
+            self._versions = self._load()
+
+        return self._versions.get(_normalize_distribution_name(name))
+
+    def _load(self) -> Dict[str, str]:
+        key = self._make_key()
+
+        versions = _installed_distributions_by_key.get(key)
+        if versions is not None:
+            return versions
+
+        cache_file_path = self._get_cache_file_path()
+
+        versions = self._read(cache_file_path, key)
+        if versions is None:
+            versions = self._scan()
+            self._write(cache_file_path, key, versions)
+
+        _installed_distributions_by_key[key] = versions
+        return versions
+
+    def _make_key(self) -> _IndexKey:
+        key: List[Tuple[str, int]] = []
+
+        for path in sys.path:
+            try:
+                key.append((path, os.stat(path or ".").st_mtime_ns))
+            except OSError:
+                continue
+
+        return tuple(key)
+
+    def _get_cache_file_path(self) -> str:
+        directory_path = self._cache_directory_path or get_user_cache_directory()
+
+        # one file per environment, switching between them must not evict the others
+        environment_id = hashlib.sha256(f"{sys.prefix}:{sys.executable}".encode("utf-8")).hexdigest()[:16]
+
+        return os.path.join(directory_path, f"installed-distributions-{environment_id}.json")
+
+    def _scan(self) -> Dict[str, str]:
+        from importlib.metadata import distributions  # late import
+
+        versions: Dict[str, str] = {}
+
+        # like importlib.metadata.distribution(), the first one found on the path wins
+        for distribution in distributions():
+            name = distribution.metadata["Name"]
+            if name:
+                versions.setdefault(_normalize_distribution_name(name), distribution.version)
+
+        return versions
+
+    def _read(
+        self,
+        path: str,
+        key: _IndexKey,
+    ) -> Optional[Dict[str, str]]:
+        try:
+            with open(path) as fd:
+                root = json.load(fd)
+
+            if tuple(map(tuple, root["key"])) != key:
+                return None
+
+            return dict(root["versions"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write(
+        self,
+        path: str,
+        key: _IndexKey,
+        versions: Dict[str, str],
+    ):
+        try:
+            with atomic_write(path) as fd:
+                json.dump({
+                    "key": key,
+                    "versions": versions,
+                }, fd)
+        except OSError as exception:
+            logging.getLogger(__name__).debug("could not write the installed distributions index: %s", exception)
+
+
 def extract_from_requirements(
     *,
     language: RequirementLanguage = RequirementLanguage.PYTHON,
@@ -129,15 +450,22 @@ def find_problematic(
 ):
     """
     Finds forbidden libraries by querying the API.
+    The whole whitelist of a language is only listed for many packages, unless a `whitelist` is provided.
     """
 
     if whitelist is None:
-        whitelist = CrunchHubWhitelist(
-            api_base_url=store.api_base_url,
-        )
-    if not isinstance(whitelist, CachedWhitelist):
+        whitelist = SnapshotWhitelist()
+    if not isinstance(whitelist, (CachedWhitelist, SnapshotWhitelist)):
         whitelist = CachedWhitelist(whitelist)
 
+    if isinstance(whitelist, SnapshotWhitelist):
+        for language, names_or_aliases in packages.items():
+            whitelist.prefetch(
+                language=language,
+                names=() if is_alias else names_or_aliases,
+                aliases=names_or_aliases if is_alias else (),
+            )
+
     return {
         language: _find_problematic(
             language=language,
@@ -7,10 +7,13 @@ import stat
 import string
 import subprocess
 import sys
+from dataclasses import dataclass
 from datetime import timedelta
 from multiprocessing import Lock
-from time import sleep
-from typing import Any, Callable, Dict, Generator, Iterable, List, Literal, Optional, Tuple
+from threading import Event, Thread
+from threading import Lock as ThreadLock
+from time import monotonic, sleep
+from typing import Any, Callable, Dict, Generator, Iterable, List, Literal, Optional, Set, Tuple
 from urllib.parse import urljoin
 from uuid import uuid4
 
@@ -18,17 +21,29 @@ import requests
 
 import crunch.store as store
 import requirements as requirements_parser
-from crunch.api import Client, Competition, Language, ModelTooBigException, PhaseType, PredictionTooBigException, RunnerRun, Upload
+from crunch.api import Client, Competition, Language, ModelTooBigException, PhaseType, PredictionTooBigException, RunnerRun, Upload, UploadJournal
+from crunch.compression import Codec
+from crunch.constants import BULK_UPLOAD_MAX_FILE_SIZE, DELTA_MIN_FILE_SIZE, UPLOAD_JOURNAL_FILE
 from crunch.downloader import prepare_all, save_all
 from crunch.runner.runner import Runner
 from crunch.runner.tracing import GpuPresence, RemoteTraceExporter, RunnerTracer, to_execute_span_attributes
 from crunch.runner.types import KwargsLike
 from crunch.runner.unstructured import RunnerContext
 from crunch.unstructured import GithubCodeLoader, LocalCodeLoader, RunnerModule, deduce_code_loader
-from crunch.utils import download
+from crunch.utils import download, hash_file
 
 UploadedFiles = Dict[str, Upload]
-LastModifications = Dict[str, int]
+
+
+@dataclass(frozen=True)
+class FileState:
+
+    size: int
+    modification_time: int
+    hash: str
+
+
+FileStates = Dict[str, FileState]
 
 PACKAGES_WITH_PRIORITY = [
     "torch"
@@ -112,7 +127,10 @@ class CloudRunner(Runner):
         crunch_cli_commit_hash: str,
         # ---
         max_retry: int,
-        retry_seconds: int
+        retry_seconds: int,
+        # ---
+        stream_predictions: bool = False,
+        compression: Optional[Codec] = None,
     ):
         super().__init__(
             competition_format=competition.format,
@@ -153,6 +171,13 @@ class CloudRunner(Runner):
         self.max_retry = max_retry
         self.retry_seconds = retry_seconds
 
+        self.stream_predictions = stream_predictions
+        self.compression = compression
+        self._prediction_streamer: Optional[PredictionStreamer] = None
+
+        # a retry resumes the partial uploads of the previous attempt
+        self.upload_journal = UploadJournal(os.path.join(context_directory, UPLOAD_JOURNAL_FILE))
+
         self._error_reported_fuse = Lock()
 
     def initialize(self):
@@ -225,7 +250,7 @@ class CloudRunner(Runner):
 
             self.has_model = len(model_file_urls) != 0
 
-            self.pre_model_files_modification = _download_files(
+            self.pre_model_files_states = _download_files(
                 file_urls=model_file_urls,
                 directory_path=self.model_directory_path,
                 print=self.log,
@@ -244,15 +269,36 @@ class CloudRunner(Runner):
 
         context = CloudRunnerContext(self)
 
-        with self._span("executing runner script"):
-            self.runner_module.run(
-                context=context,
-                data_directory_path=self.data_directory,
-                model_directory_path=self.model_directory_path,
-                prediction_directory_path=self.prediction_directory_path,
-                tracer=self.tracer,
+        if self.stream_predictions:
+            self._prediction_streamer = PredictionStreamer(
+                directory_path=self.prediction_directory_path,
+                client=self.client,
+                log=self.log,  # type: ignore
+                compression=self.compression,
             )
 
+            self._prediction_streamer.start()
+
+        try:
+            with self._span("executing runner script"):
+                self.runner_module.run(
+                    context=context,
+                    data_directory_path=self.data_directory,
+                    model_directory_path=self.model_directory_path,
+                    prediction_directory_path=self.prediction_directory_path,
+                    tracer=self.tracer,
+                )
+        except BaseException:
+            if self._prediction_streamer is not None:
+                self._delete_uploads({
+                    name: upload
+                    for name, (upload, _) in self._prediction_streamer.stop().items()
+                })
+
+                self._prediction_streamer = None
+
+            raise
+
     def finalize(self):
         with self._span("uploading result"):
             self._upload_results()
@@ -374,6 +420,7 @@ class CloudRunner(Runner):
     def _upload_results(self):
         prediction_uploads: UploadedFiles = {}
         model_uploads: UploadedFiles = {}
+        reused_model_files: Set[str] = set()
 
         # TODO Use decorator instead
         try:
@@ -386,7 +433,7 @@ class CloudRunner(Runner):
 
                 try:
                     self._upload_prediction_files(prediction_uploads)
-                    has_model_changed = self._upload_model_files(model_uploads)
+                    has_model_changed = self._upload_model_files(model_uploads, reused_model_files)
 
                     self.run.submit_result(
                         use_initial_model=not has_model_changed,
@@ -399,6 +446,7 @@ class CloudRunner(Runner):
                             name: upload.id
                             for name, upload in model_uploads.items()
                         },
+                        reused_model_files=sorted(reused_model_files) if has_model_changed else None,
                     )
 
                     self.log("result submitted")
@@ -424,22 +472,40 @@ class CloudRunner(Runner):
     ):
         """
         Uploads the prediction files.
+        Files streamed during the execution are reused if they have not changed since.
         """
 
+        if self._prediction_streamer is not None:
+            streamed = self._prediction_streamer.stop()
+            self._prediction_streamer = None
+
+            stale = _reconcile_streamed_uploads(
+                directory_path=self.prediction_directory_path,
+                streamed=streamed,
+                uploads=uploads,
+                log=self.log,  # type: ignore
+            )
+
+            self._delete_uploads(stale)
+
         _upload_files(
             category="prediction",
             directory_path=self.prediction_directory_path,
             uploads=uploads,
             client=self.client,
             log=self.log,  # type: ignore
+            compression=self.compression,
+            journal=self.upload_journal,
         )
 
     def _upload_model_files(
         self,
         uploads: UploadedFiles,
+        reused: Set[str],
     ):
         """
-        Uploads the models files.
+        Uploads the models files that have changed.
+        Unchanged files are added to `reused` and must be referenced from the initial model.
 
         Returns:
             True if the model files have changed, False otherwise.
@@ -451,7 +517,10 @@ class CloudRunner(Runner):
             uploads=uploads,
             client=self.client,
             log=self.log,  # type: ignore
-            pre_modifications=self.pre_model_files_modification,
+            pre_states=self.pre_model_files_states,
+            reused=reused,
+            compression=self.compression,
+            journal=self.upload_journal,
         )
 
     def _delete_uploads(
@@ -797,8 +866,8 @@ def _download_files(
     file_urls: Dict[str, str],
     directory_path: str,
     print: Callable[[str], Any],
-) -> LastModifications:
-    pre_modifications: LastModifications = {}
+) -> FileStates:
+    states: FileStates = {}
 
     for relative_path, url in file_urls.items():
         path = os.path.join(directory_path, relative_path)
@@ -809,10 +878,42 @@ def _download_files(
             progress_bar=False,
         )
 
+        states[relative_path] = _get_file_state(path)
+
+    return states
+
+
+def _get_file_state(
+    path: str,
+    stat: Optional[os.stat_result] = None,
+) -> FileState:
+    if stat is None:
         stat = os.stat(path)
-        pre_modifications[relative_path] = stat.st_mtime_ns
 
-    return pre_modifications
+    return FileState(
+        size=stat.st_size,
+        modification_time=stat.st_mtime_ns,
+        hash=hash_file(path),
+    )
+
+
+def _is_file_unchanged(
+    path: str,
+    stat: os.stat_result,
+    pre_state: Optional[FileState],
+) -> bool:
+    """
+    Compare a file with its state at download time.
+    The content is only hashed when the size is the same but the modification time is not.
+    """
+
+    if pre_state is None or pre_state.size != stat.st_size:
+        return False
+
+    if pre_state.modification_time == stat.st_mtime_ns:
+        return True
+
+    return pre_state.hash == hash_file(path)
 
 
 def _find_files(
@@ -840,20 +941,31 @@ def _upload_files(
     uploads: UploadedFiles,
     client: Client,
     log: Callable[[str], None],
-    pre_modifications: Optional[LastModifications] = None,
+    pre_states: Optional[FileStates] = None,
+    reused: Optional[Set[str]] = None,
+    compression: Optional[Codec] = None,
+    journal: Optional[UploadJournal] = None,
 ) -> bool:
     """
     Uploads files from the given directory.
     If a files is already uploaded, it will be reused.
 
+    If `pre_states` is provided, only the files whose content changed are uploaded.
+    The names of the unchanged files are added to `reused`.
+
+    If `journal` is provided, a partially uploaded file is resumed instead of uploaded again.
+
+    If a big file was downloaded, only its changed blocks are uploaded when possible.
+    The first delta failure disables them for the remaining files.
+
     Returns:
         True if the files have changed, False otherwise.
-        Always True if `pre_modifications` is None.
+        Always True if `pre_states` is None.
     """
 
     files: List[Tuple[str, str]] = []
     total_size = 0
-    post_modifications: LastModifications = {}
+    unchanged_names: Set[str] = set()
 
     for file_path, file_name in _find_files(directory_path):
         stat = os.stat(file_path)
@@ -861,34 +973,302 @@ def _upload_files(
 
         log(f"{category}: found file name=`{file_name}` size={file_size}")
 
-        files.append((file_path, file_name))
-        post_modifications[file_name] = stat.st_mtime_ns
+        if pre_states is not None and _is_file_unchanged(file_path, stat, pre_states.get(file_name)):
+            unchanged_names.add(file_name)
+        else:
+            files.append((file_path, file_name))
+
         total_size += file_size
 
-    if pre_modifications is not None:
-        has_changed = pre_modifications != post_modifications
-        log(f"{category}: done walking files.len={len(files)} total_size={total_size} has_changed={has_changed}")
+    if pre_states is not None:
+        has_changed = len(files) != 0 or unchanged_names != pre_states.keys()
+        log(f"{category}: done walking files.len={len(files) + len(unchanged_names)} total_size={total_size} has_changed={has_changed} unchanged={len(unchanged_names)}")
 
         if not has_changed:
             return False
+
+        if reused is not None:
+            reused.update(unchanged_names)
     else:
         log(f"{category}: done walking files.len={len(files)} total_size={total_size}")
 
+    # small files are sent together, big ones are sent alone so that they can be resumed
+    bulk_names: Set[str] = set()
+    if compression is None:
+        bulk_files = [
+            (file_path, file_name)
+            for file_path, file_name in files
+            if file_name not in uploads and os.path.getsize(file_path) < BULK_UPLOAD_MAX_FILE_SIZE
+        ]
+
+        if len(bulk_files) > 1:
+            bulk_names = _send_bulk(
+                category=category,
+                files=bulk_files,
+                uploads=uploads,
+                client=client,
+                log=log,
+            )
+
+    # compressed uploads cannot be patched
+    delta_available = compression is None
+
     for file_path, file_name in files:
+        if file_name in bulk_names:
+            continue
+
         if file_name in uploads:
             log(f"{category}: reusing upload name=`{file_name}`")
             continue
 
+        pre_state = pre_states.get(file_name) if pre_states is not None else None
+        if (
+            delta_available
+            and pre_state is not None
+            and pre_state.size >= DELTA_MIN_FILE_SIZE
+            and os.path.getsize(file_path) >= DELTA_MIN_FILE_SIZE
+        ):
+            try:
+                upload = _send_delta(
+                    category=category,
+                    file_path=file_path,
+                    file_name=file_name,
+                    pre_state=pre_state,
+                    client=client,
+                    log=log,
+                )
+            except Exception as exception:
+                log(f"{category}: delta not available, uploading whole files: {exception}")
+
+                delta_available = False
+                upload = None
+
+            if upload is not None:
+                uploads[file_name] = upload
+                continue
+
         log(f"{category}: uploading name=`{file_name}`")
         uploads[file_name] = client.uploads.send_from_file(
             path=file_path,
             name=file_name,
-            max_retry=3
+            max_retry=3,
+            compression=compression,
+            journal=journal,
         )
 
     return True
 
 
+def _send_bulk(
+    *,
+    category: str,
+    files: List[Tuple[str, str]],
+    uploads: UploadedFiles,
+    client: Client,
+    log: Callable[[str], None],
+) -> Set[str]:
+    """
+    Returns:
+        The names of the uploaded files, empty if the bulk upload failed.
+    """
+
+    log(f"{category}: uploading in bulk files.len={len(files)}")
+
+    try:
+        bulk_uploads = client.uploads.send_bulk_from_files(
+            files=files,
+            max_retry=3,
+        )
+    except Exception as exception:
+        log(f"{category}: bulk upload failed, uploading one by one: {exception}")
+        return set()
+
+    uploads.update(bulk_uploads)
+    return set(bulk_uploads.keys())
+
+
+def _send_delta(
+    *,
+    category: str,
+    file_path: str,
+    file_name: str,
+    pre_state: FileState,
+    client: Client,
+    log: Callable[[str], None],
+) -> Optional[Upload]:
+    """
+    The signature of the downloaded version is computed by the server, which already has the file.
+
+    Returns:
+        The rebuilt upload, or None if too many blocks changed.
+    """
+
+    log(f"{category}: uploading delta name=`{file_name}`")
+
+    signature = client.uploads.get_signature(pre_state.hash)
+
+    upload = client.uploads.send_delta(
+        path=file_path,
+        name=file_name,
+        base_hash=pre_state.hash,
+        signature=signature,
+        max_retry=3,
+    )
+
+    if upload is None:
+        log(f"{category}: too many changes for a delta name=`{file_name}`")
+
+    return upload
+
+
+StatKey = Tuple[int, int]
+StreamedUploads = Dict[str, Tuple[Upload, StatKey]]
+
+
+def _reconcile_streamed_uploads(
+    *,
+    directory_path: str,
+    streamed: StreamedUploads,
+    uploads: UploadedFiles,
+    log: Callable[[str], None],
+) -> UploadedFiles:
+    """
+    Keep, in `uploads`, the streamed uploads that still match the final directory state.
+
+    Returns:
+        The uploads of the files that have since been modified or deleted, which must be deleted.
+    """
+
+    stale: UploadedFiles = {}
+
+    for file_name, (upload, uploaded_stat) in streamed.items():
+        file_path = os.path.join(directory_path, file_name)
+
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            stat = None
+
+        if stat is not None and (stat.st_size, stat.st_mtime_ns) == uploaded_stat:
+            uploads[file_name] = upload
+        else:
+            stale[file_name] = upload
+
+    log(f"prediction: reconciled streamed uploads reused={len(uploads)} stale={len(stale)}")
+
+    return stale
+
+
+class PredictionStreamer:
+    """
+    Upload prediction files while the user code is still running.
+
+    A file is uploaded once its size and modification time have not changed for `stable_seconds`.
+    The final state of the directory must still be reconciled once the execution is over.
+    """
+
+    def __init__(
+        self,
+        *,
+        directory_path: str,
+        client: Client,
+        log: Callable[[str], None],
+        poll_seconds: float = 5,
+        stable_seconds: float = 10,
+        compression: Optional[Codec] = None,
+    ):
+        self.directory_path = directory_path
+        self.client = client
+        self.log = log
+        self.poll_seconds = poll_seconds
+        self.stable_seconds = stable_seconds
+        self.compression = compression
+
+        self._uploads: StreamedUploads = {}
+        self._observed: Dict[str, Tuple[StatKey, float]] = {}
+
+        self._lock = ThreadLock()
+        self._stop_event = Event()
+        self._thread = Thread(target=self._loop, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> StreamedUploads:
+        """
+        Stop watching and wait for the current upload, if any.
+
+        Returns:
+            The uploads with the file size and modification time they were made from.
+        """
+
+        self._stop_event.set()
+        self._thread.join()
+
+        with self._lock:
+            return dict(self._uploads)
+
+    def _loop(self):
+        while not self._stop_event.wait(self.poll_seconds):
+            try:
+                self._scan()
+            except Exception as exception:
+                self.log(f"prediction: streaming scan failed: {exception}")
+
+    def _scan(self):
+        now = monotonic()
+
+        for file_path, file_name in _find_files(self.directory_path):
+            if self._stop_event.is_set():
+                return
+
+            try:
+                stat = os.stat(file_path)
+            except FileNotFoundError:
+                continue
+
+            key = (stat.st_size, stat.st_mtime_ns)
+
+            uploaded = self._uploads.get(file_name)
+            if uploaded is not None and uploaded[1] == key:
+                continue
+
+            observed = self._observed.get(file_name)
+            if observed is None or observed[0] != key:
+                self._observed[file_name] = (key, now)
+                continue
+
+            if now - observed[1] < self.stable_seconds:
+                continue
+
+            self._upload(file_path, file_name, key)
+
+    def _upload(
+        self,
+        file_path: str,
+        file_name: str,
+        key: StatKey,
+    ):
+        self.log(f"prediction: streaming upload name=`{file_name}` size={key[0]}")
+
+        upload = self.client.uploads.send_from_file(
+            path=file_path,
+            name=file_name,
+            max_retry=3,
+            compression=self.compression,
+        )
+
+        with self._lock:
+            previous = self._uploads.get(file_name)
+            self._uploads[file_name] = (upload, key)
+
+        if previous is not None:
+            try:
+                previous[0].delete()
+            except Exception as exception:
+                self.log(f"[debug] failed to delete upload {previous[0].id}: {exception}")
+
+
 class CloudRunnerContext(RunnerContext):
 
     def __init__(
@@ -7,6 +7,7 @@ from . import constants
 from .external import humanfriendly
 
 debug: bool = None
+no_cache: bool = False
 web_base_url: str = None
 api_base_url: str = None
 competitions_repository: str = None
@@ -15,7 +16,7 @@ competitions_directory_path: typing.Optional[str] = None
 
 
 def load_from_env():
-    global debug
+    global debug, no_cache
     global web_base_url, api_base_url
     global competitions_repository, competitions_branch, competitions_directory_path
 
@@ -24,6 +25,9 @@ def load_from_env():
     if not debug:
         debug = humanfriendly.coerce_boolean(os.getenv(constants.DEBUG_ENV_VAR))
 
+    if not no_cache:
+        no_cache = humanfriendly.coerce_boolean(os.getenv(constants.NO_CACHE_ENV_VAR, "false"))
+
     if web_base_url is None:
         web_base_url = os.getenv(constants.WEB_BASE_URL_ENV_VAR, constants.WEB_BASE_URL_PRODUCTION)
         api_base_url = os.getenv(constants.API_BASE_URL_ENV_VAR, constants.API_BASE_URL_PRODUCTION)
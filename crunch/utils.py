@@ -3,6 +3,7 @@ import json
 import logging
 import os
 import shutil
+import threading
 import time
 from contextlib import contextmanager
 from dataclasses import dataclass
@@ -13,7 +14,7 @@ import click
 import requests
 from tqdm.auto import tqdm
 
-from crunch.constants import DOT_CRUNCH_DIRECTORY, PROJECT_FILE, TOKEN_FILE
+from crunch.constants import CACHE_DIRECTORY_ENV_VAR, DOT_CRUNCH_DIRECTORY, PROJECT_FILE, TOKEN_FILE
 
 if TYPE_CHECKING:
     from crunch.api import ApiException, SizeVariant
@@ -162,6 +163,76 @@ def get_process_memory() -> int:
     return mem_info.rss
 
 
+def get_user_cache_directory() -> str:
+    """
+    Directory for the caches shared by all the projects of the user, which can be deleted at any time.
+    """
+
+    path = os.getenv(CACHE_DIRECTORY_ENV_VAR)
+    if path:
+        return path
+
+    if os.name == "nt":
+        root = os.getenv("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        root = os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+
+    return os.path.join(root, "crunchdao")
+
+
+@contextmanager
+def atomic_write(
+    path: str,
+    mode: Literal["w", "wb"] = "w",
+):
+    """
+    Opens a temporary file next to `path`, which replaces it only once the block completes.
+    Neither a crash nor a concurrent reader can observe a truncated file.
+    """
+
+    directory_path = os.path.dirname(path)
+    if directory_path:
+        os.makedirs(directory_path, exist_ok=True)
+
+    temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    try:
+        with open(temporary_path, mode) as fd:
+            yield fd
+
+        os.replace(temporary_path, path)
+    except BaseException:
+        try:
+            os.unlink(temporary_path)
+        except OSError:
+            pass
+
+        raise
+
+
+def hash_file(
+    path: str,
+    buffer_size: int = 1024 * 1024,
+) -> str:
+    """
+    Compute the SHA-256 of a file, same algorithm as the one reported by `SubmissionFile.hash`.
+    """
+
+    import hashlib
+
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as fd:
+        while True:
+            buffer = fd.read(buffer_size)
+            if not buffer:
+                break
+
+            digest.update(buffer)
+
+    return digest.hexdigest()
+
+
 class _undefined:
     pass
 
@@ -303,6 +374,16 @@ def download(
 
     file_length, accept_ranges, response = _download_head(session, url, path, log, print)
 
+    from crunch.compression import COMPRESSION_METADATA_HEADER, Codec
+
+    # checked before the download, an unknown codec would leave a file that cannot be read
+    compression = response.headers.get(COMPRESSION_METADATA_HEADER)
+    try:
+        codec = Codec.parse(compression) if compression else None
+    except ValueError:
+        response.close()
+        raise
+
     if not accept_ranges:
         max_retry = 0
 
@@ -363,6 +444,15 @@ def download(
 
                     response = None
 
+        # the file has been uploaded compressed, restore the original content
+        if codec is not None:
+            from crunch.compression import decompress_in_place
+
+            if log:
+                print(f"{path}: decompress {codec.name.lower()}")
+
+            decompress_in_place(source_file_path, codec)
+
         if os.path.exists(destination_file_path):
             os.unlink(destination_file_path)
 
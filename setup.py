@@ -55,6 +55,7 @@ setup(
     extras_require={
         'test': test_requirements,
         'dev': dev_requirements,
+        'async': ['httpx'],
     },
     zip_safe=False,
     entry_points={
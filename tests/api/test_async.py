@@ -0,0 +1,172 @@
+import asyncio
+import http.server
+import json
+import threading
+import unittest
+import urllib.parse
+
+import crunch.api as api
+
+try:
+    import httpx  # type: ignore
+except ImportError:
+    httpx = None
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+
+    competition_count = 25
+    with_total = False
+    pages = []
+
+    def do_GET(self):
+        url = urllib.parse.urlparse(self.path)
+        query = urllib.parse.parse_qs(url.query)
+
+        if url.path == "/v2/competitions":
+            page, size = int(query["page"][0]), int(query["size"][0])
+            content = [
+                {"id": index, "name": f"competition-{index}"}
+                for index in range(page * size, min((page + 1) * size, self.competition_count))
+            ]
+
+            page_json = {"content": content, "pageSize": size}
+            if self.with_total:
+                page_json["totalElements"] = self.competition_count
+
+            type(self).pages.append(page)
+            self.send_json(200, page_json)
+        elif url.path == "/v1/competitions/adialab":
+            self.send_json(200, {"id": 42, "name": "adialab", "authorization": self.headers.get("Authorization")})
+        elif url.path == "/v3/competitions/42/projects/7/main/submissions":
+            self.send_json(200, [{"id": number, "number": number} for number in (1, 3, 2)])
+        else:
+            self.send_json(404, {"code": "COMPETITION_NAME_NOT_FOUND", "message": "not found", "competitionName": url.path.split("/")[-1]})
+
+    def send_json(self, status_code: int, content: dict):
+        body = json.dumps(content).encode("utf-8")
+
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class AsyncClientTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+        _Handler.competition_count = 25
+        _Handler.with_total = False
+        _Handler.pages = []
+
+    def run_with_client(self, function):
+        async def main():
+            async with api.AsyncClient(self.base_url, self.base_url, api.auth.ApiKeyAuth("secret")) as client:
+                client.api.page_size = 10
+                return await function(client)
+
+        return asyncio.run(main())
+
+    def test_get(self):
+        async def function(client: api.AsyncClient):
+            competition = await client.competitions.get("adialab")
+
+            self.assertIsInstance(competition, api.Competition)
+            self.assertEqual(competition.id, 42)
+            self.assertEqual(competition._attrs["authorization"], "API-Key secret")
+
+            self.assertIs(await competition.reload(), competition)
+
+        self.run_with_client(function)
+
+    def test_list(self):
+        async def function(client: api.AsyncClient):
+            return [
+                competition.name
+                async for competition in client.competitions
+            ]
+
+        names = self.run_with_client(function)
+        self.assertEqual(names, [f"competition-{index}" for index in range(25)])
+
+    def test_concurrent(self):
+        async def function(client: api.AsyncClient):
+            return await asyncio.gather(*(
+                client.competitions.get("adialab")
+                for _ in range(50)
+            ))
+
+        competitions = self.run_with_client(function)
+        self.assertEqual({competition.id for competition in competitions}, {42})
+
+    def test_error(self):
+        async def function(client: api.AsyncClient):
+            with self.assertRaises(api.CompetitionNameNotFoundException) as context:
+                await client.competitions.get("unknown")
+
+            self.assertEqual(context.exception.competition_name, "unknown")
+
+        self.run_with_client(function)
+
+    def test_list_read_ahead(self):
+        # the competitions are listed 1000 at a time
+        _Handler.competition_count = 2000
+        _Handler.with_total = True
+
+        async def function(client: api.AsyncClient):
+            return [
+                competition.name
+                async for competition in client.competitions
+            ]
+
+        names = self.run_with_client(function)
+        self.assertEqual(names, [f"competition-{index}" for index in range(2000)])
+
+        # with the total known, no empty page is requested to detect the end
+        self.assertEqual(sorted(_Handler.pages), [0, 1])
+
+    def test_get_latest(self):
+        async def function(client: api.AsyncClient):
+            competition = await client.competitions.get("adialab")
+            project = competition.projects.get_reference(None, (7, "main"))
+
+            return await project.submissions.get_latest()
+
+        self.assertEqual(self.run_with_client(function).number, 3)
+
+    def test_unsupported_helper(self):
+        async def function(client: api.AsyncClient):
+            competition = await client.competitions.get("adialab")
+            data_release = competition.data_releases.get_reference(1)
+
+            with self.assertRaises(NotImplementedError):
+                data_release.data_files
+
+        self.run_with_client(function)
+
+    def test_unsupported_stream(self):
+        async def function(client: api.AsyncClient):
+            competition = await client.competitions.get("adialab")
+            leaderboard = api.Leaderboard(competition, {"name": "default"}, client)  # type: ignore
+
+            with self.assertRaises(NotImplementedError):
+                leaderboard.as_dataframe()
+
+            with self.assertRaises(NotImplementedError):
+                client.api.stream_leaderboard_targets(42, "default")
+
+        self.run_with_client(function)
@@ -0,0 +1,199 @@
+import http.server
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+import crunch.api as api
+from crunch.api._cache import ResponseCache
+from crunch.api._client import _get_or_create
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+
+    requests_count = 0
+    etag = '"1"'
+
+    def do_GET(self):
+        type(self).requests_count += 1
+
+        if self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = b'[{"id": 1, "name": "adialab"}]'
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", self.etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        _Handler.requests_count = 0
+
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.directory.cleanup()
+
+    def create_client(self, ttl: float):
+        cache = ResponseCache(self.directory.name, ttls=[(r"/v\d+/competitions", ttl)])
+        return api.Client(self.base_url, self.base_url, api.auth.NoneAuth(), show_progress=False, response_cache=cache, max_retries=0)
+
+    def test_fresh(self):
+        client = self.create_client(60)
+
+        self.assertEqual(client.api.get("/v1/competitions").json(), client.api.get("/v1/competitions").json())
+        self.assertEqual(_Handler.requests_count, 1)
+
+    def test_revalidate(self):
+        client = self.create_client(0)
+
+        first = client.api.get("/v1/competitions").json()
+        second = client.api.get("/v1/competitions").json()
+
+        self.assertEqual(first, second)
+        self.assertEqual(_Handler.requests_count, 2)
+
+    def test_unreachable(self):
+        client = self.create_client(0)
+        expected = client.api.get("/v1/competitions").json()
+
+        self.server.shutdown()
+        self.server.server_close()
+
+        self.assertEqual(client.api.get("/v1/competitions").json(), expected)
+
+    def test_not_cached(self):
+        client = self.create_client(60)
+
+        client.api.get("/v1/users")
+        client.api.get("/v1/users")
+
+        self.assertEqual(_Handler.requests_count, 2)
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_default_ttls(self):
+        cache = ResponseCache(self.directory.name)
+
+        self.assertEqual(cache.get_ttl("/v1/competitions/adialab/rounds/12"), 5 * 60)
+        self.assertEqual(cache.get_ttl("/v1/competitions/adialab/rounds/12/phases/submission"), 5 * 60)
+        self.assertEqual(cache.get_ttl("/v2/competitions/adialab/targets/y/metrics"), 60 * 60)
+
+        # aliases move to another round or phase over time
+        self.assertIsNone(cache.get_ttl("/v1/competitions/adialab/rounds/@current"))
+        self.assertIsNone(cache.get_ttl("/v1/competitions/adialab/rounds/@last/phases"))
+        self.assertIsNone(cache.get_ttl("/v1/competitions/adialab/rounds/12/phases/@current"))
+        self.assertIsNone(cache.get_ttl("/v1/competitions/adialab/rounds/@current/phases/submission/data-release"))
+
+
+class RequestCoalescerTest(unittest.TestCase):
+
+    def setUp(self):
+        # counted on the subclass, `type(self).requests_count += 1` does not reach `_Handler`
+        _SlowHandler.requests_count = 0
+
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_concurrent_gets(self):
+        client = api.Client(self.base_url, self.base_url, api.auth.NoneAuth(), show_progress=False)
+
+        barrier = threading.Barrier(8)
+        results = []
+
+        responses = []
+
+        def get():
+            barrier.wait()
+
+            response = client.api.get("/v1/users")
+            responses.append(response)
+            results.append(response.json())
+
+        threads = [threading.Thread(target=get) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 8)
+        self.assertEqual(_SlowHandler.requests_count, 1)
+
+        # every caller gets its own response
+        self.assertEqual(len(set(map(id, responses))), 8)
+
+    def test_registry(self):
+        api.Client.clear_registry()
+
+        client = api.Client.from_env(api.auth.ApiKeyAuth("a"))
+        self.assertIs(api.Client.from_env(api.auth.ApiKeyAuth("a")), client)
+        self.assertIsNot(api.Client.from_env(api.auth.ApiKeyAuth("b")), client)
+
+        api.Client.clear_registry()
+        self.assertIsNot(api.Client.from_env(api.auth.ApiKeyAuth("a")), client)
+
+    def test_registry_slow_factory(self):
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow():
+            calls.append("slow")
+            started.set()
+            release.wait(5)
+            return "slow"
+
+        def failing():
+            raise ValueError("failed")
+
+        thread = threading.Thread(target=_get_or_create, args=(("test", "slow"), slow))
+        thread.start()
+        started.wait(5)
+
+        try:
+            # another key is not blocked by the slow factory
+            self.assertEqual(_get_or_create(("test", "fast"), lambda: "fast"), "fast")
+
+            with self.assertRaises(ValueError):
+                _get_or_create(("test", "failing"), failing)
+
+            # a failure is not kept
+            self.assertEqual(_get_or_create(("test", "failing"), lambda: "fixed"), "fixed")
+        finally:
+            release.set()
+            thread.join()
+
+        self.assertEqual(_get_or_create(("test", "slow"), slow), "slow")
+        self.assertEqual(calls, ["slow"])
+
+        api.Client.clear_registry()
+
+
+class _SlowHandler(_Handler):
+
+    def do_GET(self):
+        time.sleep(0.2)
+        super().do_GET()
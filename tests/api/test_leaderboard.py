@@ -0,0 +1,104 @@
+import http.server
+import json
+import threading
+import unittest
+from unittest import mock
+
+import pandas
+import requests
+
+import crunch.api as api
+
+
+def _create_leaderboard():
+    targets = [
+        {
+            "id": target_id,
+            "name": f"target-{target_id}",
+            "crunch": {"id": 1, "number": 3},
+            "metrics": [{"id": 10, "name": "spearman"}],
+            "positions": [
+                {
+                    "user": {"id": user_id, "login": f"user-{user_id}"},
+                    "project": {"id": user_id, "name": "default"},
+                    "team": None,
+                    "mean": user_id / 10,
+                    "rank": user_id + 1,
+                    "rewardRank": user_id + 1,
+                    "metrics": [{"metricId": 10, "score": user_id / 100, "best": user_id / 50}],
+                }
+                for user_id in range(3)
+            ],
+        }
+        for target_id in range(2)
+    ]
+
+    return api.Leaderboard(None, {"name": "default", "targets": targets})  # type: ignore
+
+
+class LeaderboardTest(unittest.TestCase):
+
+    def test_as_dataframe(self):
+        dataframe = _create_leaderboard().as_dataframe()
+
+        self.assertEqual(len(dataframe), 6)
+        self.assertEqual(list(dataframe.columns[:4]), ["target.id", "target.name", "crunch.id", "crunch.number"])
+        self.assertEqual(list(dataframe.columns[-2:]), ["metric.spearman.score", "metric.spearman.best"])
+
+        self.assertIsInstance(dataframe["user.login"].dtype, pandas.CategoricalDtype)
+        self.assertEqual(list(dataframe["target.name"]), ["target-0"] * 3 + ["target-1"] * 3)
+        self.assertEqual(list(dataframe["rank"]), [1, 2, 3] * 2)
+        self.assertEqual(list(dataframe["metric.spearman.best"][:3]), [0, 0.02, 0.04])
+        self.assertTrue(dataframe["team.id"].isna().all())
+
+    def test_as_arrow(self):
+        table = _create_leaderboard().as_dataframe(arrow=True)
+
+        self.assertEqual(table.num_rows, 6)
+        self.assertEqual(str(table.schema.field("project.name").type), "dictionary<values=string, indices=int32, ordered=0>")
+        self.assertEqual(table.column("crunch.number").to_pylist(), [3] * 6)
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        body = json.dumps(_create_leaderboard()._attrs).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StreamedLeaderboardTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        base_url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+        self.client = api.Client(base_url, base_url, api.auth.NoneAuth(), show_progress=False)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_as_dataframe(self):
+        competition = api.Competition({"id": 1, "name": "competition"}, self.client)
+        leaderboard = api.Leaderboard(competition, {"name": "default"}, self.client)
+
+        dataframe = leaderboard.as_dataframe()
+
+        pandas.testing.assert_frame_equal(dataframe, _create_leaderboard().as_dataframe())
+        self.assertNotIn("targets", leaderboard._attrs)
+
+    def test_early_stop(self):
+        with mock.patch.object(requests.Response, "close", autospec=True) as close:
+            for _ in self.client.api.stream_leaderboard_targets(1, "default"):
+                break
+
+        # released without reading the rest of the response
+        close.assert_called_once()
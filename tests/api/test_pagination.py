@@ -0,0 +1,77 @@
+import json
+import threading
+import time
+import unittest
+
+import requests
+
+import crunch.api as api
+from crunch.api._pagination import PageRequest
+
+
+def _make_response(content: dict) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "application/json"
+    response._content = json.dumps(content).encode("utf-8")  # type: ignore
+
+    return response
+
+
+class PaginatedTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = api.Client("http://localhost/", "http://localhost/", api.auth.NoneAuth(), show_progress=False)
+
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requested_pages = []
+
+    def create_requester(self, item_count: int, with_total: bool):
+        def requester(page_request: PageRequest):
+            with self.lock:
+                self.requested_pages.append(page_request.number)
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+            time.sleep(0.01)
+
+            with self.lock:
+                self.in_flight -= 1
+
+            start = page_request.number * page_request.size
+            page = {
+                "content": list(range(start, min(start + page_request.size, item_count))),
+                "pageSize": page_request.size,
+            }
+
+            if with_total:
+                page["totalElements"] = item_count
+
+            return _make_response(page)
+
+        return requester
+
+    def test_read_ahead(self):
+        items = list(self.client.api._paginated(self.create_requester(1_000, True), page_size=10))
+
+        self.assertEqual(items, list(range(1_000)))
+        self.assertEqual(sorted(self.requested_pages), list(range(100)))
+        self.assertGreater(self.max_in_flight, 1)
+        self.assertLessEqual(self.max_in_flight, self.client.api.page_read_ahead)
+
+    def test_without_total(self):
+        items = list(self.client.api._paginated(self.create_requester(95, False), page_size=10))
+
+        self.assertEqual(items, list(range(95)))
+        self.assertEqual(self.requested_pages, list(range(10)))
+        self.assertEqual(self.max_in_flight, 1)
+
+    def test_early_close(self):
+        generator = self.client.api._paginated(self.create_requester(10_000, True), page_size=10)
+
+        self.assertEqual([next(generator) for _ in range(15)], list(range(15)))
+        generator.close()
+
+        self.assertLess(len(self.requested_pages), 10)
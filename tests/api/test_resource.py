@@ -0,0 +1,33 @@
+import unittest
+
+import crunch.api as api
+from crunch.dev.models import create_data_release, create_upload
+
+
+class MemoizedPropertyTest(unittest.TestCase):
+
+    def test_memoized(self):
+        data_release = create_data_release(10)
+
+        self.assertIs(data_release.splits, data_release.splits)
+        self.assertIs(data_release.data_files, data_release.data_files)
+        self.assertEqual(len(data_release.splits), 10)
+
+    def test_invalidated(self):
+        upload = create_upload(3)
+        chunks = upload.chunks
+
+        upload._update_attrs({"chunks": upload._attrs["chunks"][:1]})
+        self.assertIsNot(upload.chunks, chunks)
+        self.assertEqual(len(upload.chunks), 1)
+
+        upload._set_attrs({"id": "upload", "chunks": []})
+        self.assertEqual(upload.chunks, [])
+
+    def test_slots(self):
+        for model in [
+            create_data_release(1),
+            create_upload(1),
+            api.Project(None, {"id": 1}),  # type: ignore
+        ]:
+            self.assertFalse(hasattr(model, "__dict__"), type(model))
@@ -0,0 +1,77 @@
+import http.server
+import json
+import re
+import threading
+import unittest
+
+import crunch.api as api
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        match = re.fullmatch(r"/v3/competitions/1/projects/7/default/predictions/(\d+)/scores", self.path)
+        assert match is not None, self.path
+
+        prediction_id = int(match.group(1))
+        scores = [
+            {
+                "id": prediction_id * 10 + index,
+                "value": prediction_id + index / 10,
+                "metric": {"id": index, "name": f"metric-{index}", "target": {"name": "target"}},
+                "details": [
+                    {"key": "2024-01-01", "value": 0.5},
+                    {"key": f"only-{index}", "value": 1.0},
+                ],
+            }
+            for index in range(2)
+        ]
+
+        body = json.dumps(scores).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ScoresAsDataFrameTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        base_url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+        client = api.Client(base_url, base_url, api.auth.NoneAuth(), show_progress=False)
+
+        competition = api.Competition({"id": 1, "name": "competition"}, client)
+        project = api.Project(competition, {"userId": 7, "name": "default"}, client)
+
+        self.predictions = [
+            api.Prediction(project, {"id": id, "name": f"prediction-{id}"}, client)
+            for id in range(1, 51)
+        ]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_pandas(self):
+        dataframe = api.scores_as_dataframe(self.predictions)
+
+        self.assertEqual(len(dataframe), 100)
+        self.assertEqual(list(dataframe["prediction.id"][:4]), [1, 1, 2, 2])
+        self.assertEqual(list(dataframe["score.value"][:2]), [1.0, 1.1])
+        self.assertEqual(list(dataframe["metric.name"][:2]), ["metric-0", "metric-1"])
+        self.assertEqual(list(dataframe["detail.2024-01-01"].unique()), [0.5])
+        self.assertEqual(list(dataframe["detail.only-0"][:2].isna()), [False, True])
+
+    def test_arrow(self):
+        table = api.scores_as_dataframe(self.predictions[:3], arrow=True)
+
+        self.assertEqual(table.num_rows, 6)
+        self.assertIn("target.name", table.column_names)
@@ -0,0 +1,66 @@
+import json
+import unittest
+
+from parameterized import parameterized
+
+from crunch.api._streaming import JsonArrayStream
+
+
+def _chunk(document, size: int):
+    data = json.dumps(document, ensure_ascii=False).encode("utf-8")
+    return [data[index:index + size] for index in range(0, len(data), size)]
+
+
+class JsonArrayStreamTest(unittest.TestCase):
+
+    items = [
+        1,
+        -2.5e10,
+        "a,]}\"\\ é 日本",
+        {"nested": [1, {"b": None}], "float": 0.125},
+        [],
+        True,
+        12345678901234567890,
+    ]
+
+    @parameterized.expand([(1,), (3,), (7,), (1024,)])
+    def test_array(self, size: int):
+        self.assertEqual(list(JsonArrayStream(_chunk(self.items, size))), self.items)
+
+    @parameterized.expand([(1,), (5,), (1024,)])
+    def test_key(self, size: int):
+        stream = JsonArrayStream(_chunk({"before": {"x": 1}, "content": self.items, "pageSize": 100}, size), "content")
+
+        self.assertEqual(list(stream), self.items)
+        self.assertEqual(stream.others, {"before": {"x": 1}, "pageSize": 100})
+
+    def test_empty(self):
+        self.assertEqual(list(JsonArrayStream([b" [ ] "])), [])
+        self.assertEqual(list(JsonArrayStream([b"{}"], "content")), [])
+
+    def test_invalid(self):
+        for document in [b"", b"[1,2", b"[1 2]", b"{\"content\": [1]"]:
+            with self.assertRaises(json.JSONDecodeError, msg=document):
+                list(JsonArrayStream([document], "content" if document.startswith(b"{") else None))
+
+    def test_close(self):
+        document = _chunk(self.items, 3)
+
+        for consume in [
+            lambda stream: list(stream),
+            lambda stream: next(iter(stream)),
+            lambda stream: stream.close(),
+        ]:
+            closed = []
+            stream = JsonArrayStream(document, on_close=lambda: closed.append(True))
+
+            iterator = consume(stream)
+            del iterator
+
+            self.assertEqual(closed, [True])
+
+        closed = []
+        with self.assertRaises(json.JSONDecodeError):
+            list(JsonArrayStream([b"[1,"], on_close=lambda: closed.append(True)))
+
+        self.assertEqual(closed, [True])
@@ -0,0 +1,99 @@
+import http.server
+import json
+import threading
+import time
+import unittest
+
+import requests
+
+import crunch.api as api
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+
+    requests_count = 0
+    failure_count = 0
+    delay = 0.0
+
+    def do_GET(self):
+        self.respond()
+
+    def do_POST(self):
+        self.respond()
+
+    def respond(self):
+        type(self).requests_count += 1
+
+        time.sleep(self.delay)
+
+        if self.requests_count <= self.failure_count:
+            status_code, content = 503, {"code": "SERVICE_UNAVAILABLE", "message": "try again"}
+        else:
+            status_code, content = 200, {"ok": True}
+
+        body = json.dumps(content).encode("utf-8")
+
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+    def handle(self):
+        # the client of the timeout test leaves before the response
+        try:
+            super().handle()
+        except BrokenPipeError:
+            pass
+
+
+class TransportTest(unittest.TestCase):
+
+    def setUp(self):
+        _Handler.requests_count = 0
+        _Handler.failure_count = 0
+        _Handler.delay = 0.0
+
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def create_client(self, **kwargs):
+        return api.Client(self.base_url, self.base_url, api.auth.NoneAuth(), show_progress=False, **kwargs)
+
+    def test_retry_idempotent(self):
+        _Handler.failure_count = 2
+
+        client = self.create_client(max_retries=3)
+        self.assertEqual(client.api._result(client.api.get("/v1/users"), json=True), {"ok": True})
+        self.assertEqual(_Handler.requests_count, 3)
+
+    def test_no_retry_post(self):
+        _Handler.failure_count = 1
+
+        client = self.create_client(max_retries=3)
+        with self.assertRaises(api.ApiException):
+            client.api._result(client.api.post("/v1/users"), json=True)
+
+        self.assertEqual(_Handler.requests_count, 1)
+
+    def test_timeout(self):
+        _Handler.delay = 0.5
+
+        client = self.create_client(max_retries=0, timeout=0.1)
+        # a timeout is reported by requests as a connection error once the retries are exhausted
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            client.api.get("/v1/users")
+
+    def test_pool_size(self):
+        client = self.create_client(pool_size=4)
+
+        self.assertEqual(client.api.get_adapter(self.base_url)._pool_maxsize, 4)  # type: ignore
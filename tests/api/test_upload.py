@@ -0,0 +1,290 @@
+import hashlib
+import os
+import tempfile
+import unittest
+
+import crunch.api as api
+from crunch.compression import Codec
+
+
+class UploadJournalTest(unittest.TestCase):
+
+    def test_put_get_remove(self):
+        with tempfile.TemporaryDirectory() as directory_path:
+            journal = api.UploadJournal(os.path.join(directory_path, "sub", "uploads.json"))
+
+            self.assertIsNone(journal.get("a"))
+
+            journal.put("a", "1")
+            journal.put("b", "2")
+            self.assertEqual(journal.get("a"), "1")
+
+            journal.remove("a")
+            self.assertIsNone(journal.get("a"))
+            self.assertEqual(journal.get("b"), "2")
+
+    def test_corrupted(self):
+        with tempfile.TemporaryDirectory() as directory_path:
+            path = os.path.join(directory_path, "uploads.json")
+            with open(path, "w") as fd:
+                fd.write("{")
+
+            journal = api.UploadJournal(path)
+            self.assertIsNone(journal.get("a"))
+
+            journal.put("a", "1")
+            self.assertEqual(journal.get("a"), "1")
+
+    def test_key_changes_with_content(self):
+        with tempfile.TemporaryDirectory() as directory_path:
+            path = os.path.join(directory_path, "model.bin")
+            with open(path, "wb") as fd:
+                fd.write(b"hello")
+
+            key = api.UploadJournal.make_key(path, "model.bin")
+            self.assertEqual(key, api.UploadJournal.make_key(path, "model.bin"))
+            self.assertNotEqual(key, api.UploadJournal.make_key(path, "other.bin"))
+            self.assertNotEqual(key, api.UploadJournal.make_key(path, "model.bin", Codec.GZIP))
+
+            with open(path, "ab") as fd:
+                fd.write(b" world")
+
+            self.assertNotEqual(key, api.UploadJournal.make_key(path, "model.bin"))
+
+
+class UploadChunkTest(unittest.TestCase):
+
+    def test_inline_request(self):
+        upload = api.Upload(attrs={
+            "id": "upload",
+            "chunks": [
+                {
+                    "number": 1,
+                    "offset": 0,
+                    "size": 1000,
+                    "last": True,
+                    "completed": False,
+                    "request": {"method": "PUT", "url": "https://example.com/1", "headers": {}},
+                },
+            ],
+        })
+
+        chunk = upload.chunks[0]
+
+        # reading the request must not consume it, a retry reads it again
+        self.assertEqual(chunk.request.url, "https://example.com/1")
+        self.assertEqual(chunk.request.url, "https://example.com/1")
+        self.assertIn("request", chunk._attrs)
+
+
+class ChunkSizePolicyTest(unittest.TestCase):
+
+    def test_default(self):
+        policy = api.ChunkSizePolicy()
+
+        self.assertEqual(policy.choose_chunk_size(1024), 50_000_000)
+
+    def test_bounds(self):
+        policy = api.ChunkSizePolicy()
+
+        policy.record(1024, 10, 0)
+        self.assertEqual(policy.choose_chunk_size(1024), api.ChunkSizePolicy.MINIMUM_CHUNK_SIZE)
+
+        policy = api.ChunkSizePolicy()
+
+        policy.record(10 ** 9, 1, 0)
+        self.assertEqual(policy.choose_chunk_size(1024), api.ChunkSizePolicy.MAXIMUM_CHUNK_SIZE)
+
+    def test_follow_throughput(self):
+        policy = api.ChunkSizePolicy(target_chunk_seconds=10)
+
+        policy.record(100_000_000, 10, 0)
+        self.assertEqual(policy.choose_chunk_size(1024), 100_000_000)
+
+        policy.record(100_000_000, 20, 0)
+        self.assertLess(policy.choose_chunk_size(1024), 100_000_000)
+
+    def test_parallelism(self):
+        policy = api.ChunkSizePolicy(maximum_parallelism=4)
+
+        self.assertEqual(policy.choose_parallelism(0), 1)
+        self.assertEqual(policy.choose_parallelism(2), 2)
+        self.assertEqual(policy.choose_parallelism(100), 4)
+
+
+try:
+    import flask  # type: ignore
+except ImportError:
+    flask = None
+
+try:
+    import zstandard  # type: ignore
+except ImportError:
+    zstandard = None
+
+
+@unittest.skipIf(flask is None, "flask is not installed")
+class UploadFakeServerTest(unittest.TestCase):
+
+    def setUp(self):
+        from crunch.dev.uploads import FakeUploadStore, start_fake_server
+
+        self.store = FakeUploadStore(minimum_chunk_size=1)
+
+        self.server = start_fake_server(self.store)
+        base_url = self.server.__enter__()
+
+        self.client = api.Client(base_url, base_url, api.auth.NoneAuth(), show_progress=False)
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "model.bin")
+        with open(self.path, "wb") as fd:
+            fd.write(os.urandom(1000))
+
+    def tearDown(self):
+        self.directory.cleanup()
+        self.server.__exit__(None, None, None)
+
+    def test_send_from_file(self):
+        upload = self.client.uploads.send_from_file(path=self.path, name="model.bin", preferred_chunk_size=300)
+
+        self.assertEqual(upload.status, api.UploadStatus.SUCCEEDED)
+        self.assertEqual(len(upload.chunks), 4)
+        self.assertEqual(self.store.counters["bytes"], 1000)
+
+    def test_resume(self):
+        journal = api.UploadJournal(os.path.join(self.directory.name, "uploads.json"))
+
+        self.store.failure_rate = 1
+        with self.assertRaises(Exception):
+            self.client.uploads.send_from_file(path=self.path, name="model.bin", preferred_chunk_size=300, journal=journal)
+
+        self.assertIsNotNone(journal.get(api.UploadJournal.make_key(self.path, "model.bin")))
+
+        upload_id = next(iter(self.store.uploads))
+        self.store.uploads[upload_id]["chunks"][0]["completed"] = True
+
+        self.store.failure_rate = 0
+        upload = self.client.uploads.send_from_file(path=self.path, name="model.bin", preferred_chunk_size=300, journal=journal)
+
+        self.assertEqual(upload.id, upload_id)
+        self.assertEqual(upload.status, api.UploadStatus.SUCCEEDED)
+        self.assertEqual(self.store.counters["bytes"], 700)
+        self.assertIsNone(journal.get(api.UploadJournal.make_key(self.path, "model.bin")))
+
+    def test_send_packed(self):
+        self.store.keep_content = True
+
+        files = []
+        for index in range(3):
+            path = os.path.join(self.directory.name, f"{index}.txt")
+            with open(path, "wb") as fd:
+                fd.write(f"hello {index}".encode() * (index * 200 + 1))
+
+            files.append((path, f"src/{index}.txt"))
+
+        uploads = self.client.uploads.send_packed(files=files)
+
+        self.assertEqual(sorted(uploads.keys()), ["src/0.txt", "src/1.txt", "src/2.txt"])
+        for path, name in files:
+            with open(path, "rb") as fd:
+                self.assertEqual(self.store.read(uploads[name].id), fd.read())
+
+        self.assertEqual(len(self.store.uploads), 3)
+
+    def test_send_delta(self):
+        self.store.keep_content = True
+
+        with open(self.path, "rb") as fd:
+            old = fd.read()
+
+        base = self.client.uploads.send_from_file(path=self.path, name="model.bin")
+
+        new = old[:500] + b"changed" + old[500:]
+        with open(self.path, "wb") as fd:
+            fd.write(new)
+
+        signature = self.client.uploads.get_signature(hashlib.sha256(old).hexdigest(), block_size=100)
+
+        bytes_before = self.store.counters["bytes"]
+        upload = self.client.uploads.send_delta(path=self.path, name="model.bin", base_hash=hashlib.sha256(old).hexdigest(), signature=signature)
+
+        assert upload is not None
+        self.assertNotEqual(upload.id, base.id)
+        self.assertEqual(self.store.read(upload.id), new)
+        self.assertLess(self.store.counters["bytes"] - bytes_before, 300)
+
+    def test_send_bulk_from_files(self):
+        self.store.keep_content = True
+
+        files = []
+        for index in range(5):
+            path = os.path.join(self.directory.name, f"{index}.bin")
+            with open(path, "wb") as fd:
+                fd.write(os.urandom(index * 100))
+
+            files.append((path, f"{index}.bin"))
+
+        uploads = self.client.uploads.send_bulk_from_files(files=files)
+
+        self.assertEqual(self.store.counters["api"], 2)
+        for path, name in files:
+            self.assertEqual(uploads[name].status, api.UploadStatus.SUCCEEDED)
+
+            with open(path, "rb") as fd:
+                self.assertEqual(self.store.read(uploads[name].id), fd.read())
+
+    def test_compressed_round_trip(self):
+        from crunch.utils import download
+
+        self.store.keep_content = True
+
+        with open(self.path, "wb") as fd:
+            fd.write(os.urandom(1000) + b"crunch" * 10_000)
+
+        with open(self.path, "rb") as fd:
+            content = fd.read()
+
+        for codec in Codec:
+            if codec == Codec.ZSTD and zstandard is None:
+                continue
+
+            with self.subTest(codec=codec):
+                upload = self.client.uploads.send_from_file(path=self.path, name="model.bin", preferred_chunk_size=300, compression=codec)
+
+                self.assertEqual(upload.compression, codec)
+                self.assertLess(upload.size, len(content))
+
+                path = os.path.join(self.directory.name, f"downloaded-{codec.name}.bin")
+                download(f"{self.client.api.base_url}s3/{upload.id}", path, log=False, progress_bar=False)
+
+                with open(path, "rb") as fd:
+                    self.assertEqual(fd.read(), content)
+
+    def test_compressed_unknown_codec(self):
+        from crunch.utils import download
+
+        self.store.keep_content = True
+
+        upload = self.client.uploads.send_from_file(path=self.path, name="model.bin", preferred_chunk_size=300, compression=Codec.GZIP)
+        self.store.uploads[upload.id]["compression"] = "BROTLI"
+
+        path = os.path.join(self.directory.name, "downloaded.bin")
+        with self.assertRaisesRegex(ValueError, "unsupported compression: BROTLI"):
+            download(f"{self.client.api.base_url}s3/{upload.id}", path, log=False, progress_bar=False)
+
+        self.assertFalse(os.path.exists(path))
+
+    def test_compressed_encrypted(self):
+        with open(self.path, "rb") as fd:
+            with self.assertRaises(ValueError):
+                self.client.uploads.send_from_io(io=fd, name="model.bin", size=1000, public_key_pem="key", compression=Codec.GZIP)  # type: ignore
+
+        self.assertEqual(len(self.store.uploads), 0)
+
+    def test_send_encrypted_file(self):
+        upload = self.client.uploads.send_encrypted_file(path=self.path, name="model.bin", preferred_chunk_size=300)
+
+        self.assertEqual(upload.status, api.UploadStatus.SUCCEEDED)
+        self.assertTrue(self.store.uploads[upload.id]["encrypted"])
+        self.assertEqual(self.store.counters["bytes"], 1000)
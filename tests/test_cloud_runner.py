@@ -0,0 +1,349 @@
+import functools
+import http.server
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from crunch.constants import DELTA_MIN_FILE_SIZE
+from crunch.runner.cloud import PredictionStreamer, _download_files, _get_file_state, _is_file_unchanged, _reconcile_streamed_uploads, _upload_files
+
+
+class _Upload:
+
+    def __init__(self, name: str):
+        self.id = name
+        self.name = name
+        self.deleted = False
+
+    def delete(self):
+        self.deleted = True
+
+
+class _Uploads:
+
+    def __init__(self):
+        self.sent = []
+        self.error = None
+        self.signature_requests = []
+        self.signature_error = None
+
+    def send_from_file(self, *, path, name, **kwargs):
+        if self.error is not None:
+            raise self.error
+
+        self.sent.append(name)
+        return _Upload(name)
+
+    def get_signature(self, hash):
+        self.signature_requests.append(hash)
+
+        if self.signature_error is not None:
+            raise self.signature_error
+
+        from crunch.delta import compute_signature
+
+        return compute_signature(io.BytesIO(b""))
+
+    def send_delta(self, *, name, **kwargs):
+        self.sent.append(f"{name}.delta")
+        return _Upload(name)
+
+    def send_bulk_from_files(self, *, files, **kwargs):
+        return {
+            name: self.send_from_file(path=path, name=name)
+            for path, name in files
+        }
+
+
+class _Client:
+
+    def __init__(self):
+        self.uploads = _Uploads()
+
+
+class FileStateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+
+        self.client = _Client()
+        self.logs = []
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name: str, content: bytes, mtime_ns: int = 0):
+        path = os.path.join(self.path, name)
+
+        with open(path, "wb") as fd:
+            fd.write(content)
+
+        if mtime_ns:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+
+        return path
+
+    def is_unchanged(self, path: str, pre_state):
+        return _is_file_unchanged(path, os.stat(path), pre_state)
+
+    def test_same_modification_time(self):
+        path = self.write("model.bin", b"hello", mtime_ns=1_000_000_000)
+        pre_state = _get_file_state(path)
+
+        # the content is not read when the modification time did not change
+        self.write("model.bin", b"world", mtime_ns=1_000_000_000)
+        self.assertTrue(self.is_unchanged(path, pre_state))
+
+    def test_hash_match(self):
+        path = self.write("model.bin", b"hello", mtime_ns=1_000_000_000)
+        pre_state = _get_file_state(path)
+
+        self.write("model.bin", b"hello", mtime_ns=2_000_000_000)
+        self.assertTrue(self.is_unchanged(path, pre_state))
+
+    def test_hash_mismatch(self):
+        path = self.write("model.bin", b"hello", mtime_ns=1_000_000_000)
+        pre_state = _get_file_state(path)
+
+        self.write("model.bin", b"world", mtime_ns=2_000_000_000)
+        self.assertFalse(self.is_unchanged(path, pre_state))
+
+        self.write("model.bin", b"hello world")
+        self.assertFalse(self.is_unchanged(path, pre_state))
+
+    def test_missing_state(self):
+        path = self.write("model.bin", b"hello")
+
+        self.assertFalse(self.is_unchanged(path, None))
+
+    def upload_files(self, pre_states):
+        uploads = {}
+        reused = set()
+
+        has_changed = _upload_files(
+            category="model",
+            directory_path=self.path,
+            uploads=uploads,
+            client=self.client,  # type: ignore
+            log=self.logs.append,
+            pre_states=pre_states,
+            reused=reused,
+        )
+
+        return has_changed, sorted(uploads), sorted(reused)
+
+    def test_upload_changed_files(self):
+        pre_states = {
+            name: _get_file_state(self.write(name, b"hello", mtime_ns=1_000_000_000))
+            for name in ["a.bin", "b.bin", "c.bin"]
+        }
+
+        self.assertEqual(self.upload_files(pre_states), (False, [], []))
+
+        self.write("b.bin", b"world", mtime_ns=2_000_000_000)
+        self.write("d.bin", b"new")
+
+        self.assertEqual(self.upload_files(pre_states), (True, ["b.bin", "d.bin"], ["a.bin", "c.bin"]))
+        self.assertEqual(sorted(self.client.uploads.sent), ["b.bin", "d.bin"])
+
+    def test_upload_deleted_file(self):
+        pre_states = {
+            name: _get_file_state(self.write(name, b"hello", mtime_ns=1_000_000_000))
+            for name in ["a.bin", "b.bin"]
+        }
+
+        os.unlink(os.path.join(self.path, "b.bin"))
+
+        self.assertEqual(self.upload_files(pre_states), (True, [], ["a.bin"]))
+        self.assertEqual(self.client.uploads.sent, [])
+
+    def write_big(self, name: str, fill: bytes, mtime_ns: int):
+        return self.write(name, fill * DELTA_MIN_FILE_SIZE, mtime_ns=mtime_ns)
+
+    def test_upload_delta(self):
+        pre_states = {
+            "big.bin": _get_file_state(self.write_big("big.bin", b"a", mtime_ns=1_000_000_000)),
+            "small.bin": _get_file_state(self.write("small.bin", b"hello", mtime_ns=1_000_000_000)),
+        }
+
+        self.write_big("big.bin", b"b", mtime_ns=2_000_000_000)
+        self.write("small.bin", b"world", mtime_ns=2_000_000_000)
+
+        self.assertEqual(self.upload_files(pre_states), (True, ["big.bin", "small.bin"], []))
+
+        # the signature is only requested when sending a delta, and only for the big files
+        self.assertEqual(self.client.uploads.signature_requests, [pre_states["big.bin"].hash])
+        self.assertEqual(sorted(self.client.uploads.sent), ["big.bin.delta", "small.bin"])
+
+    def test_upload_delta_unavailable(self):
+        self.client.uploads.signature_error = ConnectionError("unreachable")
+
+        pre_states = {
+            name: _get_file_state(self.write_big(name, b"a", mtime_ns=1_000_000_000))
+            for name in ["a.bin", "b.bin"]
+        }
+
+        for name in pre_states:
+            self.write_big(name, b"b", mtime_ns=2_000_000_000)
+
+        self.assertEqual(self.upload_files(pre_states), (True, ["a.bin", "b.bin"], []))
+
+        # not tried again after the first failure
+        self.assertEqual(len(self.client.uploads.signature_requests), 1)
+        self.assertEqual(sorted(self.client.uploads.sent), ["a.bin", "b.bin"])
+
+
+class DownloadFilesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.source = tempfile.TemporaryDirectory()
+        self.destination = tempfile.TemporaryDirectory()
+
+        with open(os.path.join(self.source.name, "small.bin"), "wb") as fd:
+            fd.write(b"hello")
+
+        with open(os.path.join(self.source.name, "big.bin"), "wb") as fd:
+            fd.truncate(DELTA_MIN_FILE_SIZE)
+
+        handler = functools.partial(_QuietHandler, directory=self.source.name)
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        base_url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+        self.file_urls = {
+            "small.bin": f"{base_url}small.bin",
+            "big.bin": f"{base_url}big.bin",
+        }
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+        self.source.cleanup()
+        self.destination.cleanup()
+
+    def test_states(self):
+        states = _download_files(
+            file_urls=self.file_urls,
+            directory_path=self.destination.name,
+            print=lambda _: None,
+        )
+
+        self.assertEqual(states["small.bin"].size, 5)
+        self.assertEqual(states["big.bin"].size, DELTA_MIN_FILE_SIZE)
+
+        path = os.path.join(self.destination.name, "small.bin")
+        self.assertTrue(_is_file_unchanged(path, os.stat(path), states["small.bin"]))
+
+
+class PredictionStreamerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+
+        self.client = _Client()
+        self.logs = []
+
+        self.streamer = PredictionStreamer(
+            directory_path=self.path,
+            client=self.client,  # type: ignore
+            log=self.logs.append,
+            poll_seconds=0.01,
+            stable_seconds=0.05,
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name: str, content: bytes):
+        with open(os.path.join(self.path, name), "wb") as fd:
+            fd.write(content)
+
+    def wait_for(self, condition):
+        deadline = time.monotonic() + 5
+        while not condition():
+            self.assertLess(time.monotonic(), deadline, "timed out")
+            time.sleep(0.01)
+
+    def finish(self):
+        """
+        Same steps as `CloudRunner._upload_prediction_files()`.
+        """
+
+        streamed = self.streamer.stop()
+
+        uploads = {}
+        stale = _reconcile_streamed_uploads(
+            directory_path=self.path,
+            streamed=streamed,
+            uploads=uploads,
+            log=self.logs.append,
+        )
+
+        _upload_files(
+            category="prediction",
+            directory_path=self.path,
+            uploads=uploads,
+            client=self.client,  # type: ignore
+            log=self.logs.append,
+        )
+
+        return uploads, stale
+
+    def test_streamed_then_final(self):
+        self.write("a.csv", b"1")
+        self.write("b.csv", b"2")
+
+        self.streamer.start()
+        self.wait_for(lambda: len(self.client.uploads.sent) == 2)
+
+        self.write("c.csv", b"3")
+        self.write("d.csv", b"4")
+
+        uploads, stale = self.finish()
+
+        # the streamed files are reused, they are not uploaded again with the others
+        self.assertEqual(sorted(uploads), ["a.csv", "b.csv", "c.csv", "d.csv"])
+        self.assertEqual(sorted(self.client.uploads.sent), ["a.csv", "b.csv", "c.csv", "d.csv"])
+        self.assertEqual(stale, {})
+
+    def test_modified_after_stream(self):
+        self.write("prediction.csv", b"1")
+
+        self.streamer.start()
+        self.wait_for(lambda: len(self.client.uploads.sent) == 1)
+
+        self.streamer.stop()
+        self.write("prediction.csv", b"1\n2")
+
+        uploads, stale = self.finish()
+
+        self.assertEqual(list(stale), ["prediction.csv"])
+        self.assertIsNot(uploads["prediction.csv"], stale["prediction.csv"])
+        self.assertEqual(self.client.uploads.sent, ["prediction.csv", "prediction.csv"])
+
+    def test_failed_stream(self):
+        self.client.uploads.error = ConnectionError("unreachable")
+        self.write("prediction.csv", b"1")
+
+        self.streamer.start()
+        self.wait_for(lambda: any("streaming scan failed" in line for line in self.logs))
+
+        self.client.uploads.error = None
+        uploads, stale = self.finish()
+
+        # uploaded normally once the execution is over
+        self.assertEqual(list(uploads), ["prediction.csv"])
+        self.assertEqual(self.client.uploads.sent, ["prediction.csv"])
+        self.assertEqual(stale, {})
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+
+    def log_message(self, *args):
+        pass
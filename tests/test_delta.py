@@ -0,0 +1,81 @@
+import io
+import os
+import random
+import tempfile
+import unittest
+
+from crunch.delta import Signature, _rolling_weak_checksums, _weak_checksum, apply_recipe, compute_delta, compute_signature
+
+
+class DeltaTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "new.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _round_trip(self, old: bytes, new: bytes, block_size: int):
+        with open(self.path, "wb") as fd:
+            fd.write(new)
+
+        signature = compute_signature(io.BytesIO(old), block_size)
+        signature = Signature.from_dict(signature.to_dict())
+
+        delta = compute_delta(signature, self.path)
+
+        payload = io.BytesIO()
+        delta.write_data(self.path, payload)
+        self.assertEqual(len(payload.getvalue()), delta.data_size)
+
+        output = io.BytesIO()
+        apply_recipe(io.BytesIO(old), payload, delta.to_recipe(), output)
+        self.assertEqual(output.getvalue(), new)
+
+        return delta
+
+    def test_identical(self):
+        old = os.urandom(64 * 10)
+
+        delta = self._round_trip(old, old, 64)
+        self.assertEqual(delta.data_size, 0)
+        self.assertEqual(len(delta.operations), 1)
+
+    def test_insertion(self):
+        old = os.urandom(64 * 10)
+        new = old[:100] + b"hello" + old[100:]
+
+        delta = self._round_trip(old, new, 64)
+        self.assertLessEqual(delta.data_size, 64 * 2 + 5)
+
+    def test_empty(self):
+        self._round_trip(b"", os.urandom(100), 64)
+        self._round_trip(os.urandom(100), b"", 64)
+
+    def test_random_edits(self):
+        generator = random.Random(42)
+
+        for _ in range(50):
+            old = bytes(generator.getrandbits(8) for _ in range(generator.randint(0, 1500)))
+            new = bytearray(old)
+
+            for _ in range(generator.randint(0, 4)):
+                position = generator.randint(0, len(new))
+                if generator.random() < 0.5:
+                    new[position:position] = os.urandom(generator.randint(1, 80))
+                else:
+                    del new[position:position + generator.randint(1, 80)]
+
+            self._round_trip(old, bytes(new), generator.choice([16, 32, 64]))
+
+    def test_rolling_weak_checksums(self):
+        # long enough for the 32-bit prefix sums to wrap
+        data = bytes([255]) * 20_000 + os.urandom(20_000)
+        block_size = 4096
+
+        weaks = _rolling_weak_checksums(data, block_size)
+
+        self.assertEqual(len(weaks), len(data) - block_size + 1)
+        for offset in random.Random(42).sample(range(len(weaks)), 200) + [0, len(weaks) - 1]:
+            self.assertEqual(int(weaks[offset]), _weak_checksum(data[offset:offset + block_size]))
@@ -0,0 +1,50 @@
+import unittest
+
+from crunch.external import gitignorefile
+
+
+class CompileRulesTest(unittest.TestCase):
+
+    def assertIgnored(self, rules, path, is_dir=False, expected=True):
+        match = gitignorefile.compile_rules(rules, "/base").match
+        self.assertEqual(match(f"/base/{path}", is_dir=is_dir), expected, f"{rules} on {path}")
+
+    def assertNotIgnored(self, rules, path, is_dir=False):
+        self.assertIgnored(rules, path, is_dir, expected=False)
+
+    def test_shapes(self):
+        self.assertIgnored(["__pycache__/"], "src/__pycache__/a.pyc")
+        self.assertIgnored(["__pycache__/"], "src/__pycache__", is_dir=True)
+        self.assertNotIgnored(["__pycache__/"], "src/__pycache__")
+
+        self.assertIgnored(["*.pyc"], "src/a.pyc")
+        self.assertNotIgnored(["*.pyc"], "src/a.py")
+
+        self.assertIgnored(["/data/"], "data/x.csv")
+        self.assertNotIgnored(["/data/"], "src/data/x.csv")
+
+        self.assertIgnored(["/src/**/generated_*.py"], "src/a/b/generated_1.py")
+        self.assertNotIgnored(["/src/**/generated_*.py"], "test/generated_1.py")
+
+    def test_same_as_rules(self):
+        rules = ["*.log", "build/", "/dist", "!keep.log", "src/**/*.tmp", "!src/important.tmp", "cache"]
+        paths = ["a.log", "keep.log", "logs/keep.log", "build/x", "build", "dist/a", "src/dist/a", "src/x/y.tmp", "src/important.tmp", "x/cache/y", "main.py"]
+
+        compiled = gitignorefile.compile_rules(rules, "/base")
+        one_by_one = gitignorefile._IgnoreRules([gitignorefile._rule_from_pattern(rule) for rule in rules], "/base")  # type: ignore
+
+        for path in paths:
+            for is_dir in (False, True):
+                self.assertEqual(
+                    compiled.match(f"/base/{path}", is_dir=is_dir),
+                    bool(one_by_one.match(f"/base/{path}", is_dir=is_dir)),
+                    f"{path} (is_dir={is_dir})",
+                )
+
+    def test_negation_order(self):
+        self.assertNotIgnored(["*.log", "!keep.log"], "keep.log")
+        self.assertIgnored(["!keep.log", "*.log"], "keep.log")
+        self.assertIgnored(["*.log", "!keep.log", "keep*"], "keep.log")
+
+    def test_nested_directory_with_same_name(self):
+        self.assertIgnored(["data/"], "data/src/data")
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import time
+import unittest
+
+from crunch.index import RACY_WINDOW_NS, WorkspaceIndex
+from crunch.utils import hash_file
+
+
+class WorkspaceIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+        self.index_path = os.path.join(self.root, ".crunchdao", "index.json")
+
+        self.path = os.path.join(self.root, "model.bin")
+        self.write(b"hello")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, content: bytes, mtime_ns: int = 0):
+        with open(self.path, "wb") as fd:
+            fd.write(content)
+
+        # old enough to not be racy
+        mtime_ns = mtime_ns or time.time_ns() - 10 * RACY_WINDOW_NS
+        os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+    def test_skip_hash_if_stat_unchanged(self):
+        index = WorkspaceIndex(self.root, self.index_path)
+        self.assertEqual(index.hash_file(self.path), hash_file(self.path))
+        index.save()
+
+        # same size and modification time, the stale hash proves that the file was not read
+        stat = os.stat(self.path)
+        self.write(b"world", mtime_ns=stat.st_mtime_ns)
+
+        index = WorkspaceIndex(self.root, self.index_path)
+        self.assertNotEqual(index.hash_file(self.path), hash_file(self.path))
+
+    def test_rehash_if_modified(self):
+        index = WorkspaceIndex(self.root, self.index_path)
+        index.hash_file(self.path)
+        index.save()
+
+        self.write(b"hello world")
+
+        index = WorkspaceIndex(self.root, self.index_path)
+        self.assertIsNone(index.get_hash(self.path))
+        self.assertEqual(index.hash_file(self.path), hash_file(self.path))
+
+    def test_racy_entry(self):
+        self.write(b"hello", mtime_ns=time.time_ns())
+
+        index = WorkspaceIndex(self.root, self.index_path)
+        index.hash_file(self.path)
+        index.save()
+
+        index = WorkspaceIndex(self.root, self.index_path)
+        self.assertIsNone(index.get_hash(self.path))
+
+    def test_commit_staged(self):
+        index = WorkspaceIndex(self.root, self.index_path)
+        index.stage(self.path)
+        index.commit({"model.bin": "abc", "other.bin": "def"})
+        index.save()
+
+        index = WorkspaceIndex(self.root, self.index_path)
+        self.assertEqual(index.get_hash(self.path), "abc")
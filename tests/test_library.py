@@ -0,0 +1,178 @@
+import os
+import tempfile
+import unittest
+from importlib.metadata import version
+from types import SimpleNamespace
+
+from crunch_convert import RequirementLanguage
+from crunch_convert.requirements_txt import Library, LocalWhitelist, MultipleLibraryAliasCandidateException
+
+from crunch.api import ApiException
+from crunch.library import CachedSitePackageVersionFinder, SnapshotWhitelist, _installed_distributions_by_key
+
+
+class _Library:
+
+    def __init__(self, name, aliases, standard=False):
+        self.name = name
+        self.aliases = tuple(aliases)
+        self.standard = standard
+        self.freeze = False
+
+
+class _Libraries:
+
+    def __init__(self, libraries, error=None):
+        self.libraries = libraries
+        self.error = error
+        self.calls = []
+
+    def list(self, *, language):
+        self.calls.append(language)
+
+        if self.error is not None:
+            raise self.error
+
+        return self.libraries
+
+
+class _Client:
+
+    def __init__(self, libraries):
+        self.libraries = libraries
+        self.api = SimpleNamespace(base_url="http://localhost/")
+
+
+class SnapshotWhitelistTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+        self.libraries = _Libraries([
+            _Library("scikit-learn", ["sklearn"]),
+            _Library("pandas", ["pandas"]),
+            _Library("opencv-python", ["cv2"]),
+            _Library("opencv-python-headless", ["cv2"]),
+        ])
+
+        self.fallback = LocalWhitelist([
+            Library(language=RequirementLanguage.PYTHON, name="pandas", aliases=["pandas"], standard=False, freeze=False),
+            Library(language=RequirementLanguage.PYTHON, name="polars", aliases=["polars"], standard=False, freeze=False),
+        ])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def create_whitelist(self, **kwargs):
+        return SnapshotWhitelist(_Client(self.libraries), self.fallback, cache_directory_path=self.directory.name, **kwargs)  # type: ignore
+
+    def test_few_lookups(self):
+        whitelist = self.create_whitelist(min_lookup_count=3)
+
+        self.assertEqual(whitelist.find_library(name="pandas").name, "pandas")  # type: ignore
+        self.assertIsNone(whitelist.find_library(name="scikit-learn"))
+        self.assertEqual(whitelist.find_library(name="pandas").name, "pandas")  # type: ignore
+
+        self.assertEqual(self.libraries.calls, [])
+
+        # the third distinct lookup lists the whole whitelist
+        self.assertIsNone(whitelist.find_library(name="numpy"))
+        self.assertEqual(whitelist.find_library(name="scikit-learn").name, "scikit-learn")  # type: ignore
+
+        self.assertEqual(self.libraries.calls, [RequirementLanguage.PYTHON])
+
+    def test_persisted(self):
+        self.create_whitelist(min_lookup_count=0).find_library(name="pandas")
+        self.assertEqual(self.libraries.calls, [RequirementLanguage.PYTHON])
+
+        whitelist = self.create_whitelist()
+        self.assertEqual(whitelist.find_library(name="scikit-learn").name, "scikit-learn")  # type: ignore
+
+        # could have been whitelisted since the listing
+        self.assertEqual(whitelist.find_library(name="polars").name, "polars")  # type: ignore
+
+        self.assertEqual(self.libraries.calls, [RequirementLanguage.PYTHON])
+
+        self.create_whitelist(min_lookup_count=0, ttl=0).find_library(name="pandas")
+        self.assertEqual(self.libraries.calls, [RequirementLanguage.PYTHON] * 2)
+
+    def test_single_listing(self):
+        libraries = self.libraries
+        whitelist = self.create_whitelist(min_lookup_count=0)
+
+        self.assertEqual(whitelist.find_library(name="Scikit-Learn").name, "scikit-learn")  # type: ignore
+        self.assertEqual(whitelist.find_library(alias="sklearn").name, "scikit-learn")  # type: ignore
+        self.assertIsNone(whitelist.find_library(name="unknown"))
+
+        with self.assertRaises(MultipleLibraryAliasCandidateException):
+            whitelist.find_library(alias="cv2")
+
+        self.assertEqual(libraries.calls, [RequirementLanguage.PYTHON])
+
+    def test_prefetch(self):
+        whitelist = self.create_whitelist(min_lookup_count=3)
+
+        whitelist.prefetch(names=["pandas", "numpy"])
+        self.assertEqual(self.libraries.calls, [])
+
+        # the whole requirements file is known up front, no lookup is made one by one before the listing
+        whitelist.prefetch(names=["pandas", "numpy", "scikit-learn"])
+        self.assertEqual(self.libraries.calls, [RequirementLanguage.PYTHON])
+
+        self.assertEqual(whitelist.find_library(name="scikit-learn").name, "scikit-learn")  # type: ignore
+        self.assertEqual(self.libraries.calls, [RequirementLanguage.PYTHON])
+
+    def test_miss_after_listing(self):
+        whitelist = self.create_whitelist(min_lookup_count=0)
+
+        self.assertEqual(whitelist.find_library(name="pandas").name, "pandas")  # type: ignore
+        self.assertEqual(self.libraries.calls, [RequirementLanguage.PYTHON])
+
+        # missing from the listing it just made, still looked up
+        self.assertEqual(whitelist.find_library(name="polars").name, "polars")  # type: ignore
+        self.assertIsNone(whitelist.find_library(name="unknown"))
+
+    def test_fallback(self):
+        libraries = _Libraries([], error=ApiException("unavailable"))
+        fallback = LocalWhitelist([])
+
+        whitelist = SnapshotWhitelist(_Client(libraries), fallback, min_lookup_count=0, cache_directory_path=self.directory.name)  # type: ignore
+
+        self.assertIsNone(whitelist.find_library(name="pandas"))
+        self.assertIsNone(whitelist.find_library(name="numpy"))
+
+        self.assertEqual(libraries.calls, [RequirementLanguage.PYTHON])
+
+
+class CachedSitePackageVersionFinderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        _installed_distributions_by_key.clear()
+
+    def tearDown(self):
+        self.directory.cleanup()
+        _installed_distributions_by_key.clear()
+
+    def test_find_latest(self):
+        finder = CachedSitePackageVersionFinder(self.directory.name)
+
+        self.assertEqual(finder.find_latest(name="requests"), version("requests"))
+        self.assertEqual(finder.find_latest(name="Python_Dotenv"), version("python-dotenv"))
+        self.assertIsNone(finder.find_latest(name="not-installed-at-all"))
+        self.assertIsNone(finder.find_latest(language=RequirementLanguage.R, name="requests"))
+
+    def test_persisted(self):
+        CachedSitePackageVersionFinder(self.directory.name).find_latest(name="requests")
+        _installed_distributions_by_key.clear()
+
+        (file_name,) = os.listdir(self.directory.name)
+        path = os.path.join(self.directory.name, file_name)
+
+        with open(path) as fd:
+            content = fd.read()
+
+        with open(path, "w") as fd:
+            fd.write(content.replace(f'"{version("requests")}"', '"0.0.0"'))
+
+        self.assertEqual(CachedSitePackageVersionFinder(self.directory.name).find_latest(name="requests"), "0.0.0")
@@ -0,0 +1,321 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from crunch.api import Client, SubmissionFile
+from crunch.command.push import EncryptedFileInfo, _EncryptionPipeline, _find_unchanged_files, _get_previous_files, _list_files, list_code_files, list_model_files, push
+from crunch.compression import Codec
+from crunch.constants import IGNORED_CODE_FILES
+from crunch.index import WorkspaceIndex
+from crunch.utils import hash_file
+from crunch.dev.listing import create_tree, list_files_os_walk
+
+
+class ListFilesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def touch(self, *parts: str):
+        path = os.path.join(self.path, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(path, "w"):
+            pass
+
+    def test_same_as_os_walk(self):
+        create_tree(self.path, code_file_count=50, ignored_file_count=50)
+        self.touch("src", "__pycache__", "a.pyc")
+        self.touch("src", "b.pyc")
+
+        self.assertEqual(
+            sorted(_list_files(self.path, IGNORED_CODE_FILES)),
+            sorted(list_files_os_walk(self.path, IGNORED_CODE_FILES)),
+        )
+
+    def test_ignored_directories(self):
+        self.touch("main.py")
+        self.touch("data", "X_train.parquet")
+        self.touch("resources", "model.bin")
+        self.touch("resources", ".ipynb_checkpoints", "model-checkpoint.bin")
+
+        with open(os.path.join(self.path, ".gitignore"), "w") as fd:
+            fd.write("*.log\n")
+
+        self.touch("resources", "training.log")
+
+        self.assertEqual(
+            sorted(relative_path for _, relative_path in list_code_files(self.path, "resources")),
+            [".gitignore", "main.py"],
+        )
+
+        self.assertEqual(
+            [relative_path for _, relative_path in list_model_files(self.path, "resources")],
+            ["model.bin"],
+        )
+
+    def test_model_directory_in_gitignore(self):
+        self.touch("main.py")
+        self.touch("resources", "model.bin")
+        self.touch("resources", "training.log")
+        self.touch("resources", "checkpoints", "resources", "model.bin")
+
+        with open(os.path.join(self.path, ".gitignore"), "w") as fd:
+            fd.write("resources/\n*.log\n")
+
+        self.assertEqual(
+            sorted(relative_path for _, relative_path in list_code_files(self.path, "resources")),
+            [".gitignore", "main.py"],
+        )
+
+        # the parent rules apply inside the model directory, but not to its own name
+        self.assertEqual(
+            [relative_path for _, relative_path in list_model_files(self.path, "resources")],
+            ["model.bin"],
+        )
+
+
+class FindUnchangedFilesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name: str, content: bytes):
+        path = os.path.join(self.path, name)
+
+        with open(path, "wb") as fd:
+            fd.write(content)
+
+        return path
+
+    def create_previous(self, name: str, path: str):
+        return SubmissionFile(
+            None,  # type: ignore
+            attrs={
+                "name": name,
+                "size": os.path.getsize(path),
+                "hash": hash_file(path),
+            },
+        )
+
+    def test_unchanged(self):
+        unchanged_path = self.write("main.py", b"print('hello')")
+        changed_path = self.write("utils.py", b"a = 1")
+        new_path = self.write("new.py", b"b = 2")
+
+        previous_files = {
+            "main.py": self.create_previous("main.py", unchanged_path),
+            "utils.py": self.create_previous("utils.py", changed_path),
+            "deleted.py": self.create_previous("deleted.py", unchanged_path),
+        }
+
+        # same size, only the hash differs
+        self.write("utils.py", b"a = 3")
+
+        file_paths = [
+            (unchanged_path, "main.py"),
+            (changed_path, "utils.py"),
+            (new_path, "new.py"),
+        ]
+
+        self.assertEqual(_find_unchanged_files(file_paths, previous_files), {"main.py"})
+        self.assertEqual(_find_unchanged_files(file_paths, {}), set())
+
+    def test_compressed(self):
+        path = self.write("model.bin", b"crunch" * 10_000)
+        index_path = os.path.join(self.path, "index.json")
+
+        # the previous submission was pushed with --compression, the server reported the hash of the compressed file
+        index = WorkspaceIndex(self.path, index_path)
+        index.stage(path, Codec.GZIP)
+        index.commit({"model.bin": "compressed-hash"})
+        index.save()
+
+        previous_files = {
+            "model.bin": SubmissionFile(
+                None,  # type: ignore
+                attrs={
+                    "name": "model.bin",
+                    "size": 42,
+                    "hash": "compressed-hash",
+                },
+            ),
+        }
+
+        file_paths = [(path, "model.bin")]
+
+        # matched with the local hash, the file is not compressed again to be compared
+        index = WorkspaceIndex(self.path, index_path)
+        self.assertEqual(_find_unchanged_files(file_paths, previous_files, index, Codec.GZIP), {"model.bin"})
+
+        self.assertEqual(_find_unchanged_files(file_paths, previous_files, index, Codec.ZSTD), set())
+        self.assertEqual(_find_unchanged_files(file_paths, previous_files, None, Codec.GZIP), set())
+
+        self.write("model.bin", b"crunch" * 10_001)
+        self.assertEqual(_find_unchanged_files(file_paths, previous_files, index, Codec.GZIP), set())
+
+
+class IncrementalPushTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+
+        self.previous_directory = os.getcwd()
+        os.chdir(self.path)
+
+        self.write("main.py", b"print('hello')")
+        self.write("utils.py", b"a = 1")
+        self.write("resources/model.bin", b"weights")
+
+        self.latest_calls = 0
+        self.previous_files = [
+            self.create_previous("main.py", b"print('hello')"),
+            self.create_previous("utils.py", b"a = 2"),
+            self.create_previous("deleted.py", b"b = 2"),
+            self.create_previous("resources/model.bin", b"weights"),
+        ]
+
+    def tearDown(self):
+        os.chdir(self.previous_directory)
+        self.directory.cleanup()
+
+    def write(self, name: str, content: bytes):
+        os.makedirs(os.path.dirname(name) or ".", exist_ok=True)
+
+        with open(name, "wb") as fd:
+            fd.write(content)
+
+    def create_previous(self, name: str, content: bytes):
+        import hashlib
+
+        return SubmissionFile(
+            None,  # type: ignore
+            attrs={
+                "name": name,
+                "size": len(content),
+                "hash": hashlib.sha256(content).hexdigest(),
+            },
+        )
+
+    def create_project(self):
+        def get_latest():
+            self.latest_calls += 1
+
+            return SimpleNamespace(
+                number=1,
+                files=SimpleNamespace(list=lambda: self.previous_files),
+            )
+
+        return SimpleNamespace(
+            competition=SimpleNamespace(name="competition", encrypt_submissions=False),
+            submissions=SimpleNamespace(get_latest=get_latest),
+        )
+
+    def push(self, incremental: bool):
+        project = self.create_project()
+
+        output = io.StringIO()
+        with mock.patch.object(Client, "from_project", return_value=(SimpleNamespace(), project)), contextlib.redirect_stdout(output):
+            push(
+                message="",
+                main_file_path="main.py",
+                model_directory_relative_path="resources",
+                include_installed_packages_version=False,
+                no_afterword=True,
+                dry=True,
+                incremental=incremental,
+            )
+
+        return output.getvalue().splitlines()
+
+    def test_get_previous_files(self):
+        submission, code_files, model_files = _get_previous_files(self.create_project(), "resources")  # type: ignore
+
+        self.assertEqual(submission.number, 1)  # type: ignore
+        self.assertEqual(sorted(code_files), ["deleted.py", "main.py", "utils.py"])
+        self.assertEqual(sorted(model_files), ["model.bin"])
+
+    def test_incremental(self):
+        lines = self.push(incremental=True)
+
+        self.assertIn("unchanged code file: main.py (14 bytes)", lines)
+        self.assertIn("found code file: utils.py (5 bytes)", lines)
+        self.assertIn("unchanged model file: model.bin (7 bytes)", lines)
+        self.assertFalse(any("deleted.py" in line for line in lines))
+
+        self.assertEqual(self.latest_calls, 1)
+
+    def test_full(self):
+        lines = self.push(incremental=False)
+
+        self.assertIn("found code file: main.py (14 bytes)", lines)
+        self.assertIn("found code file: utils.py (5 bytes)", lines)
+        self.assertIn("found model file: model.bin (7 bytes)", lines)
+        self.assertFalse(any(line.startswith("unchanged") for line in lines))
+
+        self.assertEqual(self.latest_calls, 0)
+
+
+class EncryptionPipelineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_pending_size(self):
+        from crunch_encrypt.ecies import ECIESDecryptIO, generate_keypair_pem
+
+        private_key_pem, public_key_pem = generate_keypair_pem()
+
+        uploaded = {}
+
+        def on_encrypted(info: EncryptedFileInfo, encrypted_path: str):
+            with open(encrypted_path, "rb") as fd:
+                uploaded[info.name] = ECIESDecryptIO(fd, os.path.getsize(encrypted_path), private_key_pem=private_key_pem, ephemeral_public_key_pem=info.public_key_pem).read()
+
+        pipeline = _EncryptionPipeline(
+            public_key_pem=public_key_pem,
+            on_encrypted=on_encrypted,
+            worker_count=2,
+            max_pending_count=10,
+            max_pending_size=250,
+        )
+
+        pending_sizes = []
+        contents = {}
+
+        try:
+            for index, size in enumerate([100, 100, 100, 1000, 100]):
+                name = f"{index}.bin"
+                path = os.path.join(self.path, name)
+
+                contents[name] = os.urandom(size)
+                with open(path, "wb") as fd:
+                    fd.write(contents[name])
+
+                pipeline.submit(path, EncryptedFileInfo(name=name, public_key_pem=""), size)
+                pending_sizes.append(pipeline._pending_size)
+
+            pipeline.flush()
+        finally:
+            pipeline.close()
+
+        # a file bigger than the limit is still encrypted, alone
+        self.assertEqual(pending_sizes, [100, 200, 200, 1000, 100])
+        self.assertEqual(uploaded, contents)
@@ -1,6 +1,8 @@
+import os
+import tempfile
 import unittest
 
-from crunch.utils import cut_url
+from crunch.utils import atomic_write, cut_url
 
 
 class CutUrlTest(unittest.TestCase):
@@ -16,3 +18,36 @@ class CutUrlTest(unittest.TestCase):
     def test_keep_double(self):
         self.assertEqual("http:google.com//search//a", cut_url("http://google.com//search//a?q=hello"))
         self.assertEqual("https:google.com//search//a", cut_url("https://google.com//search//a?q=hello"))
+
+
+class AtomicWriteTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "nested", "file.txt")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read(self):
+        with open(self.path) as fd:
+            return fd.read()
+
+    def test_write(self):
+        with atomic_write(self.path) as fd:
+            fd.write("hello")
+
+        self.assertEqual(self.read(), "hello")
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["file.txt"])
+
+    def test_failure_keeps_previous(self):
+        with atomic_write(self.path) as fd:
+            fd.write("hello")
+
+        with self.assertRaises(ValueError):
+            with atomic_write(self.path) as fd:
+                fd.write("world")
+                raise ValueError("interrupted")
+
+        self.assertEqual(self.read(), "hello")
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["file.txt"])